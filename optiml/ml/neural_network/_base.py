@@ -86,6 +86,49 @@ class NeuralNetwork(BaseEstimator, Layer, ABC):
                 delta = layer.backward(delta)
         return coef_grads[::-1], inter_grads[::-1]
 
+    def r_forward(self, packed_coef_inter_dir):
+        """
+        The directional derivative of the output of the last forward pass
+        along the direction of the parameters, packed as they are.
+        """
+        R_X = None
+        coef_idx = 0
+        inter_idx = 0
+        for layer in self.layers:
+            if isinstance(layer, ParamLayer):
+                start, end, shape = self.coef_idx[coef_idx]
+                V_coef = np.reshape(packed_coef_inter_dir[start:end], shape)
+                V_inter = None
+                if layer.fit_intercept:
+                    start, end = self.inter_idx[inter_idx]
+                    V_inter = packed_coef_inter_dir[start:end]
+                    inter_idx += 1
+                coef_idx += 1
+                R_X = layer.r_forward(R_X, V_coef, V_inter)
+            else:
+                R_X = layer.r_forward(R_X)
+        return R_X
+
+    def r_backward(self, delta, R_delta):
+        """
+        The directional derivative of the gradients computed by backward along
+        the direction of the last r_forward, given the one R_delta of delta.
+        """
+        coef_grads = []
+        inter_grads = []
+        # back propagate
+        for layer in self.layers[::-1]:
+            if isinstance(layer, ParamLayer):
+                delta, R_delta, R_grads = layer.r_backward(delta, R_delta)
+                coef_grads.append(R_grads['dW'] + layer.coef_reg.hessian_vector_product(
+                    layer.coef_, layer._V_coef) / layer._X.shape[0])
+                if layer.fit_intercept:
+                    inter_grads.append(R_grads['db'] + layer.inter_reg.hessian_vector_product(
+                        layer.inter_, layer._V_inter) / layer._X.shape[0])
+            else:
+                delta, R_delta = layer.r_backward(delta, R_delta)
+        return coef_grads[::-1], inter_grads[::-1]
+
     @property
     def coefs_(self):
         return [layer.coef_ for layer in self.layers if isinstance(layer, ParamLayer)]
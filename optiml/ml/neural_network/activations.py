@@ -12,6 +12,20 @@ class Activation(ABC):
     def jacobian(self, x):
         raise NotImplementedError
 
+    def hessian(self, x):
+        """
+        The derivative of the (elementwise) jacobian, i.e., the second derivative of
+        the activation, needed by the exact Hessian-vector product of the network.
+        """
+        raise NotImplementedError
+
+    def jacobian_vector_product(self, x, v):
+        """
+        The directional derivative of the activation at x along v, which is
+        just the elementwise product with the jacobian for all but the softmax.
+        """
+        return self.jacobian(x) * v
+
     def __call__(self, x):
         return self.function(x)
 
@@ -24,6 +38,9 @@ class Linear(Activation):
     def jacobian(self, x):
         return np.ones_like(x)
 
+    def hessian(self, x):
+        return np.zeros_like(x)
+
 
 class ReLU(Activation):
 
@@ -33,6 +50,9 @@ class ReLU(Activation):
     def jacobian(self, x):
         return np.where(x > 0, 1., 0.)
 
+    def hessian(self, x):
+        return np.zeros_like(x)
+
 
 class Tanh(Activation):
 
@@ -42,6 +62,10 @@ class Tanh(Activation):
     def jacobian(self, x):
         return 1. - np.square(self.function(x))
 
+    def hessian(self, x):
+        x = self.function(x)
+        return -2. * x * (1. - np.square(x))
+
 
 class Sigmoid(Activation):
 
@@ -52,6 +76,10 @@ class Sigmoid(Activation):
         x = self.function(x)
         return x * (1. - x)
 
+    def hessian(self, x):
+        x = self.function(x)
+        return x * (1. - x) * (1. - 2. * x)
+
 
 class SoftMax(Activation):
 
@@ -62,6 +90,15 @@ class SoftMax(Activation):
     def jacobian(self, x):
         return np.ones_like(x)
 
+    def hessian(self, x):
+        return np.zeros_like(x)
+
+    def jacobian_vector_product(self, x, v, axis=-1):
+        # the jacobian is the one of the softmax followed by the cross-entropy,
+        # while the output itself moves along v as follows
+        x = self.function(x, axis)
+        return x * (v - np.sum(x * v, axis=axis, keepdims=True))
+
 
 linear = Linear()
 relu = ReLU()
@@ -15,6 +15,12 @@ class Layer(ABC):
     def backward(self, delta):
         raise NotImplementedError
 
+    def r_forward(self, R_X):
+        raise NotImplementedError
+
+    def r_backward(self, delta, R_delta):
+        raise NotImplementedError
+
 
 class ParamLayer(Layer, ABC):
 
@@ -101,3 +107,36 @@ class FullyConnected(ParamLayer):
         # dX
         dX = dZ.dot(self.coef_.T)
         return dX, grads
+
+    def r_forward(self, R_X, V_coef, V_inter=None):
+        """
+        The directional derivative, i.e., Pearlmutter's R-op, of the output of the
+        last forward pass along the direction V_coef, V_inter of the parameters,
+        given the one R_X of the input, which is None for the input of the network.
+        """
+        self._R_X, self._V_coef, self._V_inter = R_X, V_coef, V_inter
+        self._R_WX_b = np.dot(self._X, V_coef)
+        if R_X is not None:
+            self._R_WX_b += np.dot(R_X, self.coef_)
+        if self.fit_intercept:
+            self._R_WX_b += V_inter
+        return self.activation.jacobian_vector_product(self._WX_b, self._R_WX_b)
+
+    def r_backward(self, delta, R_delta):
+        """
+        The directional derivative of the backward pass along the direction of the
+        last r_forward, given the one R_delta of delta.
+        """
+        act_jac = self.activation.jacobian(self._WX_b)
+        dZ = delta * act_jac
+        R_dZ = R_delta * act_jac + delta * self.activation.hessian(self._WX_b) * self._R_WX_b
+        # R dW, R db
+        R_grads = {'dW': self._X.T.dot(R_dZ)}
+        if self._R_X is not None:
+            R_grads['dW'] += self._R_X.T.dot(dZ)
+        if self.fit_intercept:
+            R_grads['db'] = np.sum(R_dZ, axis=0, keepdims=True)
+        # dX, R dX
+        dX = dZ.dot(self.coef_.T)
+        R_dX = R_dZ.dot(self.coef_.T) + dZ.dot(self._V_coef.T)
+        return dX, R_dX, R_grads
@@ -31,6 +31,12 @@ class NeuralNetworkLoss(OptimizationFunction, ABC):
     def delta(self, y_pred, y_true):
         return y_pred - y_true
 
+    def delta_derivative(self, y_pred, y_true, R_y_pred):
+        """
+        The directional derivative of the delta given the one R_y_pred of the predictions.
+        """
+        return R_y_pred
+
     def function(self, packed_coef_inter, X_batch=None, y_batch=None):
         if X_batch is None:
             X_batch = self.X
@@ -40,11 +46,14 @@ class NeuralNetworkLoss(OptimizationFunction, ABC):
         self.neural_net._unpack(packed_coef_inter)
 
         n_samples = X_batch.shape[0]
+        return 1 / (2 * n_samples) * self.loss(self.neural_net.forward(X_batch), y_batch) + self._regs(n_samples)
+
+    def _regs(self, n_samples):
         coef_regs = np.sum(layer.coef_reg(layer.coef_) for layer in self.neural_net.layers
                            if isinstance(layer, ParamLayer)) / (2 * n_samples)
         inter_regs = np.sum(layer.inter_reg(layer.inter_) for layer in self.neural_net.layers
                             if isinstance(layer, ParamLayer) and layer.fit_intercept) / (2 * n_samples)
-        return 1 / (2 * n_samples) * self.loss(self.neural_net.forward(X_batch), y_batch) + coef_regs + inter_regs
+        return coef_regs + inter_regs
 
     def jacobian(self, packed_coef_inter, X_batch=None, y_batch=None):
         if X_batch is None:
@@ -58,6 +67,51 @@ class NeuralNetworkLoss(OptimizationFunction, ABC):
         delta = 1 / n_samples * self.delta(self.neural_net.forward(X_batch), y_batch)
         return self.neural_net._pack(*self.neural_net.backward(delta))
 
+    def hessian_vector_product(self, packed_coef_inter, v, X_batch=None, y_batch=None):
+        """
+        Compute the exact product between the Hessian matrix and a vector v matrix-free
+        by Pearlmutter's R-op, i.e., the directional derivative along v of the back
+        propagated Jacobian, with a forward and a backward pass each extended by the
+        one of its directional derivatives.
+
+        References
+
+        B.A. Pearlmutter. Fast Exact Multiplication by the Hessian. Neural Computation, 1994.
+        """
+        if X_batch is None:
+            X_batch = self.X
+        if y_batch is None:
+            y_batch = self.y
+
+        self.neural_net._unpack(packed_coef_inter)
+
+        n_samples = X_batch.shape[0]
+        y_pred = self.neural_net.forward(X_batch)
+        R_y_pred = self.neural_net.r_forward(v)
+        # the directional derivative of delta first, since the delta may be computed in-place on the predictions
+        R_delta = 1 / n_samples * self.delta_derivative(y_pred, y_batch, R_y_pred)
+        delta = 1 / n_samples * self.delta(y_pred, y_batch)
+        return self.neural_net._pack(*self.neural_net.r_backward(delta, R_delta))
+
+    def _function_and_jacobian(self, packed_coef_inter, X_batch=None, y_batch=None):
+        """
+        Compute both the function value and the Jacobian at the same point
+        with a single forward pass, followed by the backward one.
+        """
+        if X_batch is None:
+            X_batch = self.X
+        if y_batch is None:
+            y_batch = self.y
+
+        self.neural_net._unpack(packed_coef_inter)
+
+        n_samples = X_batch.shape[0]
+        y_pred = self.neural_net.forward(X_batch)
+        # the loss first, since the delta may be computed in-place on the predictions
+        f_x = 1 / (2 * n_samples) * self.loss(y_pred, y_batch) + self._regs(n_samples)
+        delta = 1 / n_samples * self.delta(y_pred, y_batch)
+        return f_x, self.neural_net._pack(*self.neural_net.backward(delta))
+
     def __call__(self, y_pred, y_true):
         return self.loss(y_pred, y_true)
 
@@ -92,6 +146,9 @@ class MeanAbsoluteError(NeuralNetworkLoss):
     def delta(self, y_pred, y_true):
         return np.sign(y_pred - y_true)
 
+    def delta_derivative(self, y_pred, y_true, R_y_pred):
+        return np.zeros_like(R_y_pred)
+
 
 class BinaryCrossEntropy(NeuralNetworkLoss):
     """Binary Cross-Entropy aka Sigmoid Cross-Entropy loss
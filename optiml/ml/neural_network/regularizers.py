@@ -14,6 +14,9 @@ class Regularizer(ABC):
     def jacobian(self, theta):
         raise NotImplementedError
 
+    def hessian_vector_product(self, theta, v):
+        raise NotImplementedError
+
     def __call__(self, theta):
         return self.function(theta)
 
@@ -29,6 +32,9 @@ class L1(Regularizer):
     def jacobian(self, theta):
         return self.lmbda * np.sign(theta)
 
+    def hessian_vector_product(self, theta, v):
+        return np.zeros_like(v)
+
 
 class L2(Regularizer):
 
@@ -41,6 +47,9 @@ class L2(Regularizer):
     def jacobian(self, theta):
         return self.lmbda * theta
 
+    def hessian_vector_product(self, theta, v):
+        return self.lmbda * v
+
 
 l1 = L1()
 l2 = L2()
@@ -2,15 +2,22 @@ import warnings
 from abc import ABC
 
 import numpy as np
+from joblib import Parallel, delayed
 from qpsolvers import solve_qp
-from sklearn.base import ClassifierMixin, BaseEstimator, RegressorMixin
+from sklearn.base import ClassifierMixin, BaseEstimator, RegressorMixin, clone
 from sklearn.exceptions import ConvergenceWarning
 from sklearn.linear_model._base import LinearClassifierMixin, SparseCoefMixin, LinearModel
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelBinarizer
-
-from .kernels import gaussian, Kernel, LinearKernel
-from .losses import squared_hinge, SVMLoss, SVCLoss, SVRLoss, epsilon_insensitive
+from sklearn.utils.extmath import safe_sparse_dot
+
+from .coordinate_descent import DualCoordinateDescent
+from .cascade import cascade
+from .decomposition import Decomposition
+from .kernels import gaussian, Kernel, LinearKernel, fixed_gamma
+from .lasvm import LASVM
+from .losses import (squared_hinge, SVMLoss, SVCLoss, SVRLoss, epsilon_insensitive,
+                     SmoothedHinge, SmoothedEpsilonInsensitive)
 from .smo import SMO, SMOClassifier, SMORegression
 from ...opti import Optimizer
 from ...opti import Quadratic
@@ -41,7 +48,9 @@ class SVM(BaseEstimator, ABC):
         `LBFGS` quasi-Newton method or, alternatively, a subclass of the `StochasticOptimizer`
         e.g, the `StochasticGradientDescent` or `Adam`, which works well on relatively
         large datasets (with thousands of training samples or more) in terms of both
-        training time and validation score.
+        training time and validation score. Linear models can also be trained by the
+        `DualCoordinateDescent` method which solves the dual of the Hinge, squared Hinge,
+        epsilon-insensitive or squared epsilon-insensitive loss one sample at a time.
 
     max_iter : int, default=1000
         Maximum number of iterations. The solver iterates until convergence
@@ -65,6 +74,12 @@ class SVM(BaseEstimator, ABC):
 
     batch_size :
 
+    smoothing : float or array-like of floats, default=0.1
+        Width of the quadratic smoothing of the kinks of the loss. Only used when
+        ``loss`` is `SmoothedHinge` or `SmoothedEpsilonInsensitive`. If a decreasing
+        sequence is given, the model is fit by continuation, i.e., each smoothing
+        level is warm started from the solution of the previous one.
+
     max_f_eval : int, default=15000
         Only used when ``optimizer`` is a subclass of `LineSearchOptimizer`.
         Maximum number of loss function calls. The solver iterates until
@@ -83,6 +98,44 @@ class SVM(BaseEstimator, ABC):
         an instance of StochasticOptimizer class is used as ``optimizer`` value.
         Pass an int for reproducible output across multiple function calls.
 
+    cache_size : int, default=1000
+        Maximum number of kernel rows kept in memory by the online `LASVM`
+        optimizer of `DualSVC`, which allows to update the model by ``partial_fit``
+        at a cost scaling with the number of support vectors, or by the
+        decomposition method of `DualSVC` and `DualSVR`.
+
+    working_set_size : int, default=None
+        If given, `DualSVC` and `DualSVR` are trained by the decomposition method
+        when ``optimizer`` is a subclass of `BoxConstrainedQuadraticOptimizer`: at
+        each iteration the ``working_set_size`` variables which most violate the
+        optimality conditions are optimized by ``optimizer`` with all the others
+        fixed, so that the kernel matrix is never computed as a whole but just
+        its rows for the working sets.
+
+    max_time : float, default=None
+        Maximum time in seconds of each call to ``fit`` of `DualSVC` and `DualSVR`
+        when ``optimizer`` is `SMO`, which is stopped, with a ``ConvergenceWarning``,
+        after the sweep over the samples which exceeds it, or after ``max_iter`` sweeps.
+        The model is then fitted with the current dual variables, which are feasible.
+
+    warm_start : bool, default=False
+        When set to True and ``optimizer`` is `SMO`, resume the optimization of the
+        previous call to ``fit`` from where it stopped if it was on the same training
+        set with the same kernel, ``C`` and ``epsilon``, otherwise start from scratch.
+
+    n_shards : int, default=None
+        If given, `DualSVC` is trained by the cascade method: the training set is
+        split into ``n_shards`` subsets which are solved in parallel, then their
+        support vectors are merged pairwise and solved again, layer by layer, until
+        the support vectors of the whole problem do not change anymore.
+
+    n_jobs : int, default=None
+        The number of processes used to solve the one-vs-rest problems of a
+        multiclass `PrimalSVC` in parallel when ``optimizer`` is a subclass of
+        `LineSearchOptimizer`, otherwise they are jointly solved in a single one,
+        or the subsets of each layer of the cascade of `DualSVC`. ``-1`` means
+        using all processors.
+
     verbose : bool or int, default=False
         Controls the verbosity of progress messages to stdout. Use a boolean value
         to switch on/off or an int value to show progress each ``verbose`` time
@@ -146,6 +199,7 @@ class PrimalSVM(SVM, ABC):
                  C=1.,
                  tol=1e-4,
                  loss=SVMLoss,
+                 smoothing=0.1,
                  optimizer=StochasticGradientDescent,
                  max_iter=1000,
                  learning_rate=0.1,
@@ -175,6 +229,11 @@ class PrimalSVM(SVM, ABC):
                          random_state=random_state,
                          verbose=verbose)
         self.loss = loss
+        if not np.all(np.asarray(smoothing) > 0):
+            raise ValueError('smoothing must be > 0')
+        if not np.all(np.diff(np.atleast_1d(smoothing)) < 0):
+            raise ValueError('smoothing must be a strictly decreasing sequence')
+        self.smoothing = smoothing
         if not issubclass(self.optimizer, Optimizer):
             raise TypeError(f'{optimizer} is not an allowed optimization method')
         self.validation_split = validation_split
@@ -198,15 +257,152 @@ class PrimalSVM(SVM, ABC):
                 self.best_loss = np.inf
 
     def _unpack(self, packed_coef_inter):
-        if self.fit_intercept:
-            self.coef_, self.intercept_ = packed_coef_inter[:-1], packed_coef_inter[-1]
+        coef, inter = self.loss._unpack(packed_coef_inter)
+        self.coef_, self.intercept_ = coef.T, inter
+
+    def _optimizers(self):
+        # the per-class optimizers when the one-vs-rest problems are solved in parallel
+        return self.optimizer if isinstance(self.optimizer, list) else [self.optimizer]
+
+    def _packed_coef_inter(self):
+        if isinstance(self.optimizer, list):
+            return np.column_stack([optimizer.x for optimizer in self.optimizer]).ravel()
+        return self.optimizer.x
+
+    def fit_path(self, X, y, Cs):
+        """
+        Fit the model along a regularization path, i.e., for each value of C in Cs,
+        warm starting the optimizer from the solution found for the previous one.
+
+        The loss is bound to the data just once since it reads the current value of C
+        from the estimator, so the same optimizer is resumed along the whole path and
+        its state is reused, e.g., the approximation of the inverse of the Hessian of
+        BFGS, the accumulated squared gradients of AdaGrad or the dual variables of
+        DualCoordinateDescent. Cs is expected to be sorted in increasing order, so that
+        each solution is a good starting point for the next less regularized problem.
+
+        :param X: array-like of shape (n_samples, n_features), the training data.
+        :param y: array-like of shape (n_samples,), the target values.
+        :param Cs: sequence of the regularization parameters.
+        :return: the coefficients of shape (n_Cs, n_features) and the intercepts
+                 of shape (n_Cs,) along the path, or of shape (n_Cs, n_classes,
+                 n_features) and (n_Cs, n_classes) for multiclass problems.
+        """
+        coefs, intercepts = [], []
+        for i, C in enumerate(Cs):
+            if not C > 0:
+                raise ValueError('C must be > 0')
+            self.C = C
+            if i == 0:
+                self.fit(X, y)
+            else:
+                self._resume()
+            coefs.append(np.array(self.coef_))
+            intercepts.append(np.array(self.intercept_))
+        return np.array(coefs), np.array(intercepts)
+
+    def _partial_fit(self, X, y):
+        """
+        Take a single pass over a chunk of data by the stochastic optimizer, which is
+        created at the first call and then just bound to each new chunk, so that its
+        point and state, e.g., the moment estimates of Adam, the accumulated squared
+        gradients of AdaGrad or the step counter, are kept across the calls while the
+        previous chunks need not be kept in memory.
+        """
+        if self.validation_split or self.early_stopping:
+            raise ValueError('partial_fit does not support validation_split or early_stopping')
+
+        if not (isinstance(self.optimizer, StochasticOptimizer) or
+                isinstance(self.optimizer, type) and issubclass(self.optimizer, StochasticOptimizer)):
+            raise TypeError('partial_fit is only supported by StochasticOptimizer subclasses')
+
+        if isinstance(self.optimizer, StochasticOptimizer):
+
+            self.loss.X, self.loss.y = X, y
+            self.loss.clear_cache()  # the caches refer to the previous chunk
+            self.optimizer.reset_batches(self.batch_size)
+
         else:
-            self.coef_ = packed_coef_inter
+
+            self.loss = self._make_loss(X, y)
+            self.optimizer = self.optimizer(f=self.loss,
+                                            x=np.zeros(self.loss.ndim),
+                                            batch_size=self.batch_size,
+                                            epochs=1,
+                                            step_size=self.learning_rate,
+                                            momentum_type=self.momentum_type,
+                                            momentum=self.momentum,
+                                            callback=self._store_train_val_info,
+                                            callback_args=(None, None),
+                                            shuffle=self.shuffle,
+                                            random_state=self.random_state,
+                                            verbose=self.verbose)
+
+        # a single batch ends the epoch already at the first iterate, i.e., before
+        # its step, so one more epoch is needed to take exactly n_batches steps
+        self.optimizer.epochs = 2 if self.optimizer.is_batch_end() else 1
+        self.optimizer.epoch = 0
+        self.optimizer.status = 'unknown'
+        self.optimizer.minimize()
+
+        self._unpack(self.optimizer.x)
+
+        return self
+
+    def _make_loss(self, X, y):
+        raise NotImplementedError
+
+    def _continue_smoothing(self):
+        """
+        Fit a smoothed loss by continuation along the decreasing smoothing
+        schedule, warm starting each level from the solution of the previous one.
+        """
+        if isinstance(self.loss, (SmoothedHinge, SmoothedEpsilonInsensitive)):
+            for smoothing in np.atleast_1d(self.smoothing)[1:]:
+                self.loss.smoothing = smoothing
+                for optimizer in self._optimizers():
+                    optimizer.f.smoothing = smoothing
+                self._resume()
+
+    def _resume(self):
+        """
+        Restart the already fitted optimizer from its current point and state,
+        just resetting its iteration counters and stopping status.
+        """
+        for optimizer in self._optimizers():
+            # per-class losses solved in other processes refer to copies of the estimator
+            optimizer.f.svm = self
+            optimizer.f.clear_cache()  # C or the smoothing may have changed since the last evaluations
+            optimizer.iter = 0
+            optimizer.status = 'unknown'
+
+            if isinstance(optimizer, LineSearchOptimizer):
+                optimizer.f_eval = 1
+            elif isinstance(optimizer, StochasticOptimizer):
+                optimizer.epoch = 0
+                self._no_improvement_count = 0
+                if self.validation_split:
+                    self.best_val_score = -np.inf
+                else:
+                    self.best_loss = np.inf
+
+            optimizer.minimize()
+
+            if optimizer.status == 'stopped':
+                if isinstance(optimizer, LineSearchOptimizer) and optimizer.f_eval >= self.max_f_eval:
+                    warnings.warn('max_f_eval reached but the optimization has not converged yet', ConvergenceWarning)
+                elif not isinstance(optimizer, StochasticOptimizer):
+                    warnings.warn('max_iter reached but the optimization has not converged yet', ConvergenceWarning)
+
+        self._unpack(self._packed_coef_inter())
 
     def _store_train_val_info(self, opt, X_batch, y_batch, X_val, y_val):
-        self._unpack(opt.x)
         self._avg_epoch_loss += opt.f_x * X_batch.shape[0]
         if opt.is_batch_end():
+            # the coefficients are just needed by the scores at the end of each
+            # epoch, so the point, e.g., the scaled one of Pegasos, is not
+            # materialized at each step
+            self._unpack(opt.x)
             self._avg_epoch_loss /= opt.f.X.shape[0]  # n_samples
             self.train_loss_history.append(self._avg_epoch_loss)
             if opt.is_verbose() and opt.epoch != opt.iter:
@@ -286,6 +482,10 @@ class DualSVM(SVM, ABC):
                  master_verbose=False,
                  shuffle=True,
                  random_state=None,
+                 cache_size=1000,
+                 working_set_size=None,
+                 max_time=None,
+                 warm_start=False,
                  verbose=False):
         super().__init__(C=C,
                          tol=tol,
@@ -302,6 +502,14 @@ class DualSVM(SVM, ABC):
         if not isinstance(kernel, Kernel):
             raise TypeError(f'{kernel} is not an allowed kernel function')
         self.kernel = kernel
+        self.cache_size = cache_size
+        if working_set_size is not None and not working_set_size > 1:
+            raise ValueError('working_set_size must be > 1')
+        self.working_set_size = working_set_size
+        if max_time is not None and not max_time > 0:
+            raise ValueError('max_time must be > 0')
+        self.max_time = max_time
+        self.warm_start = warm_start
         if not (isinstance(optimizer, str) or
                 not issubclass(optimizer, SMO) or
                 not issubclass(optimizer, Optimizer)):
@@ -312,6 +520,69 @@ class DualSVM(SVM, ABC):
             self.coef_ = np.zeros(0)
         self.intercept_ = 0.
 
+    def _minimize_smo(self, smo):
+        """
+        Run the SMO algorithm within the max_iter and max_time budgets, warning
+        if it is stopped before convergence, so that the model is fitted with
+        the current dual variables, which are always feasible.
+        """
+        smo.max_iter, smo.max_time = self.max_iter, self.max_time
+        start_iter = smo.iter
+        smo.minimize()
+        # the counters of the cost of the run, to find its slow phases
+        self.smo_stats_ = smo.stats
+        if smo.status == 'stopped':
+            if smo.iter - start_iter >= self.max_iter:
+                warnings.warn('max_iter reached but the optimization has not converged yet, '
+                              'use warm_start to resume it', ConvergenceWarning)
+            else:
+                warnings.warn('max_time reached but the optimization has not converged yet, '
+                              'use warm_start to resume it', ConvergenceWarning)
+        return smo
+
+    def _can_resume(self, smo_type, X, y, **params):
+        """
+        Whether warm_start can resume the SMO state of the previous fit, i.e., whether
+        it was built on the same training set with the same kernel, C and params,
+        since its kernel matrix and dual variables do not belong to another problem.
+        """
+        smo = self.optimizer
+        return (self.warm_start and isinstance(smo, smo_type) and
+                smo.kernel is self.kernel and smo.C == self.C and
+                all(getattr(smo, name) == value for name, value in params.items()) and
+                smo.X.shape == X.shape and np.array_equal(smo.X, X) and np.array_equal(smo.y, y))
+
+    def _decomposition(self, X, samples, sign, offset, q):
+        """
+        Solve the dual problem by the decomposition method, i.e., by subproblems over
+        working sets of working_set_size variables solved by the box-constrained
+        quadratic optimizer, so that the kernel matrix is never computed as a whole.
+        """
+        if not (isinstance(self.optimizer, type) and issubclass(self.optimizer, BoxConstrainedQuadraticOptimizer)):
+            raise TypeError('working_set_size is only supported by the box-constrained quadratic optimizers')
+
+        self.optimizer = Decomposition(X, samples, sign, offset, q,
+                                       ub=np.ones(len(q)) * self.C,
+                                       kernel=self.kernel,
+                                       optimizer=self.optimizer,
+                                       working_set_size=self.working_set_size,
+                                       tol=self.tol,
+                                       max_iter=self.max_iter,
+                                       cache_size=self.cache_size,
+                                       verbose=self.verbose).minimize()
+
+        if self.optimizer.status == 'stopped':
+            if self.optimizer.iter >= self.max_iter:
+                warnings.warn('max_iter reached but the optimization has not converged yet',
+                              ConvergenceWarning)
+            else:
+                warnings.warn('the subproblem optimizer did not improve the solution but the '
+                              'optimization has not converged yet', ConvergenceWarning)
+
+        # the gamma of the kernel is fixed on the whole training set
+        self.kernel_ = self.optimizer.kernel
+        return self.optimizer.x
+
 
 class PrimalSVC(LinearClassifierMixin, SparseCoefMixin, PrimalSVM):
 
@@ -319,6 +590,7 @@ class PrimalSVC(LinearClassifierMixin, SparseCoefMixin, PrimalSVM):
                  C=1.,
                  tol=1e-4,
                  loss=squared_hinge,
+                 smoothing=0.1,
                  optimizer=StochasticGradientDescent,
                  max_iter=1000,
                  learning_rate=0.1,
@@ -334,10 +606,12 @@ class PrimalSVC(LinearClassifierMixin, SparseCoefMixin, PrimalSVM):
                  master_verbose=False,
                  shuffle=True,
                  random_state=None,
+                 n_jobs=None,
                  verbose=False):
         super().__init__(C=C,
                          tol=tol,
                          loss=loss,
+                         smoothing=smoothing,
                          optimizer=optimizer,
                          max_iter=max_iter,
                          learning_rate=learning_rate,
@@ -357,16 +631,22 @@ class PrimalSVC(LinearClassifierMixin, SparseCoefMixin, PrimalSVM):
         if not issubclass(loss, SVCLoss):
             raise TypeError(f'{loss} is not an allowed LinearSVC loss function')
         self.lb = LabelBinarizer(neg_label=-1)
+        self.n_jobs = n_jobs
+
+    def _make_loss(self, X, y):
+        if issubclass(self.loss, SmoothedHinge):
+            return self.loss(self, X, y, np.atleast_1d(self.smoothing)[0], self.fit_intercept)
+        return self.loss(self, X, y, fit_intercept=self.fit_intercept)
 
     def _store_train_val_info(self, opt, X_batch, y_batch, X_val, y_val):
         super()._store_train_val_info(opt, X_batch, y_batch, X_val, y_val)
         if opt.is_batch_end():
-            acc = self.score(X_batch[:, :-1], y_batch)
+            acc = self.score(X_batch, self.lb.inverse_transform(y_batch))
             self.train_score_history.append(acc)
             if opt.is_verbose():
                 print(' - acc: {: 1.4f}'.format(acc), end='')
             if self.validation_split:
-                val_acc = self.score(X_val[:, :-1], y_val)
+                val_acc = self.score(X_val, self.lb.inverse_transform(y_val))
                 self.val_score_history.append(val_acc)
                 if opt.is_verbose():
                     print(' - val_acc: {: 1.4f}'.format(val_acc), end='')
@@ -374,47 +654,68 @@ class PrimalSVC(LinearClassifierMixin, SparseCoefMixin, PrimalSVM):
 
     def fit(self, X, y):
         self.lb.fit(y)
-        if len(self.lb.classes_) > 2:
-            raise ValueError('use OneVsOneClassifier or OneVsRestClassifier from sklearn.multiclass '
-                             'to train a model over more than two labels')
-        y = self.lb.transform(y).ravel()
+        # with more than two labels, the one-vs-rest problems of all
+        # the classes are jointly solved by a single optimizer
+        y = self.lb.transform(y)
+        if y.shape[1] == 1:
+            y = y.ravel()
 
         if issubclass(self.optimizer, LineSearchOptimizer):
 
-            if self.fit_intercept:
-                X_biased = np.c_[X, np.ones_like(y)]
+            if self.n_jobs is not None and y.ndim > 1:
+                # the one-vs-rest problems are independent, so solve each of them in a separate process
+                losses = [self._make_loss(X, y_k) for y_k in y.T]
+                self.optimizer = Parallel(n_jobs=self.n_jobs)(
+                    delayed(self.optimizer(f=loss,
+                                           x=np.zeros(loss.ndim),
+                                           max_iter=self.max_iter,
+                                           max_f_eval=self.max_f_eval,
+                                           verbose=self.verbose).minimize)() for loss in losses)
+                self.loss = self._make_loss(X, y)
             else:
-                X_biased = X
+                self.loss = self._make_loss(X, y)
+                self.optimizer = self.optimizer(f=self.loss,
+                                                x=np.zeros(self.loss.ndim),
+                                                max_iter=self.max_iter,
+                                                max_f_eval=self.max_f_eval,
+                                                verbose=self.verbose).minimize()
 
-            self.loss = self.loss(self, X_biased, y)
+            for optimizer in self._optimizers():
+                if optimizer.status == 'stopped':
+                    if optimizer.iter >= self.max_iter:
+                        warnings.warn('max_iter reached but the optimization has not converged yet',
+                                      ConvergenceWarning)
+                    elif optimizer.f_eval >= self.max_f_eval:
+                        warnings.warn('max_f_eval reached but the optimization has not converged yet',
+                                      ConvergenceWarning)
+
+            self._unpack(self._packed_coef_inter())
+
+        elif issubclass(self.optimizer, ProximalBundle):
+
+            self.loss = self._make_loss(X, y)
             self.optimizer = self.optimizer(f=self.loss,
                                             x=np.zeros(self.loss.ndim),
                                             max_iter=self.max_iter,
-                                            max_f_eval=self.max_f_eval,
-                                            verbose=self.verbose).minimize()
+                                            master_solver=self.master_solver,
+                                            verbose=self.verbose,
+                                            master_verbose=self.master_verbose).minimize()
 
             if self.optimizer.status == 'stopped':
-                if self.optimizer.iter >= self.max_iter:
-                    warnings.warn('max_iter reached but the optimization has not converged yet', ConvergenceWarning)
-                elif self.optimizer.f_eval >= self.max_f_eval:
-                    warnings.warn('max_f_eval reached but the optimization has not converged yet', ConvergenceWarning)
+                warnings.warn('max_iter reached but the optimization has not converged yet', ConvergenceWarning)
 
             self._unpack(self.optimizer.x)
 
-        elif issubclass(self.optimizer, ProximalBundle):
+        elif issubclass(self.optimizer, DualCoordinateDescent):
 
-            if self.fit_intercept:
-                X_biased = np.c_[X, np.ones_like(y)]
-            else:
-                X_biased = X
-
-            self.loss = self.loss(self, X_biased, y)
+            self.loss = self._make_loss(X, y)
             self.optimizer = self.optimizer(f=self.loss,
                                             x=np.zeros(self.loss.ndim),
+                                            eps=self.tol,
                                             max_iter=self.max_iter,
-                                            master_solver=self.master_solver,
-                                            verbose=self.verbose,
-                                            master_verbose=self.master_verbose).minimize()
+                                            shuffle=self.shuffle,
+                                            random_state=self.random_state,
+                                            verbose=self.verbose).minimize()
 
             if self.optimizer.status == 'stopped':
                 warnings.warn('max_iter reached but the optimization has not converged yet', ConvergenceWarning)
@@ -427,41 +728,55 @@ class PrimalSVC(LinearClassifierMixin, SparseCoefMixin, PrimalSVM):
                 X, X_val, y, y_val = train_test_split(X, y,
                                                       test_size=self.validation_split,
                                                       random_state=self.random_state)
-
-                if self.fit_intercept:
-                    X_val_biased = np.c_[X_val, np.ones_like(y_val)]
-                else:
-                    X_val_biased = X_val
-
             else:
-                X_val_biased = None
+                X_val = None
                 y_val = None
 
-            if self.fit_intercept:
-                X_biased = np.c_[X, np.ones_like(y)]
-            else:
-                X_biased = X
-
-            self.loss = self.loss(self, X_biased, y)
+            self.loss = self._make_loss(X, y)
             self.optimizer = self.optimizer(f=self.loss,
                                             x=np.zeros(self.loss.ndim),
+                                            batch_size=self.batch_size,
                                             epochs=self.max_iter,
                                             step_size=self.learning_rate,
                                             momentum_type=self.momentum_type,
                                             momentum=self.momentum,
                                             callback=self._store_train_val_info,
-                                            callback_args=(X_val_biased, y_val),
+                                            callback_args=(X_val, y_val),
                                             shuffle=self.shuffle,
                                             random_state=self.random_state,
                                             verbose=self.verbose).minimize()
 
-        if self.fit_intercept and X.shape[1] > 1:
-            self.loss.X = X
+            self._unpack(self.optimizer.x)
+
+        self._continue_smoothing()
 
         return self
 
+    def partial_fit(self, X, y, classes=None):
+        """
+        Update the model by a single pass over a chunk of data, e.g., of a stream,
+        with the stochastic optimizer, keeping its state from the previous calls.
+
+        :param X: array-like of shape (n_samples, n_features), the chunk of data.
+        :param y: array-like of shape (n_samples,), the target values of the chunk.
+        :param classes: array-like of shape (n_classes,), the classes across all the
+                        calls, required at the first call since a chunk may not
+                        contain all of them, and ignored in the subsequent ones.
+        :return: self
+        """
+        if not hasattr(self.lb, 'classes_'):
+            if classes is None:
+                raise ValueError('classes must be passed on the first call to partial_fit')
+            self.lb.fit(classes)
+
+        y = self.lb.transform(y)
+        if y.shape[1] == 1:
+            y = y.ravel()
+
+        return self._partial_fit(X, y)
+
     def decision_function(self, X):
-        return np.dot(X, self.coef_) + self.intercept_
+        return safe_sparse_dot(X, self.coef_.T) + self.intercept_
 
     def predict(self, X):
         return self.lb.inverse_transform(self.decision_function(X))
@@ -484,6 +799,12 @@ class DualSVC(ClassifierMixin, DualSVM):
                  master_verbose=False,
                  shuffle=True,
                  random_state=None,
+                 cache_size=1000,
+                 working_set_size=None,
+                 max_time=None,
+                 warm_start=False,
+                 n_shards=None,
+                 n_jobs=None,
                  verbose=False):
         super().__init__(kernel=kernel,
                          C=C,
@@ -499,8 +820,16 @@ class DualSVC(ClassifierMixin, DualSVM):
                          master_verbose=master_verbose,
                          shuffle=shuffle,
                          random_state=random_state,
+                         cache_size=cache_size,
+                         working_set_size=working_set_size,
+                         max_time=max_time,
+                         warm_start=warm_start,
                          verbose=verbose)
         self.lb = LabelBinarizer(neg_label=-1)
+        if n_shards is not None and not n_shards > 1:
+            raise ValueError('n_shards must be > 1')
+        self.n_shards = n_shards
+        self.n_jobs = n_jobs
 
     def fit(self, X, y):
         self.lb.fit(y)
@@ -509,10 +838,50 @@ class DualSVC(ClassifierMixin, DualSVM):
                              'to train a model over more than two labels')
         y = self.lb.transform(y).ravel()
 
+        if self.optimizer == LASVM:
+            # a single online pass over the samples followed by the finishing step
+            self.optimizer = self._make_lasvm().partial_fit(X, y).finish()
+            self._store_online_solution()
+            return self
+
+        if self.n_shards is not None:
+            # the subproblems are solved with the same settings, but with
+            # the gamma of the kernel computed on the whole training set
+            svc = clone(self).set_params(kernel=fixed_gamma(self.kernel, X), n_shards=None, n_jobs=None, verbose=False)
+            self.support_, svc = cascade(svc, X, y,
+                                         n_shards=self.n_shards,
+                                         n_jobs=self.n_jobs,
+                                         random_state=self.random_state,
+                                         verbose=self.verbose)
+            self.optimizer, self.kernel_ = svc.optimizer, svc.kernel
+            self.support_vectors_, self.sv_y, self.alphas = svc.support_vectors_, svc.sv_y, svc.alphas
+            self.dual_coef_, self.intercept_ = svc.dual_coef_, svc.intercept_
+            if isinstance(self.kernel, LinearKernel):
+                self.coef_ = svc.coef_
+            return self
+
         n_samples = len(y)
 
+        if self.working_set_size is not None:
+            # a variable for each sample, i.e., Q = K * y y^T
+            alphas = self._decomposition(X, samples=np.arange(n_samples), sign=y, offset=0., q=-np.ones(n_samples))
+            sv = alphas > 1e-5
+            self.support_ = np.flatnonzero(sv)
+            self.support_vectors_, self.sv_y, self.alphas = X[sv], y[sv], alphas[sv]
+            self.dual_coef_ = self.alphas * self.sv_y
+            if isinstance(self.kernel, LinearKernel):
+                self.coef_ = np.dot(self.dual_coef_, self.support_vectors_)
+            K_sv = self.kernel_(self.support_vectors_)
+            self.intercept_ = np.mean(self.sv_y - np.dot(K_sv, self.dual_coef_))
+            return self
+
+        self.kernel_ = self.kernel
+
+        # resume the SMO state of the previous fit from where it stopped
+        resume = self._can_resume(SMOClassifier, X, y)
+
         # kernel matrix
-        K = self.kernel(X)
+        K = self.optimizer.K if resume else self.kernel(X)
 
         Q = K * np.outer(y, y)
         q = -np.ones(n_samples)
@@ -521,10 +890,11 @@ class DualSVC(ClassifierMixin, DualSVM):
 
         self.obj = Quadratic(Q, q)
 
-        if self.optimizer == SMOClassifier:
+        if resume or self.optimizer == SMOClassifier or isinstance(self.optimizer, SMOClassifier):
 
-            self.optimizer = SMOClassifier(self.obj, X, y, K, self.kernel, self.C,
-                                           self.tol, self.verbose).minimize()
+            if not resume:
+                self.optimizer = SMOClassifier(self.obj, X, y, K, self.kernel, self.C, self.tol, verbose=self.verbose)
+            self.optimizer = self._minimize_smo(self.optimizer)
             alphas = self.optimizer.alphas
             if isinstance(self.kernel, LinearKernel):
                 self.coef_ = self.optimizer.w
@@ -596,9 +966,64 @@ class DualSVC(ClassifierMixin, DualSVM):
 
         return self
 
+    def partial_fit(self, X, y, classes=None):
+        """
+        Update the model with a chunk of samples by the online LASVM method, which
+        keeps just the candidate support vectors from the previous calls, so that
+        the cost of each update scales with their number instead of the number of
+        samples seen so far.
+
+        :param X: array-like of shape (n_samples, n_features), the chunk of data.
+        :param y: array-like of shape (n_samples,), the target values of the chunk.
+        :param classes: array-like of shape (n_classes,), the classes across all the
+                        calls, required at the first call since a chunk may not
+                        contain all of them, and ignored in the subsequent ones.
+        :return: self
+        """
+        if not (self.optimizer == LASVM or isinstance(self.optimizer, LASVM)):
+            raise TypeError('partial_fit is only supported by the LASVM optimizer')
+
+        if not hasattr(self.lb, 'classes_'):
+            if classes is None:
+                raise ValueError('classes must be passed on the first call to partial_fit')
+            self.lb.fit(classes)
+            if len(self.lb.classes_) > 2:
+                raise ValueError('use OneVsOneClassifier or OneVsRestClassifier from sklearn.multiclass '
+                                 'to train a model over more than two labels')
+        y = self.lb.transform(y).ravel()
+
+        if self.optimizer == LASVM:
+            self.optimizer = self._make_lasvm()
+        self.optimizer.partial_fit(X, y).finish()
+        self._store_online_solution()
+
+        return self
+
+    def _make_lasvm(self):
+        return LASVM(kernel=self.kernel,
+                     C=self.C,
+                     tol=self.tol,
+                     max_iter=self.max_iter,
+                     cache_size=self.cache_size,
+                     shuffle=self.shuffle,
+                     random_state=self.random_state,
+                     verbose=self.verbose)
+
+    def _store_online_solution(self):
+        # the online method fixes the gamma of the kernel on the first chunk of samples
+        self.kernel_ = self.optimizer.kernel
+        sv = self.optimizer.support()
+        self.support_vectors_ = self.optimizer.cache.X[sv]
+        self.sv_y = self.optimizer.y[sv]
+        self.dual_coef_ = self.optimizer.beta[sv]
+        self.alphas = np.abs(self.dual_coef_)
+        if isinstance(self.kernel, LinearKernel):
+            self.coef_ = np.dot(self.dual_coef_, self.support_vectors_)
+        self.intercept_ = self.optimizer.b
+
     def decision_function(self, X):
         if not isinstance(self.kernel, LinearKernel):
-            return np.dot(self.dual_coef_, self.kernel(self.support_vectors_, X)) + self.intercept_
+            return np.dot(self.dual_coef_, self.kernel_(self.support_vectors_, X)) + self.intercept_
         return np.dot(X, self.coef_) + self.intercept_
 
     def predict(self, X):
@@ -612,6 +1037,7 @@ class PrimalSVR(RegressorMixin, LinearModel, PrimalSVM):
                  epsilon=0.,
                  tol=1e-4,
                  loss=epsilon_insensitive,
+                 smoothing=0.1,
                  optimizer=AdaGrad,
                  max_iter=1000,
                  learning_rate=0.1,
@@ -631,6 +1057,7 @@ class PrimalSVR(RegressorMixin, LinearModel, PrimalSVM):
         super().__init__(C=C,
                          tol=tol,
                          loss=loss,
+                         smoothing=smoothing,
                          optimizer=optimizer,
                          max_iter=max_iter,
                          learning_rate=learning_rate,
@@ -653,15 +1080,20 @@ class PrimalSVR(RegressorMixin, LinearModel, PrimalSVM):
             raise ValueError('epsilon must be >= 0')
         self.epsilon = epsilon
 
+    def _make_loss(self, X, y):
+        if issubclass(self.loss, SmoothedEpsilonInsensitive):
+            return self.loss(self, X, y, self.epsilon, np.atleast_1d(self.smoothing)[0], self.fit_intercept)
+        return self.loss(self, X, y, self.epsilon, self.fit_intercept)
+
     def _store_train_val_info(self, opt, X_batch, y_batch, X_val, y_val):
         super()._store_train_val_info(opt, X_batch, y_batch, X_val, y_val)
         if opt.is_batch_end():
-            r2 = self.score(X_batch[:, :-1], y_batch)
+            r2 = self.score(X_batch, y_batch)
             self.train_score_history.append(r2)
             if opt.is_verbose():
                 print(' - r2: {: 1.4f}'.format(r2), end='')
             if self.early_stopping:
-                val_r2 = self.score(X_val[:, :-1], y_val)
+                val_r2 = self.score(X_val, y_val)
                 self.val_score_history.append(val_r2)
                 if opt.is_verbose():
                     print(' - val_r2: {: 1.4f}'.format(val_r2), end='')
@@ -675,12 +1107,7 @@ class PrimalSVR(RegressorMixin, LinearModel, PrimalSVM):
 
         if issubclass(self.optimizer, LineSearchOptimizer):
 
-            if self.fit_intercept:
-                X_biased = np.c_[X, np.ones_like(y)]
-            else:
-                X_biased = X
-
-            self.loss = self.loss(self, X_biased, y, self.epsilon)
+            self.loss = self._make_loss(X, y)
             self.optimizer = self.optimizer(f=self.loss,
                                             x=np.zeros(self.loss.ndim),
                                             max_iter=self.max_iter,
@@ -697,12 +1124,7 @@ class PrimalSVR(RegressorMixin, LinearModel, PrimalSVM):
 
         elif issubclass(self.optimizer, ProximalBundle):
 
-            if self.fit_intercept:
-                X_biased = np.c_[X, np.ones_like(y)]
-            else:
-                X_biased = X
-
-            self.loss = self.loss(self, X_biased, y, self.epsilon)
+            self.loss = self._make_loss(X, y)
             self.optimizer = self.optimizer(f=self.loss,
                                             x=np.zeros(self.loss.ndim),
                                             max_iter=self.max_iter,
@@ -715,47 +1137,70 @@ class PrimalSVR(RegressorMixin, LinearModel, PrimalSVM):
 
             self._unpack(self.optimizer.x)
 
+        elif issubclass(self.optimizer, DualCoordinateDescent):
+
+            self.loss = self._make_loss(X, y)
+            self.optimizer = self.optimizer(f=self.loss,
+                                            x=np.zeros(self.loss.ndim),
+                                            eps=self.tol,
+                                            max_iter=self.max_iter,
+                                            shuffle=self.shuffle,
+                                            random_state=self.random_state,
+                                            verbose=self.verbose).minimize()
+
+            if self.optimizer.status == 'stopped':
+                warnings.warn('max_iter reached but the optimization has not converged yet', ConvergenceWarning)
+
+            self._unpack(self.optimizer.x)
+
         elif issubclass(self.optimizer, StochasticOptimizer):
 
             if self.validation_split:
                 X, X_val, y, y_val = train_test_split(X, y,
                                                       test_size=self.validation_split,
                                                       random_state=self.random_state)
-
-                if self.fit_intercept:
-                    X_val_biased = np.c_[X_val, np.ones_like(y_val)]
-                else:
-                    X_val_biased = X_val
-
             else:
-                X_val_biased = None
+                X_val = None
                 y_val = None
 
-            if self.fit_intercept:
-                X_biased = np.c_[X, np.ones_like(y)]
-            else:
-                X_biased = X
-
-            self.loss = self.loss(self, X_biased, y, self.epsilon)
+            self.loss = self._make_loss(X, y)
             self.optimizer = self.optimizer(f=self.loss,
                                             x=np.zeros(self.loss.ndim),
+                                            batch_size=self.batch_size,
                                             epochs=self.max_iter,
                                             step_size=self.learning_rate,
                                             momentum_type=self.momentum_type,
                                             momentum=self.momentum,
                                             callback=self._store_train_val_info,
-                                            callback_args=(X_val_biased, y_val),
+                                            callback_args=(X_val, y_val),
                                             shuffle=self.shuffle,
                                             random_state=self.random_state,
                                             verbose=self.verbose).minimize()
 
-        if self.fit_intercept and X.shape[1] > 1:
-            self.loss.X = X
+            self._unpack(self.optimizer.x)
+
+        self._continue_smoothing()
 
         return self
 
+    def partial_fit(self, X, y):
+        """
+        Update the model by a single pass over a chunk of data, e.g., of a stream,
+        with the stochastic optimizer, keeping its state from the previous calls.
+
+        :param X: array-like of shape (n_samples, n_features), the chunk of data.
+        :param y: array-like of shape (n_samples,), the target values of the chunk.
+        :return: self
+        """
+        targets = y.shape[1] if y.ndim > 1 else 1
+        if targets > 1:
+            raise ValueError('use sklearn.multioutput.MultiOutputRegressor '
+                             'to train a model over more than one target')
+
+        return self._partial_fit(X, y)
+
     def predict(self, X):
-        return np.dot(X, self.coef_) + self.intercept_
+        return safe_sparse_dot(X, self.coef_) + self.intercept_
 
 
 class DualSVR(RegressorMixin, DualSVM):
@@ -776,6 +1221,10 @@ class DualSVR(RegressorMixin, DualSVM):
                  master_verbose=False,
                  shuffle=True,
                  random_state=None,
+                 cache_size=1000,
+                 working_set_size=None,
+                 max_time=None,
+                 warm_start=False,
                  verbose=False):
         super().__init__(kernel=kernel,
                          C=C,
@@ -791,6 +1240,10 @@ class DualSVR(RegressorMixin, DualSVM):
                          master_verbose=master_verbose,
                          shuffle=shuffle,
                          random_state=random_state,
+                         cache_size=cache_size,
+                         working_set_size=working_set_size,
+                         max_time=max_time,
+                         warm_start=warm_start,
                          verbose=verbose)
         if not epsilon >= 0:
             raise ValueError('epsilon must be >= 0')
@@ -804,8 +1257,31 @@ class DualSVR(RegressorMixin, DualSVM):
 
         n_samples = len(y)
 
+        if self.working_set_size is not None:
+            # the variables alphas_p and alphas_n for each sample, i.e., Q = [K, -K; -K, K] + A A^T
+            alphas = self._decomposition(X,
+                                         samples=np.tile(np.arange(n_samples), 2),
+                                         sign=np.hstack((np.ones(n_samples), -np.ones(n_samples))),
+                                         offset=1.,
+                                         q=np.hstack((-y, y)) + self.epsilon)
+            alphas_p, alphas_n = np.split(alphas, 2)
+            sv = np.logical_or(alphas_p > 1e-5, alphas_n > 1e-5)
+            self.support_ = np.flatnonzero(sv)
+            self.support_vectors_, self.sv_y, self.alphas_p, self.alphas_n = X[sv], y[sv], alphas_p[sv], alphas_n[sv]
+            self.dual_coef_ = self.alphas_p - self.alphas_n
+            if isinstance(self.kernel, LinearKernel):
+                self.coef_ = np.dot(self.dual_coef_, self.support_vectors_)
+            K_sv = self.kernel_(self.support_vectors_)
+            self.intercept_ = (np.sum(self.sv_y - np.dot(K_sv, self.dual_coef_)) - self.epsilon) / len(self.sv_y)
+            return self
+
+        self.kernel_ = self.kernel
+
+        # resume the SMO state of the previous fit from where it stopped
+        resume = self._can_resume(SMORegression, X, y, epsilon=self.epsilon)
+
         # kernel matrix
-        K = self.kernel(X)
+        K = self.optimizer.K if resume else self.kernel(X)
 
         Q = np.vstack((np.hstack((K, -K)),
                        np.hstack((-K, K))))
@@ -815,10 +1291,12 @@ class DualSVR(RegressorMixin, DualSVM):
 
         self.obj = Quadratic(Q, q)
 
-        if self.optimizer == SMORegression:
+        if resume or self.optimizer == SMORegression or isinstance(self.optimizer, SMORegression):
 
-            self.optimizer = SMORegression(self.obj, X, y, K, self.kernel, self.C,
-                                           self.epsilon, self.tol, self.verbose).minimize()
+            if not resume:
+                self.optimizer = SMORegression(self.obj, X, y, K, self.kernel, self.C,
+                                               self.epsilon, self.tol, verbose=self.verbose)
+            self.optimizer = self._minimize_smo(self.optimizer)
             alphas_p, alphas_n = self.optimizer.alphas_p, self.optimizer.alphas_n
             if isinstance(self.kernel, LinearKernel):
                 self.coef_ = self.optimizer.w
@@ -903,5 +1381,5 @@ class DualSVR(RegressorMixin, DualSVM):
 
     def predict(self, X):
         if not isinstance(self.kernel, LinearKernel):
-            return np.dot(self.dual_coef_, self.kernel(self.support_vectors_, X)) + self.intercept_
+            return np.dot(self.dual_coef_, self.kernel_(self.support_vectors_, X)) + self.intercept_
         return np.dot(X, self.coef_) + self.intercept_
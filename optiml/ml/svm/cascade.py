@@ -0,0 +1,126 @@
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.utils import check_random_state, gen_batches
+
+
+def _fit_subset(svc, X, y, idx):
+    """
+    Fit the support vector classifier on the samples idx of X, which is memory
+    mapped by joblib when large, so that it is shared among the processes.
+
+    :return: the indices in X of the support vectors and the fitted classifier.
+    """
+    if len(np.unique(y[idx])) < 2:  # nothing to separate, keep all the samples
+        return idx, None
+    svc = clone(svc).fit(X[idx], y[idx])
+    return idx[svc.support_], svc
+
+
+def _violators(svc, X, y, idx, batch_size=1000):
+    """
+    Return the samples idx of X which violate the optimality conditions of the
+    solution of the classifier, i.e., whose margin is less than 1 - tol, computing
+    the decision function by batches to bound the memory needed by the kernel.
+    """
+    margins = np.concatenate([y[idx[batch]] * svc.decision_function(X[idx[batch]])
+                              for batch in gen_batches(len(idx), batch_size)])
+    return idx[margins < 1 - svc.tol]
+
+
+def _dual_objective(svc):
+    """
+    Return the objective of the dual problem solved by the classifier, i.e.,
+    1/2 sum_ij alpha_i alpha_j y_i y_j K(x_i, x_j) - sum_i alpha_i, whose
+    terms are nonzero just for the support vectors.
+    """
+    K = svc.kernel_(svc.support_vectors_)
+    return 0.5 * np.dot(svc.dual_coef_, np.dot(K, svc.dual_coef_)) - np.sum(svc.alphas)
+
+
+def _split(y, n_shards, random_state):
+    """
+    Split the samples into n_shards disjoint random subsets
+    stratified on the labels, so that each of them holds both classes.
+    """
+    shards = [[] for _ in range(n_shards)]
+    for label in np.unique(y):
+        idx = random_state.permutation(np.flatnonzero(y == label))
+        for shard, part in zip(shards, np.array_split(idx, n_shards)):
+            shard.append(part)
+    return [np.sort(np.concatenate(shard)) for shard in shards]
+
+
+def cascade(svc, X, y, n_shards, n_jobs=None, max_passes=5, random_state=None, verbose=False):
+    """
+    Train a binary support vector classifier by the cascade method, i.e., the samples
+    are split into n_shards subsets which are independently solved in parallel, then the
+    support vectors of each pair of solutions are merged and solved again, layer by layer,
+    up to a single subset. Since the samples which are not support vectors of a subset are
+    unlikely to be support vectors of the whole problem, each layer works on far fewer
+    samples than the previous one. The support vectors of the last layer are fed back into
+    each subset of the first one until all the other samples satisfy the optimality conditions
+    of their solution, which is then the optimal solution of the whole problem, or until the
+    dual objective of the last layer, which decreases monotonically, does not improve anymore.
+
+    References
+
+    H.P. Graf, E. Cosatto, L. Bottou, I. Durdanovic, V. Vapnik. Parallel Support Vector
+    Machines: The Cascade SVM. NIPS 2004.
+
+    :param svc:          the unfitted support vector classifier used to solve each subset.
+    :param X:            array-like of shape (n_samples, n_features), the training data.
+    :param y:            array-like of shape (n_samples,), the labels in {-1, +1}.
+    :param n_shards:     the number of subsets of the first layer.
+    :param n_jobs:       the number of processes used to solve the subsets of each layer.
+    :param max_passes:   the maximum number of passes through the cascade.
+    :param random_state: the seed of the random split of the samples into subsets.
+    :param verbose:      print the number of support vectors of each layer if True.
+    :return:             the indices in X of the support vectors and the classifier
+                         fitted on them by the last layer.
+    """
+    if not n_shards > 1:
+        raise ValueError('n_shards must be > 1')
+
+    shards = _split(y, n_shards, check_random_state(random_state))
+    sv = np.zeros(0, dtype=int)
+    f_x = np.inf
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+
+        for p in range(max_passes):
+
+            layer = [np.union1d(shard, sv) for shard in shards]
+
+            while True:
+                results = parallel(delayed(_fit_subset)(svc, X, y, idx) for idx in layer)
+
+                if verbose:
+                    print(f'pass {p} - layer sizes: {[len(idx) for idx in layer]} '
+                          f'- support vectors: {[len(idx) for idx, _ in results]}')
+
+                if len(results) == 1:
+                    break
+
+                # merge the support vectors of each pair of subsets
+                layer = [np.union1d(results[i][0], results[i + 1][0]) if i + 1 < len(results) else results[i][0]
+                         for i in range(0, len(results), 2)]
+
+            sv, fitted = results[0]
+
+            # the solution of the support vectors is optimal for the whole problem if all
+            # the other samples satisfy the optimality conditions, i.e., lie beyond the margin
+            violators = parallel(delayed(_violators)(fitted, X, y, np.setdiff1d(shard, sv)) for shard in shards)
+            n_violators = sum(len(v) for v in violators)
+
+            # otherwise, the dual objective of the last layer decreases monotonically over the
+            # passes, so stop when the violators are within the accuracy of the solver
+            f_x_m1, f_x = f_x, _dual_objective(fitted)
+
+            if verbose:
+                print(f'pass {p} - violators: {n_violators} - dual objective: {f_x:.6e}')
+
+            if not n_violators or f_x_m1 - f_x <= svc.tol * abs(f_x):
+                break
+
+    return sv, fitted
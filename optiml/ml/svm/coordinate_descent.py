@@ -0,0 +1,341 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.utils import check_random_state
+from sklearn.utils.extmath import safe_sparse_dot, row_norms
+
+from .losses import SVMLoss, SVCLoss, Hinge, SquaredHinge, EpsilonInsensitive, SquaredEpsilonInsensitive
+from ...opti import Optimizer
+
+
+class DualCoordinateDescent(Optimizer):
+    """
+    Implements the dual coordinate descent method for training linear
+    support vector machines in their primal formulation.
+
+    The method solves the dual of the L1 or L2 loss SVM, one variable at a time
+    in a random order, while the primal weight vector w = sum_i alpha_i x_i is
+    maintained so that each coordinate update just costs O(d) operations, i.e.,
+    one pass over a single sample. The samples whose dual variables are likely
+    to stay at their bounds are temporarily removed from the problem (shrinking)
+    until the optimality of the reduced problem is attained.
+
+    The classification method follows Hsieh et al. for the Hinge (L1 loss) and
+    the squared Hinge (L2 loss) losses while the regression method follows Ho
+    and Lin for the epsilon-insensitive (L1 loss) and the squared epsilon-insensitive
+    (L2 loss) losses. If the loss fits the intercept, it is treated as an additional
+    feature whose value is always 1 and so it is regularized too, as in the primal.
+
+    References
+
+    C.J. Hsieh, K.W. Chang, C.J. Lin, S.S. Keerthi, S. Sundararajan. A Dual Coordinate
+    Descent Method for Large-scale Linear SVM. ICML 2008.
+
+    C.H. Ho, C.J. Lin. Large-scale Linear Support Vector Regression. JMLR 2012.
+    """
+
+    def __init__(self,
+                 f,
+                 x,
+                 eps=1e-3,
+                 max_iter=1000,
+                 shrinking=True,
+                 shuffle=True,
+                 random_state=None,
+                 callback=None,
+                 callback_args=(),
+                 verbose=False):
+        """
+
+        :param f:            the SVM loss function.
+        :param x:            ([n x 1] real column vector): the primal point, it is overwritten
+                             with the one corresponding to the current dual variables.
+        :param eps:          (real scalar, optional, default value 1e-3): the accuracy in the stopping
+                             criterion: the algorithm is stopped when the maximal violation of the
+                             optimality conditions (relative to the first one for regression) is less
+                             than or equal to eps.
+        :param max_iter:     (integer scalar, optional, default value 1000): the maximum number of
+                             iterations, i.e., of sweeps over the dual variables.
+        :param shrinking:    (boolean, optional, default value True): whether to use the shrinking heuristic.
+        :param shuffle:      (boolean, optional, default value True): whether to visit the dual variables in
+                             a random order at each iteration.
+        :param random_state: (integer, optional, default value None): the seed of the random permutations.
+        :param verbose:      (boolean, optional, default value False): print details about each iteration
+                             if True, nothing otherwise.
+        """
+        if not isinstance(f, SVMLoss):
+            raise TypeError(f'{f} is not an allowed SVM loss function')
+        if not isinstance(f, (Hinge, EpsilonInsensitive)):
+            raise TypeError(f'{type(f).__name__} loss is not supported by the dual coordinate descent method')
+        if f.n_outputs > 1:
+            raise ValueError('use OneVsRestClassifier from sklearn.multiclass to train '
+                             'a model over more than two labels by dual coordinate descent')
+        super().__init__(f=f,
+                         x=x,
+                         eps=eps,
+                         max_iter=max_iter,
+                         callback=callback,
+                         callback_args=callback_args,
+                         verbose=verbose)
+        self.shrinking = shrinking
+        self.shuffle = shuffle
+        self.random_state = random_state
+        self.alphas = np.zeros(f.X.shape[0])
+
+    def _pack(self, coef, inter):
+        if self.f.fit_intercept:
+            return np.append(coef, inter)
+        return coef.copy()
+
+    def minimize(self):
+        X, y = self.f.X, self.f.y
+        rs = check_random_state(self.random_state)
+
+        # L1 losses have box-constrained dual variables, L2 ones
+        # have unbounded variables and a diagonal added to Q
+        if isinstance(self.f, (SquaredHinge, SquaredEpsilonInsensitive)):
+            ub = np.inf
+            diag = 1 / (2 * self.f.svm.C)
+        else:
+            ub = self.f.svm.C
+            diag = 0.
+
+        # warm restart from the current dual variables (e.g., after a change of C)
+        if isinstance(self.f, SVCLoss):
+            self.alphas = np.clip(self.alphas, 0., ub)
+            alphas_y = self.alphas * y
+        else:
+            self.alphas = np.clip(self.alphas, -ub, ub)
+            alphas_y = self.alphas
+
+        # maintained primal point, i.e., w = sum_i alpha_i y_i x_i
+        coef = safe_sparse_dot(alphas_y, X)
+        inter = np.sum(alphas_y) if self.f.fit_intercept else 0.
+
+        # diagonal of the Hessian of the dual, i.e., Q_ii = x_i^T x_i (+ 1)
+        QD = row_norms(X, squared=True) + self.f.fit_intercept
+
+        if sp.issparse(X):
+            X = sp.csr_matrix(X)
+
+        if self.verbose:
+            print('iter\t cost\t\t viol\t\t active', end='')
+
+        if isinstance(self.f, SVCLoss):
+            self._minimize_svc(X, y, QD, coef, inter, ub, diag, rs)
+        else:
+            self._minimize_svr(X, y, QD, coef, inter, ub, diag, rs)
+
+        if self.verbose:
+            print('\n')
+
+        return self
+
+    @staticmethod
+    def _row(X, i):
+        """
+        The indices of the features and the values of the i-th sample, i.e.,
+        just its nonzero ones from the CSR slices if X is sparse, so that both
+        the dot with coef and its update cost O(nnz) rather than O(n_features).
+        """
+        if sp.issparse(X):
+            start, end = X.indptr[i], X.indptr[i + 1]
+            return X.indices[start:end], X.data[start:end]
+        return slice(None), X[i]
+
+    def _end_iteration(self, coef, inter, viol, active_size):
+        self.x = self._pack(coef, inter)
+        self.f_x = self.f.function(self.x)
+
+        if self.is_verbose():
+            print('\n{:4d}\t{: 1.4e}\t{: 1.4e}\t{:6d}'.format(self.iter, self.f_x, viol, active_size), end='')
+
+        try:
+            self.callback()
+        except StopIteration:
+            return True
+
+        return False
+
+    def _minimize_svc(self, X, y, QD, coef, inter, ub, diag, rs):
+        n_samples = X.shape[0]
+        QD = QD + diag
+        index = np.arange(n_samples)
+        active_size = n_samples
+
+        # bounds of the projected gradient of the last iteration used for shrinking
+        PG_max_old = np.inf
+        PG_min_old = -np.inf
+
+        while True:
+
+            if self.iter >= self.max_iter:
+                self.status = 'stopped'
+                break
+
+            PG_max_new = -np.inf
+            PG_min_new = np.inf
+
+            if self.shuffle:
+                rs.shuffle(index[:active_size])
+
+            s = 0
+            while s < active_size:
+                i = index[s]
+                alpha_i = self.alphas[i]
+                idx, x_i = self._row(X, i)
+
+                G = y[i] * (np.dot(x_i, coef[idx]) + inter) - 1 + diag * alpha_i
+
+                # projected gradient
+                PG = 0.
+                if alpha_i == 0:
+                    if G > PG_max_old and self.shrinking:
+                        active_size -= 1
+                        index[s], index[active_size] = index[active_size], index[s]
+                        continue
+                    elif G < 0:
+                        PG = G
+                elif alpha_i == ub:
+                    if G < PG_min_old and self.shrinking:
+                        active_size -= 1
+                        index[s], index[active_size] = index[active_size], index[s]
+                        continue
+                    elif G > 0:
+                        PG = G
+                else:
+                    PG = G
+
+                PG_max_new = max(PG_max_new, PG)
+                PG_min_new = min(PG_min_new, PG)
+
+                if abs(PG) > 1e-12:
+                    self.alphas[i] = min(max(alpha_i - G / QD[i], 0.), ub)
+                    d = (self.alphas[i] - alpha_i) * y[i]
+                    coef[idx] += d * x_i
+                    if self.f.fit_intercept:
+                        inter += d
+
+                s += 1
+
+            viol = PG_max_new - PG_min_new
+
+            if self._end_iteration(coef, inter, viol, active_size):
+                break
+
+            self.iter += 1
+
+            if viol <= self.eps:
+                if active_size == n_samples:
+                    self.status = 'optimal'
+                    break
+                # optimality of the shrunk problem, check it on the whole one
+                active_size = n_samples
+                PG_max_old = np.inf
+                PG_min_old = -np.inf
+                continue
+
+            PG_max_old = PG_max_new if PG_max_new > 0 else np.inf
+            PG_min_old = PG_min_new if PG_min_new < 0 else -np.inf
+
+    def _minimize_svr(self, X, y, QD, coef, inter, ub, diag, rs):
+        n_samples = X.shape[0]
+        epsilon = self.f.epsilon
+        index = np.arange(n_samples)
+        active_size = n_samples
+
+        # maximal violation of the last iteration used for shrinking
+        G_max_old = np.inf
+        G_norm1_init = None
+
+        while True:
+
+            if self.iter >= self.max_iter:
+                self.status = 'stopped'
+                break
+
+            G_max_new = 0.
+            G_norm1_new = 0.
+
+            if self.shuffle:
+                rs.shuffle(index[:active_size])
+
+            s = 0
+            while s < active_size:
+                i = index[s]
+                beta_i = self.alphas[i]
+                idx, x_i = self._row(X, i)
+
+                G = -y[i] + diag * beta_i + np.dot(x_i, coef[idx]) + inter
+                H = QD[i] + diag
+
+                Gp = G + epsilon
+                Gn = G - epsilon
+
+                violation = 0.
+                if beta_i == 0:
+                    if Gp < 0:
+                        violation = -Gp
+                    elif Gn > 0:
+                        violation = Gn
+                    elif Gp > G_max_old and Gn < -G_max_old and self.shrinking:
+                        active_size -= 1
+                        index[s], index[active_size] = index[active_size], index[s]
+                        continue
+                elif beta_i >= ub:
+                    if Gp > 0:
+                        violation = Gp
+                    elif Gp < -G_max_old and self.shrinking:
+                        active_size -= 1
+                        index[s], index[active_size] = index[active_size], index[s]
+                        continue
+                elif beta_i <= -ub:
+                    if Gn < 0:
+                        violation = -Gn
+                    elif Gn > G_max_old and self.shrinking:
+                        active_size -= 1
+                        index[s], index[active_size] = index[active_size], index[s]
+                        continue
+                elif beta_i > 0:
+                    violation = abs(Gp)
+                else:
+                    violation = abs(Gn)
+
+                G_max_new = max(G_max_new, violation)
+                G_norm1_new += violation
+
+                # compute the Newton direction of the one-variable
+                # subproblem, which is piecewise quadratic
+                if Gp < H * beta_i:
+                    d = -Gp / H
+                elif Gn > H * beta_i:
+                    d = -Gn / H
+                else:
+                    d = -beta_i
+
+                if abs(d) > 1e-12:
+                    self.alphas[i] = min(max(beta_i + d, -ub), ub)
+                    d = self.alphas[i] - beta_i
+                    coef[idx] += d * x_i
+                    if self.f.fit_intercept:
+                        inter += d
+
+                s += 1
+
+            if G_norm1_init is None:
+                G_norm1_init = G_norm1_new
+
+            if self._end_iteration(coef, inter, G_norm1_new, active_size):
+                break
+
+            self.iter += 1
+
+            if G_norm1_new <= self.eps * G_norm1_init:
+                if active_size == n_samples:
+                    self.status = 'optimal'
+                    break
+                # optimality of the shrunk problem, check it on the whole one
+                active_size = n_samples
+                G_max_old = np.inf
+                continue
+
+            G_max_old = G_max_new
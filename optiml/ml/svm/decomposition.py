@@ -0,0 +1,161 @@
+import numpy as np
+
+from .kernels import fixed_gamma
+from .lasvm import KernelCache
+from ...opti import Quadratic
+from ...opti.constrained import BoxConstrainedQuadraticOptimizer
+
+
+class Decomposition:
+    """
+    Implements a decomposition method for training kernel support vector machines
+    in their dual formulation, i.e., the box-constrained quadratic problem:
+
+            min { 1/2 x^T Q x + q^T x : 0 <= x <= ub }
+
+    where Q_vw = s_v s_w (K(x_i(v), x_i(w)) + c) is never formed as a whole. At each
+    iteration, a working set of the working_set_size variables which most violate the
+    optimality conditions, i.e., with the largest projected gradient, is selected and
+    the subproblem restricted to them, with all the other variables fixed, is solved
+    by one of the box-constrained quadratic optimizers. The gradient of the whole
+    problem is then updated by the kernel rows of the working set, which are kept in
+    a bounded least recently used cache, until the largest projected gradient is not
+    greater than tol.
+
+    The classification problem has a variable for each sample with s = y and c = 0,
+    while the regression one has two variables for each sample, i.e., alphas_p and
+    alphas_n, with s = +1 and s = -1 respectively, and c = 1, i.e., the equality
+    constraint of the dual is added as a penalty to Q.
+
+    References
+
+    T. Joachims. Making Large-Scale SVM Learning Practical. Advances in Kernel
+    Methods - Support Vector Learning, MIT Press, 1999.
+    """
+
+    def __init__(self,
+                 X,
+                 samples,
+                 sign,
+                 offset,
+                 q,
+                 ub,
+                 kernel,
+                 optimizer,
+                 working_set_size=100,
+                 tol=1e-3,
+                 max_iter=1000,
+                 cache_size=1000,
+                 verbose=False):
+        """
+
+        :param X:                array-like of shape (n_samples, n_features), the training data.
+        :param samples:          ([n x 1] integer column vector): the sample of each variable.
+        :param sign:             ([n x 1] real column vector): the sign s of each variable.
+        :param offset:           (real scalar): the constant c added to the kernel.
+        :param q:                ([n x 1] real column vector): the linear part of the problem.
+        :param ub:               ([n x 1] real column vector): the upper bounds of the variables.
+        :param kernel:           the kernel function, if its gamma is 'scale' or 'auto' it is fixed on X.
+        :param optimizer:        the BoxConstrainedQuadraticOptimizer subclass used to solve the subproblems.
+        :param working_set_size: (integer scalar, optional, default value 100): the number of variables
+                                 of each subproblem.
+        :param tol:              (real scalar, optional, default value 1e-3): the accuracy in the stopping
+                                 criterion: the algorithm is stopped when the largest projected gradient
+                                 is less than or equal to tol.
+        :param max_iter:         (integer scalar, optional, default value 1000): the maximum number of
+                                 subproblems solved.
+        :param cache_size:       (integer scalar, optional, default value 1000): the maximum number of
+                                 cached kernel rows.
+        :param verbose:          (boolean, optional, default value False): print details about each
+                                 iteration if True, nothing otherwise.
+        """
+        if not issubclass(optimizer, BoxConstrainedQuadraticOptimizer):
+            raise TypeError(f'{optimizer} is not an allowed box-constrained quadratic optimizer')
+        if not working_set_size > 1:
+            raise ValueError('working_set_size must be > 1')
+        self.kernel = fixed_gamma(kernel, X)
+        self.cache = KernelCache(self.kernel, cache_size)
+        self.cache.extend(X)
+        self.samples = np.asarray(samples)
+        self.sign = np.asarray(sign, dtype=float)
+        self.offset = offset
+        self.q = np.asarray(q, dtype=float)
+        self.ub = np.asarray(ub, dtype=float)
+        self.optimizer = optimizer
+        self.working_set_size = min(working_set_size, len(self.q))
+        self.tol = tol
+        self.max_iter = max_iter
+        self.verbose = verbose
+        self.x = np.zeros(len(self.q))
+        self.g_x = self.q.copy()  # the gradient Q x + q at x = 0
+        self.f_x = 0.
+        self.iter = 0
+        self.status = 'unknown'
+
+    def _rows(self, B):
+        """
+        Compute the rows of Q of the variables in B by the kernel
+        rows of their samples, shared by the variables of a sample.
+        """
+        samples, inverse = np.unique(self.samples[B], return_inverse=True)
+        K_B = self.cache.block(samples)[inverse][:, self.samples]
+        return self.sign[B, np.newaxis] * self.sign * (K_B + self.offset)
+
+    def projected_gradient(self):
+        pg = self.g_x.copy()
+        pg[(self.x <= 0) & (pg > 0)] = 0.
+        pg[(self.x >= self.ub) & (pg < 0)] = 0.
+        return pg
+
+    def minimize(self):
+
+        if self.verbose:
+            print('iter\t cost\t\t viol')
+
+        while True:
+            pg = self.projected_gradient()
+            viol = np.max(np.abs(pg))
+
+            if self.verbose and not self.iter % self.verbose:
+                print('{:4d}\t{: 1.4e}\t{: 1.4e}'.format(self.iter, self.f_x, viol))
+
+            if viol <= self.tol:
+                self.status = 'optimal'
+                break
+
+            if self.iter >= self.max_iter:
+                self.status = 'stopped'
+                break
+
+            # working set of the most violating variables
+            B = np.argpartition(-np.abs(pg), self.working_set_size - 1)[:self.working_set_size]
+
+            # subproblem wrt x_B with the other variables fixed, i.e.,
+            # 1/2 x_B^T Q_BB x_B + (g_B - Q_BB x_B)^T x_B + const
+            Q_B = self._rows(B)
+            Q_BB = Q_B[:, B]
+            x_B = self.x[B]
+            sub = Quadratic(Q_BB, self.g_x[B] - Q_BB.dot(x_B))
+            x_B_new = self.optimizer(f=sub, ub=self.ub[B], max_iter=self.max_iter).minimize().x
+
+            # to prevent precision problems, e.g., with the interior point method
+            x_B_new = np.clip(x_B_new, 0., self.ub[B])
+            x_B_new[x_B_new <= 1e-8 * self.ub[B]] = 0.
+            x_B_new[x_B_new >= (1 - 1e-8) * self.ub[B]] = self.ub[B][x_B_new >= (1 - 1e-8) * self.ub[B]]
+
+            if sub.function(x_B_new) >= sub.function(x_B):
+                # the subproblem solver did not improve the current point
+                self.status = 'stopped'
+                break
+
+            d = x_B_new - x_B
+            self.x[B] = x_B_new
+            self.g_x += Q_B.T.dot(d)
+            self.f_x = 0.5 * self.x.dot(self.g_x + self.q)
+
+            self.iter += 1
+
+        if self.verbose:
+            print()
+
+        return self
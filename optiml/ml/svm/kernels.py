@@ -1,7 +1,7 @@
 from abc import ABC
 
 import numpy as np
-from sklearn.base import BaseEstimator
+from sklearn.base import BaseEstimator, clone
 
 
 class Kernel(BaseEstimator, ABC):
@@ -100,6 +100,18 @@ class SigmoidKernel(Kernel):
         return np.tanh(gamma * np.dot(X, Y.T) + self.coef0)
 
 
+def fixed_gamma(kernel, X):
+    """
+    Return a copy of the kernel whose 'scale' or 'auto' gamma is computed on X
+    once for all, since otherwise it is recomputed on the first argument of each
+    call, e.g., when the kernel is evaluated on subsets or chunks of the samples.
+    """
+    if isinstance(getattr(kernel, 'gamma', None), str):
+        gamma = 1. / (X.shape[1] * X.var()) if kernel.gamma == 'scale' else 1. / X.shape[1]
+        return clone(kernel).set_params(gamma=gamma)
+    return kernel
+
+
 linear = LinearKernel()
 poly = PolyKernel()
 gaussian = GaussianKernel()
@@ -0,0 +1,332 @@
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.utils import check_random_state
+
+from .kernels import gaussian, fixed_gamma
+
+
+class KernelCache:
+    """
+    Least recently used cache of the rows of the kernel matrix of a set of samples
+    which grows and shrinks over time, e.g., the candidate support vectors of an
+    online SVM. Each row is stored in the order of the positions of the samples in
+    the set and it is lazily completed when new samples are added, so that at most
+    cache_size rows are kept in memory whatever the number of samples seen.
+    """
+
+    def __init__(self, kernel, cache_size=1000):
+        if not cache_size > 0:
+            raise ValueError('cache_size must be > 0')
+        self.kernel = kernel
+        self.cache_size = cache_size
+        self.X = None
+        self.ids = np.zeros(0, dtype=int)  # ids of the samples, stable while their positions change
+        self.next_id = 0
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def kernel_row(self, x):
+        """
+        Compute the kernel values between a new sample and the samples of the set.
+        :param x: 1D array, the new sample.
+        :return:  the kernel values between x and the samples of the set followed by K(x, x).
+        """
+        x = x[np.newaxis]
+        if self.X is None:
+            return self.kernel(x, x)[0]
+        return self.kernel(x, np.vstack((self.X, x)))[0]
+
+    def append(self, x, row):
+        """
+        Add a new sample at the end of the set.
+        :param x:   1D array, the new sample.
+        :param row: the kernel values between x and the samples of the set followed by K(x, x).
+        """
+        self.X = x[np.newaxis].copy() if self.X is None else np.vstack((self.X, x))
+        self.ids = np.append(self.ids, self.next_id)
+        self._store(self.next_id, np.array(row, dtype=float))
+        self.next_id += 1
+
+    def extend(self, X):
+        """
+        Add new samples at the end of the set, whose rows are computed when needed.
+        :param X: array-like of shape (n_samples, n_features), the new samples.
+        """
+        self.X = np.array(X, dtype=float) if self.X is None else np.vstack((self.X, X))
+        self.ids = np.append(self.ids, np.arange(self.next_id, self.next_id + len(X)))
+        self.next_id += len(X)
+
+    def row(self, p):
+        """
+        Return the kernel values between the sample at position p and all the samples
+        of the set, computing just the ones which are missing from the cached row.
+        :param p: the position of the sample in the set.
+        :return:  1D array of the kernel values.
+        """
+        key = self.ids[p]
+        row = self.rows.get(key)
+        if row is not None and len(row) == len(self):
+            self.rows.move_to_end(key)
+            self.hits += 1
+            return row
+        self.misses += 1
+        start = 0 if row is None else len(row)
+        missing = self.kernel(self.X[p:p + 1], self.X[start:])[0]
+        row = missing if row is None else np.append(row, missing)
+        self._store(key, row)
+        return row
+
+    def block(self, P):
+        """
+        Return the rows of the samples at positions P, computing
+        all the missing ones by a single call to the kernel.
+        :param P: 1D array of the positions of the samples in the set.
+        :return:  2D array of shape (len(P), len(set)) of the kernel values.
+        """
+        block = np.empty((len(P), len(self)))
+        missing = []
+        for r, p in enumerate(P):
+            row = self.rows.get(self.ids[p])
+            if row is not None and len(row) == len(self):
+                self.rows.move_to_end(self.ids[p])
+                self.hits += 1
+                block[r] = row
+            else:
+                missing.append(r)
+        if missing:
+            self.misses += len(missing)
+            block[missing] = self.kernel(self.X[P[missing]], self.X)
+            for r in missing:
+                self._store(self.ids[P[r]], block[r].copy())
+        return block
+
+    def remove(self, p):
+        """
+        Remove the sample at position p by moving the last sample of the set
+        into its place, so that the cached rows just need a swap too.
+        :param p: the position of the sample in the set.
+        """
+        last = len(self) - 1
+        self.rows.pop(self.ids[p], None)
+        for key, row in self.rows.items():
+            if len(row) > last:  # complete row, swap its entries
+                row[p] = row[last]
+                self.rows[key] = row[:last]
+            elif len(row) > p:  # partial row, the entries from p on are recomputed when needed
+                self.rows[key] = row[:p]
+        self.X[p], self.ids[p] = self.X[last], self.ids[last]
+        self.X, self.ids = self.X[:last], self.ids[:last]
+
+    def _store(self, key, row):
+        self.rows[key] = row
+        self.rows.move_to_end(key)
+        while len(self.rows) > self.cache_size:
+            self.rows.popitem(last=False)
+
+
+class LASVM:
+    """
+    Implements the LASVM online algorithm for training a kernel support vector
+    classifier, i.e., an online approximation of the SMO algorithm.
+
+    A set of candidate support vectors is retained: each new sample is inserted
+    into it and paired with the most violating sample of the set (PROCESS), then
+    the most violating pair of the set is optimized and the samples of the set
+    which are not support vectors and are unlikely to become ones are discarded
+    (REPROCESS). So both the memory and the cost of each step scale with the number
+    of support vectors instead of the number of samples seen, while the kernel
+    rows of the set are kept in a bounded least recently used cache. The finishing
+    step runs REPROCESS until the solution of the retained set is tol-optimal.
+
+    The dual variables are stored as beta_i = y_i alpha_i with bounds
+    min(0, C y_i) <= beta_i <= max(0, C y_i), so the gradient of the dual is
+    g_i = y_i - sum_j beta_j K[i, j] and the decision function is
+    f(x) = sum_i beta_i K(x_i, x) + b.
+
+    References
+
+    A. Bordes, S. Ertekin, J. Weston, L. Bottou. Fast Kernel Classifiers with Online
+    and Active Learning. Journal of Machine Learning Research, 2005.
+    """
+
+    def __init__(self,
+                 kernel=gaussian,
+                 C=1.,
+                 tol=1e-3,
+                 max_iter=1000,
+                 cache_size=1000,
+                 shuffle=True,
+                 random_state=None,
+                 verbose=False):
+        """
+
+        :param kernel:       the kernel function, if its gamma is 'scale' or 'auto' it is fixed
+                             on the first chunk of samples, so that it does not change over time.
+        :param C:            (real scalar, optional, default value 1): the regularization parameter.
+        :param tol:          (real scalar, optional, default value 1e-3): the minimum violation of
+                             the optimality conditions of a pair of samples to be optimized.
+        :param max_iter:     (integer scalar, optional, default value 1000): the maximum number of
+                             REPROCESS steps of the finishing step.
+        :param cache_size:   (integer scalar, optional, default value 1000): the maximum number of
+                             cached kernel rows.
+        :param shuffle:      (boolean, optional, default value True): whether to process the samples
+                             of each chunk in a random order.
+        :param random_state: (integer, optional, default value None): the seed of the random permutations.
+        :param verbose:      (boolean, optional, default value False): print details about each chunk
+                             if True, nothing otherwise.
+        """
+        if not C > 0:
+            raise ValueError('C must be > 0')
+        self.kernel = kernel
+        self.C = C
+        self.tol = tol
+        self.max_iter = max_iter
+        self.cache_size = cache_size
+        self.shuffle = shuffle
+        self.random_state = check_random_state(random_state)
+        self.verbose = verbose
+        self.cache = None
+        self.y = np.zeros(0)
+        self.beta = np.zeros(0)
+        self.g = np.zeros(0)
+        self.b = 0.
+        self.delta = np.inf  # maximal violation of the optimality conditions
+        self.iter = 0  # number of processed samples
+
+    def _bounds(self):
+        return np.minimum(0., self.C * self.y), np.maximum(0., self.C * self.y)
+
+    def _most_violating_pair(self):
+        A, B = self._bounds()
+        up, low = self.beta < B, self.beta > A
+        if not up.any() or not low.any():
+            return -1, -1
+        i = np.flatnonzero(up)[np.argmax(self.g[up])]
+        j = np.flatnonzero(low)[np.argmin(self.g[low])]
+        return i, j
+
+    def _update(self, i, j):
+        """
+        Optimize the pair of samples at positions i and j along the direction
+        which increases beta_i and decreases beta_j, keeping sum_i beta_i fixed.
+        """
+        A, B = self._bounds()
+        K_i, K_j = self.cache.row(i), self.cache.row(j)
+        curvature = max(K_i[i] + K_j[j] - 2 * K_i[j], 1e-12)
+        step = min((self.g[i] - self.g[j]) / curvature, B[i] - self.beta[i], self.beta[j] - A[j])
+        self.beta[i] += step
+        self.beta[j] -= step
+        # to prevent precision problems
+        for p in (i, j):
+            if abs(self.beta[p] - A[p]) <= 1e-12 * self.C:
+                self.beta[p] = A[p]
+            elif abs(self.beta[p] - B[p]) <= 1e-12 * self.C:
+                self.beta[p] = B[p]
+        self.g -= step * (K_i - K_j)
+
+    def _process(self, x, y):
+        n = len(self.cache)
+        row = self.cache.kernel_row(x)
+        self.cache.append(x, row)
+        self.y = np.append(self.y, y)
+        self.beta = np.append(self.beta, 0.)
+        self.g = np.append(self.g, y - np.dot(self.beta[:n], row[:n]))
+
+        A, B = self._bounds()
+        if y > 0:
+            low = self.beta > A
+            if not low.any():
+                return False
+            i, j = n, np.flatnonzero(low)[np.argmin(self.g[low])]
+        else:
+            up = self.beta < B
+            if not up.any():
+                return False
+            i, j = np.flatnonzero(up)[np.argmax(self.g[up])], n
+
+        if self.g[i] - self.g[j] <= self.tol:
+            return False
+
+        self._update(i, j)
+        return True
+
+    def _reprocess(self):
+        i, j = self._most_violating_pair()
+        if i == -1 or self.g[i] - self.g[j] <= self.tol:
+            return False
+
+        self._update(i, j)
+
+        # remove the samples which are not support vectors and
+        # are unlikely to become ones from the retained set
+        i, j = self._most_violating_pair()
+        if i != -1:
+            discard = (self.beta == 0) & (((self.y < 0) & (self.g >= self.g[i])) |
+                                          ((self.y > 0) & (self.g <= self.g[j])))
+            for p in np.flatnonzero(discard)[::-1]:
+                self._remove(p)
+        return True
+
+    def _remove(self, p):
+        last = len(self.cache) - 1
+        self.cache.remove(p)
+        for a in (self.y, self.beta, self.g):
+            a[p] = a[last]
+        self.y, self.beta, self.g = self.y[:last], self.beta[:last], self.g[:last]
+
+    def _update_threshold(self):
+        i, j = self._most_violating_pair()
+        if i != -1:
+            self.b = (self.g[i] + self.g[j]) / 2
+            self.delta = self.g[i] - self.g[j]
+
+    def partial_fit(self, X, y):
+        """
+        Process a chunk of samples, one at a time, each one followed by a REPROCESS step.
+        :param X: array-like of shape (n_samples, n_features), the chunk of samples.
+        :param y: array-like of shape (n_samples,), their labels in {-1, +1}.
+        :return:  self
+        """
+        if self.cache is None:
+            self.kernel = fixed_gamma(self.kernel, X)
+            self.cache = KernelCache(self.kernel, self.cache_size)
+
+        idx = np.arange(len(X))
+        if self.shuffle:
+            self.random_state.shuffle(idx)
+
+        for k in idx:
+            self._process(X[k], y[k])
+            self._reprocess()
+            self.iter += 1
+
+        self._update_threshold()
+
+        if self.verbose:
+            print('iter: {:d} - retained: {:d} - sv: {:d} - delta: {: 1.4e}'.format(
+                self.iter, len(self.cache), np.count_nonzero(self.beta), self.delta))
+
+        return self
+
+    def finish(self):
+        """
+        Run REPROCESS steps until the solution of the retained set is tol-optimal.
+        :return: self
+        """
+        for _ in range(self.max_iter):
+            if not self._reprocess():
+                break
+        self._update_threshold()
+        return self
+
+    def support(self):
+        """
+        :return: the positions of the support vectors in the retained set.
+        """
+        return np.flatnonzero(self.beta)
+
@@ -1,52 +1,209 @@
 from abc import ABC
 
 import autograd.numpy as np
+import scipy.sparse as sp
+from sklearn.utils.extmath import safe_sparse_dot
 
 from ...opti import OptimizationFunction
 
 
 class SVMLoss(OptimizationFunction, ABC):
 
-    def __init__(self, svm, X, y):
-        super().__init__(X.shape[1])
+    def __init__(self, svm, X, y, fit_intercept=True):
+        # a 2D y holds one column of targets for each of the n_outputs
+        # problems, e.g., the one-vs-rest ones of a multiclass task, which
+        # are jointly solved for the packed (n_features (+ 1)) x n_outputs
+        # matrix of the coefficients (and intercepts) of all of them
+        self.n_outputs = y.shape[1] if y.ndim > 1 else 1
+        super().__init__((X.shape[1] + fit_intercept) * self.n_outputs)
         self.svm = svm
         self.X = X
         self.y = y
+        self.fit_intercept = fit_intercept
+        # margins of the last evaluated point, shared
+        # between function and jacobian at the same
+        # point over the same batch
+        self.last_x = None
+        self.last_X_batch = None
+        self.last_y_pred = None
 
     def args(self):
         return self.X, self.y
 
-    def loss(self, y_pred, y_true):
-        raise NotImplementedError
+    def clear_cache(self):
+        super().clear_cache()
+        self.last_X_batch = None
+
+    def _unpack(self, packed_coef_inter):
+        if self.n_outputs > 1:
+            packed_coef_inter = np.reshape(packed_coef_inter, (-1, self.n_outputs))
+        if self.fit_intercept:
+            return packed_coef_inter[:-1], packed_coef_inter[-1]
+        return packed_coef_inter, 0.
+
+    def _pack_jacobian(self, coef_grad, inter_grad):
+        if self.fit_intercept:
+            return np.append(coef_grad, inter_grad)
+        return np.ravel(coef_grad)
+
+    def _predict(self, packed_coef_inter, X_batch):
+        # autograd traces the function with its own array boxes, so only
+        # concrete points are looked up and stored in the margins cache
+        if not isinstance(packed_coef_inter, np.ndarray):
+            coef, inter = self._unpack(packed_coef_inter)
+            return np.dot(X_batch, coef) + inter
+
+        if X_batch is self.last_X_batch and np.array_equal(packed_coef_inter, self.last_x):
+            return self.last_y_pred
+
+        coef, inter = self._unpack(packed_coef_inter)
+        self.last_y_pred = safe_sparse_dot(X_batch, coef) + inter
+        self.last_x = packed_coef_inter.copy()  # optimizers may update x in-place
+        self.last_X_batch = X_batch
+        return self.last_y_pred
 
-    def loss_jacobian(self, packed_coef_inter, X_batch, y_batch):
-        raise NotImplementedError
+    def function(self, packed_coef_inter, X_batch=None, y_batch=None):
+        if X_batch is None:
+            X_batch = self.X
+        if y_batch is None:
+            y_batch = self.y
 
-    def __call__(self, y_pred, y_true):
-        return self.loss(y_pred, y_true)
+        y_pred = self._predict(packed_coef_inter, X_batch)
 
+        # the regularization term is scaled by the number of training samples, while the
+        # data one by the batch size, so that the average of the function over the mini
+        # batches of the training set is the function over the whole training set
+        n_samples = X_batch.shape[0]
+        return (1 / (2 * self.X.shape[0]) * np.linalg.norm(packed_coef_inter) ** 2 +
+                self.svm.C / n_samples * np.sum(self.loss(y_pred, y_batch)))
 
-class SVCLoss(SVMLoss, ABC):
+    def jacobian(self, packed_coef_inter, X_batch=None, y_batch=None):
+        if X_batch is None:
+            X_batch = self.X
+        if y_batch is None:
+            y_batch = self.y
 
-    def function(self, packed_coef_inter, X_batch=None, y_batch=None):
+        return ((1 / self.X.shape[0]) * packed_coef_inter +
+                self.residuals_jacobian(self.residuals(packed_coef_inter, X_batch, y_batch), X_batch))
+
+    def residuals(self, packed_coef_inter, X_batch=None, y_batch=None):
+        """
+        The derivatives of the loss wrt the predictions of each sample of the batch,
+        i.e., the scalar residuals which, with the batch, fully describe the Jacobian
+        of the data term, so that incremental gradient methods need to store just them.
+        :param packed_coef_inter: 1D array of points at which the residuals are to be computed.
+        :return:                  the residuals of the samples of the batch.
+        """
         if X_batch is None:
             X_batch = self.X
         if y_batch is None:
             y_batch = self.y
 
+        return self.loss_jacobian(self._predict(packed_coef_inter, X_batch), y_batch)
+
+    def residuals_jacobian(self, residuals, X_batch=None):
+        """
+        The Jacobian of the data term of the function given the residuals of the batch.
+        :param residuals: the residuals of the samples of the batch.
+        :return:          the Jacobian of the data term of the function.
+        """
+        if X_batch is None:
+            X_batch = self.X
+
         n_samples = X_batch.shape[0]
-        return (1 / (2 * n_samples) * np.linalg.norm(packed_coef_inter) ** 2 +
-                self.svm.C / n_samples * np.sum(self.loss(np.dot(X_batch, packed_coef_inter), y_batch)))
+        return self.svm.C / n_samples * self._pack_jacobian(safe_sparse_dot(X_batch.T, residuals),
+                                                            np.sum(residuals, axis=0))
+
+    def hessian(self, packed_coef_inter, X_batch=None, y_batch=None):
+        """
+        The generalized Hessian matrix of the loss, i.e., X^T D X restricted to the
+        samples in the active margin set, where D holds the second derivatives of the
+        loss wrt the predictions.
+        :param packed_coef_inter: 1D array of points at which the Hessian is to be computed.
+        :return:                  the (generalized) Hessian matrix of the function at packed_coef_inter.
+        """
+        if X_batch is None:
+            X_batch = self.X
+        if y_batch is None:
+            y_batch = self.y
 
-    def jacobian(self, packed_coef_inter, X_batch=None, y_batch=None):
+        y_pred = self._predict(packed_coef_inter, X_batch)
+        loss_hess = self.loss_hessian(y_pred, y_batch)
+
+        if self.n_outputs > 1:  # the problems are independent, so the Hessian is block diagonal
+            loss_hess = loss_hess.T
+        else:
+            loss_hess = loss_hess[np.newaxis]
+
+        n_coef_inter = self.ndim // self.n_outputs
+        hess = np.zeros((n_coef_inter, self.n_outputs, n_coef_inter, self.n_outputs))
+        for k, D in enumerate(loss_hess):
+            DX = safe_sparse_dot(sp.diags(D), X_batch)  # sparse if X_batch is
+            hess_k = safe_sparse_dot(X_batch.T, DX, dense_output=True)
+            if self.fit_intercept:
+                DX_sum = np.asarray(DX.sum(axis=0)).ravel()
+                hess_k = np.vstack((np.column_stack((hess_k, DX_sum)), np.append(DX_sum, np.sum(D))))
+            hess[:, k, :, k] = hess_k
+        hess = hess.reshape((self.ndim, self.ndim))
+
+        n_samples = X_batch.shape[0]
+        return (1 / self.X.shape[0]) * np.identity(self.ndim) + self.svm.C / n_samples * hess
+
+    def hessian_vector_product(self, packed_coef_inter, v, X_batch=None, y_batch=None):
+        """
+        The product between the generalized Hessian matrix of the loss and a vector v,
+        computed matrix-free as X^T (D (X v)) with two passes over the batch.
+        :param packed_coef_inter: 1D array of points at which the Hessian is to be computed.
+        :param v:                 1D array to be multiplied by the Hessian.
+        :return:                  the product between the Hessian matrix of the function at packed_coef_inter and v.
+        """
         if X_batch is None:
             X_batch = self.X
         if y_batch is None:
             y_batch = self.y
 
+        y_pred = self._predict(packed_coef_inter, X_batch)
+        coef_v, inter_v = self._unpack(v)
+        DXv = self.loss_hessian(y_pred, y_batch) * (safe_sparse_dot(X_batch, coef_v) + inter_v)
+
         n_samples = X_batch.shape[0]
-        return ((1 / n_samples) * packed_coef_inter -
-                self.svm.C / n_samples * self.loss_jacobian(packed_coef_inter, X_batch, y_batch))
+        return ((1 / self.X.shape[0]) * v +
+                self.svm.C / n_samples * self._pack_jacobian(safe_sparse_dot(X_batch.T, DXv), np.sum(DXv, axis=0)))
+
+    def _function_and_jacobian(self, packed_coef_inter, X_batch=None, y_batch=None):
+        """
+        Compute both the function value and the Jacobian at the same point with
+        a single pass over the batch to compute the margins, which are shared
+        by both, and another one to accumulate the gradient.
+        :param packed_coef_inter: 1D array of points at which the function and the Jacobian are to be computed.
+        :return:                  the value and the Jacobian of the function.
+        """
+        return (self.function(packed_coef_inter, X_batch, y_batch),
+                self.jacobian(packed_coef_inter, X_batch, y_batch))
+
+    def loss(self, y_pred, y_true):
+        raise NotImplementedError
+
+    def loss_jacobian(self, y_pred, y_true):
+        """
+        The derivative of the loss wrt the predictions, i.e., the residuals
+        which, multiplied by the batch, give the Jacobian of the data term.
+        """
+        raise NotImplementedError
+
+    def loss_hessian(self, y_pred, y_true):
+        """
+        The (generalized) second derivative of the loss wrt the predictions,
+        i.e., the diagonal D of the Hessian of the data term X^T D X.
+        """
+        raise NotImplementedError
+
+    def __call__(self, y_pred, y_true):
+        return self.loss(y_pred, y_true)
+
+
+class SVCLoss(SVMLoss, ABC):
+    pass
 
 
 class Hinge(SVCLoss):
@@ -59,9 +216,11 @@ class Hinge(SVCLoss):
     def loss(self, y_pred, y_true):
         return np.maximum(0, 1 - y_true * y_pred)
 
-    def loss_jacobian(self, packed_coef_inter, X_batch, y_batch):
-        idx = np.argwhere(y_batch * np.dot(X_batch, packed_coef_inter) < 1.).ravel()
-        return np.dot(y_batch[idx], X_batch[idx])
+    def loss_jacobian(self, y_pred, y_true):
+        return -y_true * (y_true * y_pred < 1.)
+
+    def loss_hessian(self, y_pred, y_true):
+        return np.zeros_like(y_pred)
 
 
 class SquaredHinge(Hinge):
@@ -74,31 +233,44 @@ class SquaredHinge(Hinge):
     def loss(self, y_pred, y_true):
         return np.square(super().loss(y_pred, y_true))
 
-    def loss_jacobian(self, packed_coef_inter, X_batch, y_batch):
-        return 2 * super().loss_jacobian(packed_coef_inter, X_batch, y_batch)
+    def loss_jacobian(self, y_pred, y_true):
+        return -2 * y_true * super().loss(y_pred, y_true)
 
+    def loss_hessian(self, y_pred, y_true):
+        return 2. * (y_true * y_pred < 1.)
 
-class SVRLoss(SVMLoss, ABC):
 
-    def function(self, packed_coef_inter, X_batch=None, y_batch=None):
-        if X_batch is None:
-            X_batch = self.X
-        if y_batch is None:
-            y_batch = self.y
+class SmoothedHinge(SVCLoss):
+    """
+    Compute the smoothed (Huberized) Hinge loss for classification as:
 
-        n_samples = X_batch.shape[0]
-        return (1 / (2 * n_samples) * np.linalg.norm(packed_coef_inter) ** 2 +
-                self.svm.C / n_samples * np.sum(self.loss(np.dot(X_batch, packed_coef_inter), y_batch)))
+        L(y_pred, y_true) = min(u, smoothing)^2 / (2 * smoothing) + max(0, u - smoothing)
 
-    def jacobian(self, packed_coef_inter, X_batch=None, y_batch=None):
-        if X_batch is None:
-            X_batch = self.X
-        if y_batch is None:
-            y_batch = self.y
+    where u = max(0, 1 - y_true * y_pred), i.e., the Hinge loss is replaced by a
+    quadratic in a neighbourhood of width smoothing of its kink, so the loss is
+    continuously differentiable and tends to the Hinge one as smoothing tends to 0.
+    """
 
-        n_samples = X_batch.shape[0]
-        return ((1 / n_samples) * packed_coef_inter -
-                self.svm.C / n_samples * self.loss_jacobian(packed_coef_inter, X_batch, y_batch))
+    def __init__(self, svm, X, y, smoothing=0.1, fit_intercept=True):
+        super().__init__(svm, X, y, fit_intercept)
+        if not smoothing > 0:
+            raise ValueError('smoothing must be > 0')
+        self.smoothing = smoothing
+
+    def loss(self, y_pred, y_true):
+        u = np.maximum(0, 1 - y_true * y_pred)
+        return np.square(np.minimum(u, self.smoothing)) / (2 * self.smoothing) + np.maximum(0, u - self.smoothing)
+
+    def loss_jacobian(self, y_pred, y_true):
+        return -y_true * np.clip((1 - y_true * y_pred) / self.smoothing, 0., 1.)
+
+    def loss_hessian(self, y_pred, y_true):
+        margin = 1 - y_true * y_pred
+        return ((margin > 0) & (margin < self.smoothing)) / self.smoothing
+
+
+class SVRLoss(SVMLoss, ABC):
+    pass
 
 
 class EpsilonInsensitive(SVRLoss):
@@ -108,17 +280,18 @@ class EpsilonInsensitive(SVRLoss):
         L(y_pred, y_true) = max(0, |y_true - y_pred| - epsilon)
     """
 
-    def __init__(self, svm, X, y, epsilon=0.1):
-        super().__init__(svm, X, y)
+    def __init__(self, svm, X, y, epsilon=0.1, fit_intercept=True):
+        super().__init__(svm, X, y, fit_intercept)
         self.epsilon = epsilon
 
     def loss(self, y_pred, y_true):
         return np.maximum(0, np.abs(y_pred - y_true) - self.epsilon)
 
-    def loss_jacobian(self, packed_coef_inter, X_batch, y_batch):
-        y_pred = np.dot(X_batch, packed_coef_inter)
-        idx = np.argwhere(np.abs(y_pred - y_batch) > self.epsilon).ravel()
-        return np.dot(y_batch[idx] - y_pred[idx], X_batch[idx])
+    def loss_jacobian(self, y_pred, y_true):
+        return np.sign(y_pred - y_true) * (np.abs(y_pred - y_true) > self.epsilon)
+
+    def loss_hessian(self, y_pred, y_true):
+        return np.zeros_like(y_pred)
 
 
 class SquaredEpsilonInsensitive(EpsilonInsensitive):
@@ -131,11 +304,45 @@ class SquaredEpsilonInsensitive(EpsilonInsensitive):
     def loss(self, y_pred, y_true):
         return np.square(super().loss(y_pred, y_true))
 
-    def loss_jacobian(self, packed_coef_inter, X_batch, y_batch):
-        return 2 * super().loss_jacobian(packed_coef_inter, X_batch, y_batch)
+    def loss_jacobian(self, y_pred, y_true):
+        return 2 * np.sign(y_pred - y_true) * super().loss(y_pred, y_true)
+
+    def loss_hessian(self, y_pred, y_true):
+        return 2. * (np.abs(y_pred - y_true) > self.epsilon)
+
+
+class SmoothedEpsilonInsensitive(SVRLoss):
+    """
+    Compute the smoothed (Huberized) epsilon-insensitive loss for regression as:
+
+        L(y_pred, y_true) = min(u, smoothing)^2 / (2 * smoothing) + max(0, u - smoothing)
+
+    where u = max(0, |y_true - y_pred| - epsilon), i.e., the epsilon-insensitive loss
+    is replaced by a quadratic in a neighbourhood of width smoothing of its kinks.
+    """
+
+    def __init__(self, svm, X, y, epsilon=0.1, smoothing=0.1, fit_intercept=True):
+        super().__init__(svm, X, y, fit_intercept)
+        self.epsilon = epsilon
+        if not smoothing > 0:
+            raise ValueError('smoothing must be > 0')
+        self.smoothing = smoothing
+
+    def loss(self, y_pred, y_true):
+        u = np.maximum(0, np.abs(y_pred - y_true) - self.epsilon)
+        return np.square(np.minimum(u, self.smoothing)) / (2 * self.smoothing) + np.maximum(0, u - self.smoothing)
+
+    def loss_jacobian(self, y_pred, y_true):
+        return np.sign(y_pred - y_true) * np.clip((np.abs(y_pred - y_true) - self.epsilon) / self.smoothing, 0., 1.)
+
+    def loss_hessian(self, y_pred, y_true):
+        u = np.abs(y_pred - y_true) - self.epsilon
+        return ((u > 0) & (u < self.smoothing)) / self.smoothing
 
 
 hinge = Hinge
 squared_hinge = SquaredHinge
+smoothed_hinge = SmoothedHinge
 epsilon_insensitive = EpsilonInsensitive
 squared_epsilon_insensitive = SquaredEpsilonInsensitive
+smoothed_epsilon_insensitive = SmoothedEpsilonInsensitive
@@ -0,0 +1,206 @@
+import numpy as np
+import scipy.sparse as sp
+
+from .losses import Hinge, SquaredHinge
+from ...opti.unconstrained.stochastic import StochasticOptimizer
+
+
+class Pegasos(StochasticOptimizer):
+    """
+    Implements the Pegasos (Primal Estimated sub-GrAdient SOlver for SVM) method
+    for training linear support vector classifiers with the Hinge loss.
+
+    At each iteration t, the subgradient of the mini batch is taken with the step
+    size 1 / (lambda * t), where lambda = 1 / (C * n_samples) is the regularization
+    parameter of the loss, then the point is projected onto the ball of radius
+    1 / sqrt(lambda), which contains the optimal solution.
+
+    The point is stored as a scalar times a vector, i.e., w = a * v, so that the
+    shrinking due to the regularization and the projection just update a, while
+    the subgradient step just updates the entries of v corresponding to the nonzero
+    features of the violating samples of the mini batch. So, for sparse inputs, the
+    cost of an iteration only depends on the number of nonzeros of the mini batch,
+    not on the number of features. The same holds for the average of the iterates,
+    if required, which is lazily maintained too.
+
+    References
+
+    S. Shalev-Shwartz, Y. Singer, N. Srebro, A. Cotter. Pegasos: Primal Estimated
+    sub-GrAdient SOlver for SVM. Mathematical Programming, 2011.
+
+    W. Xu. Towards Optimal One Pass Large Scale Learning with Averaged Stochastic
+    Gradient Descent. arXiv:1107.2490, 2011.
+    """
+
+    def __init__(self,
+                 f,
+                 x,
+                 batch_size=None,
+                 eps=1e-6,
+                 epochs=1000,
+                 step_size=0.01,
+                 momentum_type='none',
+                 momentum=0.9,
+                 average=False,
+                 callback=None,
+                 callback_args=(),
+                 shuffle=True,
+                 random_state=None,
+                 verbose=False):
+        """
+
+        :param f:       the Hinge loss function.
+        :param x:       ([n x 1] real column vector): the point where to start the algorithm from.
+        :param average: (boolean, optional, default value False): whether to return the average
+                        of the iterates instead of the last one.
+        The step_size, momentum_type and momentum parameters are ignored since the step size
+        is given by the regularization parameter of the loss.
+        """
+        if not isinstance(f, Hinge) or isinstance(f, SquaredHinge):
+            raise TypeError(f'{type(f).__name__} loss is not supported by Pegasos, use the Hinge one')
+        if f.n_outputs > 1:
+            raise ValueError('use OneVsRestClassifier from sklearn.multiclass to train '
+                             'a model over more than two labels by Pegasos')
+        super().__init__(f=f,
+                         x=x,
+                         step_size=step_size,
+                         momentum_type=momentum_type,
+                         momentum=momentum,
+                         batch_size=batch_size,
+                         eps=eps,
+                         epochs=epochs,
+                         callback=callback,
+                         callback_args=callback_args,
+                         shuffle=shuffle,
+                         random_state=random_state,
+                         verbose=verbose)
+        self.average = average
+        self.t = 0  # number of subgradient steps, kept when warm started
+
+    @property
+    def x(self):
+        if self.average and self._avg_count:
+            return (self._avg_scale * self._v - self._avg_u) / self._avg_count
+        return self._scale * self._v
+
+    @x.setter
+    def x(self, x):
+        self._v = np.array(x, dtype=float)
+        self._scale = 1.  # w = scale * v
+        self._v_sq_norm = np.dot(self._v, self._v)
+        # the sum of the iterates is lazily stored as avg_scale * v - avg_u
+        self._avg_scale = 0.
+        self._avg_u = np.zeros_like(self._v)
+        self._avg_count = 0
+
+    def _fold_scale(self):
+        """
+        Bring the scale back to 1 by multiplying it into v before it underflows, which
+        is the only step touching all the features, needed just once in a long while.
+        """
+        avg_sum = self._avg_scale * self._v - self._avg_u
+        self._v *= self._scale
+        self._scale = 1.
+        self._v_sq_norm = np.dot(self._v, self._v)
+        self._avg_scale = 0.
+        self._avg_u = -avg_sum
+
+    def _violating_sum(self, X_batch, y_batch, y_pred):
+        """
+        Compute the sum of y_i * x_i over the samples of the mini batch which
+        violate the margin, as indices and values of its nonzero entries.
+        """
+        violating = y_batch * y_pred < 1.
+        y_viol = y_batch[violating]
+        if sp.issparse(X_batch):
+            # gather the nonzeros of the violating rows straight from the csr arrays
+            # since a sparse product would cost O(n_features) to build its output
+            X_viol = sp.csr_matrix(X_batch)[violating]
+            row_vals = X_viol.data * np.repeat(y_viol, np.diff(X_viol.indptr))
+            idx, inv = np.unique(X_viol.indices, return_inverse=True)
+            vals = np.bincount(inv, weights=row_vals, minlength=len(idx))
+        else:
+            idx, vals = slice(None), np.dot(y_viol, X_batch[violating])
+        return idx, vals, np.sum(y_viol)
+
+    def minimize(self):
+        n_samples = self.f.X.shape[0]
+        n_features = self.f.X.shape[1]
+
+        if self.verbose:
+            print('epoch\titer\t cost\t', end='')
+
+        for batch in self.batches:
+            X_batch, y_batch = batch
+
+            # the regularization parameter may change between runs, e.g., along a regularization path
+            lmbda = 1 / (self.f.svm.C * n_samples)
+
+            coef, inter = self._v[:n_features], self._v[n_features] if self.f.fit_intercept else 0.
+            y_pred = self._scale * (X_batch.dot(coef) + inter)
+
+            self.f_x = (self._scale ** 2 * self._v_sq_norm / (2 * n_samples) +
+                        self.f.svm.C / X_batch.shape[0] * np.sum(self.f.loss(y_pred, y_batch)))
+
+            if self.is_batch_end():
+
+                if self.is_verbose():
+                    print('\n{:4d}\t{:4d}\t{: 1.4e}'.format(self.epoch, self.iter, self.f_x), end='')
+
+            try:
+                self.callback(batch)
+            except StopIteration:
+                break
+
+            if self.is_batch_end():
+                self.epoch += 1
+
+            if self.epoch >= self.epochs:
+                self.status = 'stopped'
+                break
+
+            self.t += 1
+            step_size = 1 / (lmbda * self.t)
+
+            # shrink due to the regularization, i.e., w = (1 - step_size * lmbda) * w
+            if self.t == 1:
+                self._v[:] = 0.
+                self._v_sq_norm = 0.
+                self._scale = 1.
+            else:
+                self._scale *= 1 - 1 / self.t
+            if self._scale < 1e-9:
+                self._fold_scale()
+
+            # subgradient step on the violating samples, touching just their nonzero features
+            idx, vals, inter_val = self._violating_sum(X_batch, y_batch, y_pred)
+            c = step_size / (X_batch.shape[0] * self._scale)
+            v_dot_s = np.dot(self._v[:n_features][idx], vals)
+            s_sq_norm = np.dot(vals, vals)
+            if self.f.fit_intercept:
+                v_dot_s += self._v[n_features] * inter_val
+                s_sq_norm += inter_val ** 2
+            self._v_sq_norm += 2 * c * v_dot_s + c ** 2 * s_sq_norm
+            self._v[:n_features][idx] += c * vals
+            if self.f.fit_intercept:
+                self._v[n_features] += c * inter_val
+            if self.average:
+                self._avg_u[:n_features][idx] += self._avg_scale * c * vals
+                if self.f.fit_intercept:
+                    self._avg_u[n_features] += self._avg_scale * c * inter_val
+
+            # projection onto the ball of radius 1 / sqrt(lmbda)
+            w_norm = self._scale * np.sqrt(max(self._v_sq_norm, 0.))
+            if w_norm > 1 / np.sqrt(lmbda):
+                self._scale *= 1 / (np.sqrt(lmbda) * w_norm)
+
+            if self.average:
+                self._avg_scale += self._scale
+                self._avg_count += 1
+
+            self.iter += 1
+
+        if self.verbose:
+            print('\n')
+
+        return self
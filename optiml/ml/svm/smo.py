@@ -1,4 +1,5 @@
 import sys
+import time
 import warnings
 from abc import ABC
 
@@ -9,8 +10,17 @@ from .kernels import gaussian, LinearKernel
 
 
 class SMO(ABC):
+    """
+    Base class of the sequential minimal optimization algorithms.
+
+    The state of the algorithm, i.e., the dual variables, the error cache, the
+    sets of indices and the thresholds, is kept between the calls to minimize,
+    so a run stopped by the max_iter or max_time budget can be resumed from
+    where it stopped by calling minimize again, while the current dual
+    variables are always feasible, i.e., an anytime solution.
+    """
 
-    def __init__(self, quad, X, y, K, kernel=gaussian, C=1., tol=1e-3, verbose=False):
+    def __init__(self, quad, X, y, K, kernel=gaussian, C=1., tol=1e-3, max_iter=1000, max_time=None, verbose=False):
         self.quad = quad
         self.X = X
         self.y = y
@@ -22,7 +32,21 @@ class SMO(ABC):
         self.C = C
         self.errors = np.zeros(len(X))
         self.tol = tol
+        self.max_iter = max_iter
+        self.max_time = max_time
         self.verbose = verbose
+        self.iter = 0  # number of sweeps over the examples
+        self.status = 'unknown'
+        # counters of the cost of the run, accumulated over the calls to minimize
+        self.stats = {'kernel_rows': 0,  # rows of the kernel matrix used, possibly restricted to I0
+                      'take_step_successes': 0,
+                      'take_step_failures': 0,
+                      'non_pd_eta': 0,  # pairs with non positive second derivative eta
+                      'sweeps': 0,
+                      'examine_all_sweeps': 0,
+                      'non_bound_sweeps': 0,
+                      'kkt_gap': [],  # b_low - b_up after each sweep
+                      'error_cache_time': 0.}  # seconds spent updating the error cache
 
     def _take_step(self, i1, i2):
         raise NotImplementedError
@@ -30,9 +54,103 @@ class SMO(ABC):
     def _examine_example(self, i2):
         raise NotImplementedError
 
-    def minimize(self):
+    def _try_step(self, i1, i2):
+        if self._take_step(i1, i2):
+            self.stats['take_step_successes'] += 1
+            return True
+        self.stats['take_step_failures'] += 1
+        return False
+
+    def _objective(self):
+        raise NotImplementedError
+
+    def _thresholds(self):
+        """
+        Compute the exact thresholds b_up and b_low over all the examples
+        from scratch, instead of the ones maintained by the algorithm over
+        the non-bound examples and the last optimized pair.
+        """
         raise NotImplementedError
 
+    def _intercept(self, b_up, b_low):
+        raise NotImplementedError
+
+    def kkt_gap(self):
+        """
+        :return: the maximal violation of the optimality conditions, i.e., b_low - b_up,
+                 which is not greater than 2 * tol at the optimal solution.
+        """
+        b_up, b_low = self._thresholds()
+        self.stats['kernel_rows'] += len(self.X)
+        return b_low - b_up
+
+    def minimize(self):
+        if self.verbose:
+            print('iter\t cost\t\t gap')
+
+        start_iter, start_time = self.iter, time.perf_counter()
+
+        # the first sweep is always over all the examples, so that
+        # a stopped run is resumed from a consistent state
+        num_changed = 0
+        examine_all = True
+        while num_changed > 0 or examine_all:
+
+            if self.iter - start_iter >= self.max_iter:
+                self.status = 'stopped'
+                break
+
+            if self.max_time is not None and time.perf_counter() - start_time >= self.max_time:
+                self.status = 'stopped'
+                break
+
+            num_changed = 0
+            # loop over all training examples
+            if examine_all:
+                for i in range(len(self.X)):
+                    num_changed += self._examine_example(i)
+            else:
+                # loop over examples where alphas are not already at their limits
+                for i in range(len(self.X)):
+                    if i in self.I0:
+                        num_changed += self._examine_example(i)
+                        # check if optimality on I0 is attained
+                        if self.b_up > self.b_low - 2 * self.tol:
+                            num_changed = 0
+                            break
+            self.stats['sweeps'] += 1
+            if examine_all:
+                self.stats['examine_all_sweeps'] += 1
+                examine_all = False
+            else:
+                self.stats['non_bound_sweeps'] += 1
+                if num_changed == 0:
+                    examine_all = True
+
+            # terminate as soon as the optimality conditions hold over all the examples,
+            # without a last sweep over them to find that no pair can be optimized
+            gap = self.kkt_gap()
+            self.stats['kkt_gap'].append(gap)
+
+            if self.verbose and not self.iter % self.verbose:
+                print('{:4d}\t{: 1.4e}\t{: 1.4e}'.format(self.iter, self._objective(), gap))
+
+            self.iter += 1
+
+            if gap <= 2 * self.tol:
+                self.status = 'optimal'
+                break
+
+        else:
+            self.status = 'optimal'
+
+        self.b = self._intercept(*self._thresholds())
+
+        if self.verbose:
+            print()
+
+        return self
+
 
 class SMOClassifier(SMO):
     """
@@ -55,9 +173,9 @@ class SMOClassifier(SMO):
     Algorithm for SVM Classifier Design. Technical Report CD-99-14.
     """
 
-    def __init__(self, quad, X, y, K, kernel=gaussian, C=1., tol=1e-3, verbose=False):
+    def __init__(self, quad, X, y, K, kernel=gaussian, C=1., tol=1e-3, max_iter=1000, max_time=None, verbose=False):
         self.alphas = np.zeros(len(X))
-        super().__init__(quad, X, y, K, kernel, C, tol, verbose)
+        super().__init__(quad, X, y, K, kernel, C, tol, max_iter, max_time, verbose)
 
         # initialize variables and structures to implement improvements
         # on the original Platt's SMO algorithm described in Keerthi et
@@ -136,6 +254,7 @@ class SMOClassifier(SMO):
             else:
                 a2 = alpha2
 
+            self.stats['non_pd_eta'] += 1
             warnings.warn('kernel matrix is not positive definite', PositiveSpectrumWarning)
 
         # if examples can't be optimized within tol, skip this pair
@@ -151,12 +270,15 @@ class SMOClassifier(SMO):
             self.w += y1 * (a1 - alpha1) * self.X[i1] + y2 * (a2 - alpha2) * self.X[i2]
 
         # update error cache using new alphas
+        start = time.perf_counter()
         for i in self.I0:
             if i != i1 and i != i2:
                 self.errors[i] += y1 * (a1 - alpha1) * self.K[i1, i] + y2 * (a2 - alpha2) * self.K[i2, i]
         # update error cache using new alphas for i1 and i2
         self.errors[i1] += y1 * (a1 - alpha1) * self.K[i1, i1] + y2 * (a2 - alpha2) * self.K[i1, i2]
         self.errors[i2] += y1 * (a1 - alpha1) * self.K[i1, i2] + y2 * (a2 - alpha2) * self.K[i2, i2]
+        self.stats['error_cache_time'] += time.perf_counter() - start
+        self.stats['kernel_rows'] += 2
 
         # to prevent precision problems
         if a2 > self.C - 1e-8 * self.C:
@@ -239,6 +361,7 @@ class SMOClassifier(SMO):
             E2 = self.errors[i2]
         else:
             E2 = (self.alphas * self.y).dot(self.K[i2]) - self.y[i2]
+            self.stats['kernel_rows'] += 1
             self.errors[i2] = E2
 
             # update (b_up, b_up_idx) or (b_low, b_low_idx) using E2 and i2
@@ -275,46 +398,21 @@ class SMOClassifier(SMO):
         if i1 == -1:
             raise Exception('the index could not be found')
 
-        return self._take_step(i1, i2)
-
-    def minimize(self):
-        if self.verbose:
-            print('iter\t cost')
-
-        num_changed = 0
-        examine_all = True
-        loop_counter = 0
-        while num_changed > 0 or examine_all:
-            num_changed = 0
-            # loop over all training examples
-            if examine_all:
-                for i in range(len(self.X)):
-                    num_changed += self._examine_example(i)
-            else:
-                # loop over examples where alphas are not already at their limits
-                for i in range(len(self.X)):
-                    if 0 < self.alphas[i] < self.C:
-                        num_changed += self._examine_example(i)
-                        # check if optimality on I0 is attained
-                        if self.b_up > self.b_low - 2 * self.tol:
-                            num_changed = 0
-                            break
-            if examine_all:
-                examine_all = False
-            elif num_changed == 0:
-                examine_all = True
+        return self._try_step(i1, i2)
 
-            if self.verbose and not loop_counter % self.verbose:
-                print('{:4d}\t{: 1.4e}'.format(loop_counter, self.quad.function(self.alphas)))
+    def _objective(self):
+        return self.quad.function(self.alphas)
 
-            loop_counter += 1
+    def _thresholds(self):
+        # errors[i] = sum_j alphas[j] y[j] K[i, j] - y[i]
+        F = np.dot(self.K, self.alphas * self.y) - self.y
+        # I0 u I1 u I2 and I0 u I3 u I4 respectively
+        up = ((self.y == 1) & (self.alphas < self.C)) | ((self.y == -1) & (self.alphas > 0))
+        low = ((self.y == 1) & (self.alphas > 0)) | ((self.y == -1) & (self.alphas < self.C))
+        return np.min(F[up]), np.max(F[low])
 
-        self.b = -(self.b_low + self.b_up) / 2
-
-        if self.verbose:
-            print()
-
-        return self
+    def _intercept(self, b_up, b_low):
+        return -(b_low + b_up) / 2
 
 
 class SMORegression(SMO):
@@ -342,10 +440,11 @@ class SMORegression(SMO):
     Algorithm for SVM Regression. Technical Report CD-99-16.
     """
 
-    def __init__(self, quad, X, y, K, kernel=gaussian, C=1., epsilon=0.1, tol=1e-3, verbose=False):
+    def __init__(self, quad, X, y, K, kernel=gaussian, C=1., epsilon=0.1, tol=1e-3,
+                 max_iter=1000, max_time=None, verbose=False):
         self.alphas_p = np.zeros(len(X))
         self.alphas_n = np.zeros(len(X))
-        super().__init__(quad, X, y, K, kernel, C, tol, verbose)
+        super().__init__(quad, X, y, K, kernel, C, tol, max_iter, max_time, verbose)
         self.epsilon = epsilon
 
         # initialize variables and structures to implement improvements
@@ -383,7 +482,8 @@ class SMORegression(SMO):
         # based on equation 15 in Platt's paper
         eta = self.K[i1, i1] + self.K[i2, i2] - 2 * self.K[i1, i2]
 
-        if eta < 0:
+        if eta <= 0:
+            self.stats['non_pd_eta'] += 1
             eta = 0
 
         gamma = alpha1_p - alpha1_n + alpha2_p - alpha2_n
@@ -501,6 +601,7 @@ class SMORegression(SMO):
                        ((self.alphas_p[i2] - self.alphas_n[i2]) - (alpha2_p - alpha2_n)) * self.X[i2])
 
         # update error cache using new alphas
+        start = time.perf_counter()
         for i in self.I0:
             if i != i1 and i != i2:
                 self.errors[i] += (
@@ -511,6 +612,8 @@ class SMORegression(SMO):
                             ((self.alphas_p[i2] - self.alphas_n[i2]) - (alpha2_p - alpha2_n)) * self.K[i1, i2])
         self.errors[i2] += (((self.alphas_p[i1] - self.alphas_n[i1]) - (alpha1_p - alpha1_n)) * self.K[i1, i2] +
                             ((self.alphas_p[i2] - self.alphas_n[i2]) - (alpha2_p - alpha2_n)) * self.K[i2, i2])
+        self.stats['error_cache_time'] += time.perf_counter() - start
+        self.stats['kernel_rows'] += 2
 
         # to prevent precision problems
         if alpha1_p > self.C - 1e-10 * self.C:
@@ -605,6 +708,7 @@ class SMORegression(SMO):
             E2 = self.errors[i2]
         else:
             E2 = self.y[i2] - (self.alphas_p - self.alphas_n).dot(self.K[i2])
+            self.stats['kernel_rows'] += 1
             self.errors[i2] = E2
             if i2 in self.I1:
                 if E2 + self.epsilon < self.b_up:
@@ -672,44 +776,22 @@ class SMORegression(SMO):
         if optimal:
             return False
 
-        return self._take_step(i1, i2)
-
-    def minimize(self):
-        if self.verbose:
-            print('iter\t cost')
-
-        num_changed = 0
-        examine_all = True
-        loop_counter = 0
-        while num_changed > 0 or examine_all:
-            num_changed = 0
-            # loop over all training examples
-            if examine_all:
-                for i in range(len(self.X)):
-                    num_changed += self._examine_example(i)
-            else:
-                # loop over examples where alphas are not already at their limits
-                for i in range(len(self.X)):
-                    if 0 < self.alphas_p[i] < self.C or 0 < self.alphas_n[i] < self.C:
-                        num_changed += self._examine_example(i)
-                        # check if optimality on I0 is attained
-                        if self.b_up > self.b_low - 2 * self.tol:
-                            num_changed = 0
-                            break
-            if examine_all:
-                examine_all = False
-            elif num_changed == 0:
-                examine_all = True
-
-            if self.verbose and not loop_counter % self.verbose:
-                print('{:4d}\t{: 1.4e}'.format(
-                    loop_counter, self.quad.function(np.hstack((self.alphas_p, self.alphas_n)))))
-
-            loop_counter += 1
-
-        self.b = (self.b_low + self.b_up) / 2
-
-        if self.verbose:
-            print()
-
-        return self
+        return self._try_step(i1, i2)
+
+    def _objective(self):
+        return self.quad.function(np.hstack((self.alphas_p, self.alphas_n)))
+
+    def _thresholds(self):
+        # errors[i] = y[i] - sum_j (alphas_p[j] - alphas_n[j]) K[i, j]
+        E = self.y - np.dot(self.K, self.alphas_p - self.alphas_n)
+        free_p = (self.alphas_p > 0) & (self.alphas_p < self.C)
+        free_n = (self.alphas_n > 0) & (self.alphas_n < self.C) & ~free_p
+        I1 = (self.alphas_p == 0) & (self.alphas_n == 0)
+        I2 = (self.alphas_p == 0) & (self.alphas_n == self.C)
+        I3 = (self.alphas_p == self.C) & (self.alphas_n == 0)
+        b_up = np.min(np.hstack((E[free_p | I3] - self.epsilon, E[free_n | I1] + self.epsilon)))
+        b_low = np.max(np.hstack((E[free_p | I1] - self.epsilon, E[free_n | I2] + self.epsilon)))
+        return b_up, b_low
+
+    def _intercept(self, b_up, b_low):
+        return (b_low + b_up) / 2
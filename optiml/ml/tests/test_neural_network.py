@@ -5,7 +5,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, OneHotEncoder
 
 from optiml.ml.neural_network import NeuralNetworkRegressor, NeuralNetworkClassifier
-from optiml.ml.neural_network.activations import sigmoid, softmax, linear
+from optiml.ml.neural_network.activations import sigmoid, softmax, linear, tanh, relu
 from optiml.ml.neural_network.layers import FullyConnected
 from optiml.ml.neural_network.losses import mean_squared_error, categorical_cross_entropy
 from optiml.ml.neural_network.regularizers import L2
@@ -56,5 +56,44 @@ def test_neural_network_classifier():
     assert net.score(X_test, ohe.transform(y_test.reshape(-1, 1))) >= 0.95
 
 
+def test_neural_network_loss_function_and_jacobian():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y_ohe = OneHotEncoder(sparse=False).fit_transform(y.reshape(-1, 1))
+    net = NeuralNetworkClassifier((FullyConnected(4, 4, sigmoid),
+                                   FullyConnected(4, 3, softmax)),
+                                  loss=categorical_cross_entropy, optimizer=Adam, max_iter=5).fit(X_scaled, y_ohe)
+    packed_coef_inter = np.random.uniform(size=net.optimizer.x.size)
+    f_x, g_x = net.loss.function_and_jacobian(packed_coef_inter, X_scaled[:30], y_ohe[:30])
+    assert np.allclose(f_x, net.loss.function(packed_coef_inter, X_scaled[:30], y_ohe[:30]))
+    assert np.allclose(g_x, net.loss.jacobian(packed_coef_inter, X_scaled[:30], y_ohe[:30]))
+
+
+def test_neural_network_loss_hessian_vector_product():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y_ohe = OneHotEncoder(sparse=False).fit_transform(y.reshape(-1, 1))
+    classifier = NeuralNetworkClassifier((FullyConnected(4, 4, sigmoid),
+                                          FullyConnected(4, 3, softmax)),
+                                         loss=categorical_cross_entropy, optimizer=Adam, max_iter=5)
+    regressor = NeuralNetworkRegressor((FullyConnected(4, 4, tanh, coef_reg=L2(0.1)),
+                                        FullyConnected(4, 4, relu),
+                                        FullyConnected(4, 1, linear, inter_reg=L2(0.1))),
+                                       loss=mean_squared_error, optimizer=Adam, max_iter=5)
+    for net, y_true in ((classifier, y_ohe), (regressor, X_scaled[:, 0])):
+        net.fit(X_scaled, y_true)
+        packed_coef_inter = np.random.uniform(size=net.optimizer.x.size)
+        v = np.random.uniform(size=packed_coef_inter.size)
+        # the Hessian by central differences of the Jacobian along each coordinate
+        H_x = np.column_stack([(net.loss.jacobian(packed_coef_inter + 1e-6 * e) -
+                                net.loss.jacobian(packed_coef_inter - 1e-6 * e)) / 2e-6
+                               for e in np.identity(packed_coef_inter.size)])
+        assert np.allclose(net.loss.hessian_vector_product(packed_coef_inter, v), H_x.dot(v), atol=1e-6)
+        # the R-op is exact, so it matches the central differences of the Jacobian along v up to their error
+        assert np.allclose(net.loss.hessian_vector_product(packed_coef_inter, v),
+                           (net.loss.jacobian(packed_coef_inter + 1e-5 * v) -
+                            net.loss.jacobian(packed_coef_inter - 1e-5 * v)) / 2e-5, rtol=1e-7, atol=1e-8)
+
+
 if __name__ == "__main__":
     pytest.main()
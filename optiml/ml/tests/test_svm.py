@@ -1,16 +1,76 @@
+import numpy as np
 import pytest
+import scipy.sparse as sp
 from sklearn.datasets import load_iris, load_boston
+from sklearn.exceptions import ConvergenceWarning
 from sklearn.model_selection import train_test_split
 from sklearn.multiclass import OneVsRestClassifier
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 
 from optiml.ml.svm import PrimalSVC, DualSVC, PrimalSVR, DualSVR
-from optiml.ml.svm.kernels import linear, gaussian
-from optiml.ml.svm.losses import hinge, squared_hinge, epsilon_insensitive, squared_epsilon_insensitive
+from optiml.ml.svm.coordinate_descent import DualCoordinateDescent
+from optiml.ml.svm.kernels import linear, gaussian, GaussianKernel
+from optiml.ml.svm.lasvm import LASVM, KernelCache
+from optiml.ml.svm.pegasos import Pegasos
+from optiml.ml.svm.losses import (hinge, squared_hinge, smoothed_hinge, epsilon_insensitive,
+                                  squared_epsilon_insensitive, smoothed_epsilon_insensitive)
 from optiml.opti.constrained import ProjectedGradient, ActiveSet, InteriorPoint, FrankWolfe
 from optiml.opti.unconstrained import ProximalBundle
-from optiml.opti.unconstrained.line_search import SteepestGradientDescent
-from optiml.opti.unconstrained.stochastic import StochasticGradientDescent, AdaGrad
+from optiml.opti.unconstrained.line_search import SteepestGradientDescent, BFGS, NewtonCG
+from optiml.opti.unconstrained.stochastic import StochasticGradientDescent, AdaGrad, Adam, SVRG, SAGA
+
+
+def test_svm_losses_jacobian():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y_svc = np.where(y == 0, -1., 1.)
+    for loss, est, y_true in ((hinge, PrimalSVC(), y_svc),
+                              (squared_hinge, PrimalSVC(), y_svc),
+                              (smoothed_hinge, PrimalSVC(), y_svc),
+                              (epsilon_insensitive, PrimalSVR(), y),
+                              (squared_epsilon_insensitive, PrimalSVR(), y),
+                              (smoothed_epsilon_insensitive, PrimalSVR(), y)):
+        for fit_intercept in (True, False):
+            svm_loss = loss(est, X_scaled, y_true, fit_intercept=fit_intercept)
+            packed_coef_inter = np.random.uniform(size=svm_loss.ndim)
+            f_x, g_x = svm_loss.function_and_jacobian(packed_coef_inter)
+            assert np.allclose(f_x, svm_loss.function(packed_coef_inter))
+            assert np.allclose(g_x, svm_loss.auto_jac(packed_coef_inter))
+
+
+def test_svm_losses_hessian():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y_svc = np.where(y == 0, -1., 1.)
+    for loss, est, y_true in ((squared_hinge, PrimalSVC(), y_svc),
+                              (smoothed_hinge, PrimalSVC(), y_svc),
+                              (squared_epsilon_insensitive, PrimalSVR(), y),
+                              (smoothed_epsilon_insensitive, PrimalSVR(), y)):
+        for fit_intercept in (True, False):
+            svm_loss = loss(est, X_scaled, y_true, fit_intercept=fit_intercept)
+            packed_coef_inter = np.random.uniform(size=svm_loss.ndim)
+            v = np.random.uniform(size=svm_loss.ndim)
+            H_x = svm_loss.hessian(packed_coef_inter)
+            assert np.allclose(H_x, svm_loss.auto_hess(packed_coef_inter))
+            assert np.allclose(svm_loss.hessian_vector_product(packed_coef_inter, v), H_x.dot(v))
+            sparse_svm_loss = loss(est, sp.csr_matrix(X_scaled), y_true, fit_intercept=fit_intercept)
+            assert np.allclose(sparse_svm_loss.hessian(packed_coef_inter), H_x)
+            assert np.allclose(sparse_svm_loss.hessian_vector_product(packed_coef_inter, v), H_x.dot(v))
+
+
+def test_svm_losses_multiclass():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    Y = np.where(y[:, np.newaxis] == np.unique(y), 1., -1.)
+    for fit_intercept in (True, False):
+        svm_loss = squared_hinge(PrimalSVC(), X_scaled, Y, fit_intercept=fit_intercept)
+        assert svm_loss.ndim == (X.shape[1] + fit_intercept) * Y.shape[1]
+        packed_coef_inter = np.random.uniform(size=svm_loss.ndim)
+        v = np.random.uniform(size=svm_loss.ndim)
+        assert np.allclose(svm_loss.jacobian(packed_coef_inter), svm_loss.auto_jac(packed_coef_inter))
+        H_x = svm_loss.hessian(packed_coef_inter)
+        assert np.allclose(H_x, svm_loss.auto_hess(packed_coef_inter))
+        assert np.allclose(svm_loss.hessian_vector_product(packed_coef_inter, v), H_x.dot(v))
 
 
 def test_solve_linear_svr_with_line_search_optimizer():
@@ -22,21 +82,101 @@ def test_solve_linear_svr_with_line_search_optimizer():
     assert svr.score(X_test, y_test) >= 0.77
 
 
+def test_solve_linear_svr_with_truncated_newton_optimizer():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=NewtonCG)
+    svr.fit(X_train, y_train)
+    assert svr.optimizer.status == 'optimal'
+    assert svr.score(X_test, y_test) >= 0.77
+
+
 def test_solve_linear_svr_with_stochastic_optimizer():
     X, y = load_boston(return_X_y=True)
     X_scaled = StandardScaler().fit_transform(X)
     X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
-    svr = PrimalSVR(loss=epsilon_insensitive, optimizer=StochasticGradientDescent)
+    svr = PrimalSVR(C=10, loss=epsilon_insensitive, optimizer=StochasticGradientDescent)
     svr.fit(X_train, y_train)
     assert svr.score(X_test, y_test) >= 0.77
 
 
+def test_solve_linear_svr_with_variance_reduced_stochastic_optimizer():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=SVRG, batch_size=64, learning_rate=0.01,
+                    max_iter=100, random_state=1)
+    svr.fit(X_train, y_train)
+    assert svr.score(X_test, y_test) >= 0.77
+
+
+def test_partial_fit_linear_svr_on_chunks():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=AdaGrad, batch_size=16, learning_rate=1.,
+                    random_state=1)
+    for epoch in range(50):
+        for i in range(0, len(X_train), 50):
+            svr.partial_fit(X_train[i:i + 50], y_train[i:i + 50])
+    assert svr.score(X_test, y_test) >= 0.77
+
+
+def test_partial_fit_linear_svr_on_whole_batches():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(optimizer=AdaGrad, learning_rate=1.)
+    svr.partial_fit(X_train, y_train)
+    # without mini batches each call takes exactly one step
+    assert svr.optimizer.iter == 1
+    assert not np.allclose(svr.coef_, 0)
+    score = svr.score(X_test, y_test)
+    for epoch in range(10):
+        svr.partial_fit(X_train, y_train)
+    assert svr.optimizer.iter == 11
+    assert svr.score(X_test, y_test) > score
+
+
 def test_solve_linear_svr_with_proximal_bundle_optimizer():
     X, y = load_boston(return_X_y=True)
     X_scaled = StandardScaler().fit_transform(X)
     X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
-    svr = PrimalSVR(loss=epsilon_insensitive, optimizer=ProximalBundle)
+    svr = PrimalSVR(C=10, loss=epsilon_insensitive, optimizer=ProximalBundle)
+    svr.fit(X_train, y_train)
+    assert svr.score(X_test, y_test) >= 0.77
+
+
+def test_solve_linear_svr_with_dual_coordinate_descent():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=DualCoordinateDescent, random_state=1)
+    svr.fit(X_train, y_train)
+    assert svr.score(X_test, y_test) >= 0.77
+
+
+def test_solve_sparse_linear_svr_with_dual_coordinate_descent():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=DualCoordinateDescent, random_state=1)
+    sparse_svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=DualCoordinateDescent, random_state=1)
+    svr.fit(X_train, y_train)
+    sparse_svr.fit(sp.csr_matrix(X_train), y_train)
+    assert np.allclose(svr.coef_, sparse_svr.coef_, atol=1e-3)
+    assert sparse_svr.score(sp.csr_matrix(X_test), y_test) >= 0.77
+
+
+def test_linear_svr_loss_with_implicit_intercept():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = PrimalSVR(loss=squared_epsilon_insensitive, optimizer=SteepestGradientDescent)
     svr.fit(X_train, y_train)
+    assert svr.loss.X is X_train
+    assert svr.loss.ndim == X_train.shape[1] + 1
     assert svr.score(X_test, y_test) >= 0.77
 
 
@@ -114,6 +254,55 @@ def test_solve_linear_svc_with_stochastic_optimizer():
     assert svc.score(X_test, y_test) >= 0.57
 
 
+def test_solve_linear_svc_with_variance_reduced_stochastic_optimizer():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = PrimalSVC(loss=squared_hinge, optimizer=SAGA, batch_size=16, learning_rate=0.1,
+                    max_iter=100, random_state=1)
+    svc.fit(X_train, y_train)
+    assert svc.optimizer.compact
+    assert svc.score(X_test, y_test) >= 0.57
+
+
+def test_partial_fit_linear_svc_on_chunks():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = PrimalSVC(loss=squared_hinge, optimizer=Adam, batch_size=8, learning_rate=0.01, random_state=1)
+    with pytest.raises(ValueError):
+        svc.partial_fit(X_train[:30], y_train[:30])
+    svc.partial_fit(X_train[:30], y_train[:30], classes=np.unique(y))
+    optimizer, n_iter = svc.optimizer, svc.optimizer.iter
+    for epoch in range(20):
+        for i in range(0, len(X_train), 30):
+            svc.partial_fit(X_train[i:i + 30], y_train[i:i + 30])
+    # the same optimizer is bound to each chunk, so its moments and step counter are kept
+    assert svc.optimizer is optimizer and svc.optimizer.iter > n_iter
+    assert svc.optimizer.f.X.shape[0] == len(X_train) % 30
+    assert svc.score(X_test, y_test) >= 0.57
+    with pytest.raises(TypeError):
+        PrimalSVC(optimizer=BFGS).partial_fit(X_train, y_train, classes=np.unique(y))
+
+
+def test_partial_fit_linear_svc_on_whole_batches():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y = np.where(y == 0, 1, 0)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = PrimalSVC(optimizer=Adam, learning_rate=0.1)
+    svc.partial_fit(X_train, y_train, classes=[0, 1])
+    # without mini batches each call takes exactly one step
+    assert svc.optimizer.iter == 1
+    assert not np.allclose(svc.coef_, 0)
+    loss = svc.loss.function(svc.optimizer.x)
+    for epoch in range(10):
+        svc.partial_fit(X_train, y_train)
+    assert svc.optimizer.iter == 11
+    assert svc.loss.function(svc.optimizer.x) < loss
+    assert svc.score(X_test, y_test) >= 0.97
+
+
 def test_solve_linear_svc_with_proximal_bundle_optimizer():
     X, y = load_iris(return_X_y=True)
     X_scaled = MinMaxScaler().fit_transform(X)
@@ -123,6 +312,131 @@ def test_solve_linear_svc_with_proximal_bundle_optimizer():
     assert svc.score(X_test, y_test) >= 0.57
 
 
+def test_solve_linear_svc_with_dual_coordinate_descent():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = OneVsRestClassifier(PrimalSVC(loss=hinge, optimizer=DualCoordinateDescent, random_state=1))
+    svc.fit(X_train, y_train)
+    assert svc.score(X_test, y_test) >= 0.57
+
+
+def test_solve_sparse_linear_svc_with_dual_coordinate_descent():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = OneVsRestClassifier(PrimalSVC(loss=hinge, optimizer=DualCoordinateDescent, random_state=1))
+    sparse_svc = OneVsRestClassifier(PrimalSVC(loss=hinge, optimizer=DualCoordinateDescent, random_state=1))
+    svc.fit(X_train, y_train)
+    sparse_svc.fit(sp.csr_matrix(X_train), y_train)
+    for estimator, sparse_estimator in zip(svc.estimators_, sparse_svc.estimators_):
+        assert np.allclose(estimator.coef_, sparse_estimator.coef_, atol=1e-3)
+    assert sparse_svc.score(sp.csr_matrix(X_test), y_test) >= 0.57
+
+
+def test_solve_linear_svc_with_pegasos():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = OneVsRestClassifier(PrimalSVC(loss=hinge, optimizer=Pegasos, batch_size=8,
+                                        max_iter=100, random_state=1))
+    svc.fit(X_train, y_train)
+    assert svc.score(X_test, y_test) >= 0.57
+
+
+def test_solve_sparse_linear_svc_with_averaged_pegasos():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(sp.csr_matrix(X_scaled), np.where(y == 0, 1, -1),
+                                                        train_size=0.75, random_state=1)
+    loss = hinge(PrimalSVC(), X_train, y_train)
+    iterates = []
+    Pegasos(f=loss, x=np.zeros(loss.ndim), batch_size=1, epochs=5, random_state=1,
+                      callback=lambda opt, *args: iterates.append(opt.x.copy())).minimize()
+    averaged = Pegasos(f=loss, x=np.zeros(loss.ndim), batch_size=1, epochs=5, average=True,
+                       random_state=1).minimize()
+    # the callback sees the starting point first, then the iterate after each step
+    assert np.allclose(averaged.x, np.mean(iterates[1:], axis=0))
+    svc = PrimalSVC(loss=hinge, optimizer=Pegasos, batch_size=1, max_iter=20, random_state=1)
+    svc.fit(X_train, y_train)
+    assert svc.score(X_test, y_test) >= 0.97
+
+
+class CountingPegasos(Pegasos):
+
+    def __init__(self, *args, **kwargs):
+        self.n_x = 0
+        super().__init__(*args, **kwargs)
+
+    @property
+    def x(self):
+        self.n_x += 1
+        return Pegasos.x.fget(self)
+
+    @x.setter
+    def x(self, x):
+        Pegasos.x.fset(self, x)
+
+
+def test_pegasos_point_is_materialized_once_per_epoch():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y = np.where(y == 0, 1, -1)
+    svc = PrimalSVC(loss=hinge, optimizer=CountingPegasos, batch_size=1, max_iter=5, random_state=1)
+    svc.fit(sp.csr_matrix(X_scaled), y)
+    # the dense w is built at the end of each epoch and of the fit, not at each step
+    assert svc.optimizer.iter == svc.optimizer.epochs * len(X)
+    assert svc.optimizer.n_x <= svc.optimizer.epochs + 1
+    assert np.allclose(svc.coef_, svc.optimizer.x[:-1])
+
+
+def test_solve_multiclass_linear_svc_with_stochastic_optimizer():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = PrimalSVC(loss=hinge, optimizer=StochasticGradientDescent)
+    svc.fit(X_train, y_train)
+    assert svc.coef_.shape == (3, X.shape[1])
+    assert svc.score(X_test, y_test) >= 0.57
+
+
+def test_solve_multiclass_linear_svc_with_parallel_line_search_optimizers():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = PrimalSVC(loss=squared_hinge, optimizer=BFGS, n_jobs=2)
+    svc.fit(X_train, y_train)
+    ovr = OneVsRestClassifier(PrimalSVC(loss=squared_hinge, optimizer=BFGS)).fit(X_train, y_train)
+    assert np.allclose(svc.coef_, [estimator.coef_ for estimator in ovr.estimators_], atol=1e-3)
+    assert svc.score(X_test, y_test) >= 0.57
+
+
+def test_solve_linear_svc_with_smoothed_hinge_continuation():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = OneVsRestClassifier(PrimalSVC(loss=smoothed_hinge, smoothing=[1., 0.1, 0.01], optimizer=BFGS))
+    svc.fit(X_train, y_train)
+    assert svc.score(X_test, y_test) >= 0.57
+    with pytest.raises(ValueError):
+        PrimalSVC(loss=smoothed_hinge, smoothing=[0.01, 0.1, 1.], optimizer=BFGS)
+    with pytest.raises(ValueError):
+        PrimalSVC(loss=smoothed_hinge, smoothing=[1., 1., 0.1], optimizer=BFGS)
+
+
+def test_linear_svc_fit_path():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    y = np.where(y == 1, 1, -1)
+    Cs = np.logspace(-1, 1, 5)
+    coefs, intercepts = PrimalSVC(loss=squared_hinge, optimizer=BFGS).fit_path(X_scaled, y, Cs)
+    assert coefs.shape == (len(Cs), X.shape[1])
+    assert intercepts.shape == (len(Cs),)
+    svc = PrimalSVC(C=Cs[-1], loss=squared_hinge, optimizer=BFGS).fit(X_scaled, y)
+    assert np.allclose(coefs[-1], svc.coef_, atol=1e-3)
+    assert np.allclose(intercepts[-1], svc.intercept_, atol=1e-3)
+
+
 def test_solve_svc_with_smo():
     X, y = load_iris(return_X_y=True)
     X_scaled = MinMaxScaler().fit_transform(X)
@@ -131,6 +445,109 @@ def test_solve_svc_with_smo():
     assert svc.score(X_test, y_test) >= 0.97
 
 
+def test_resume_svc_with_smo():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y == 1, train_size=0.75, random_state=1)
+    svc = DualSVC(kernel=gaussian, max_iter=1, warm_start=True)
+    with pytest.warns(ConvergenceWarning):
+        svc.fit(X_train, y_train)
+    assert svc.optimizer.status == 'stopped'
+    assert svc.optimizer.kkt_gap() > 2 * svc.tol
+    svc.set_params(max_iter=1000).fit(X_train, y_train)
+    assert svc.optimizer.status == 'optimal'
+    assert svc.optimizer.kkt_gap() <= 2 * svc.tol
+    assert svc.optimizer.iter > 1
+    assert svc.score(X_test, y_test) >= 0.97
+
+
+def test_warm_start_smo_on_another_problem():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y == 1, train_size=0.75, random_state=1)
+    svc = DualSVC(kernel=gaussian, warm_start=True).fit(X_train[:50], y_train[:50])
+    optimizer = svc.optimizer
+    # the state built on another training set is not resumed
+    svc.fit(X_train, y_train)
+    assert svc.optimizer is not optimizer and svc.optimizer.K.shape == (len(X_train), len(X_train))
+    assert svc.score(X_test, y_test) >= 0.97
+    optimizer = svc.optimizer
+    svc.set_params(C=10.).fit(X_train, y_train)
+    assert svc.optimizer is not optimizer and svc.optimizer.C == 10.
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = DualSVR(kernel=linear, warm_start=True).fit(X_train[:100], y_train[:100])
+    optimizer = svr.optimizer
+    svr.fit(X_train, y_train)
+    assert svr.optimizer is not optimizer and len(svr.optimizer.alphas_p) == len(X_train)
+    optimizer = svr.optimizer
+    svr.fit(X_train, y_train)
+    assert svr.optimizer is optimizer
+
+
+def test_smo_stats():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = DualSVR(kernel=linear, max_iter=2000).fit(X_train, y_train)
+    stats = svr.smo_stats_
+    assert stats['sweeps'] == svr.optimizer.iter == len(stats['kkt_gap'])
+    assert stats['sweeps'] == stats['examine_all_sweeps'] + stats['non_bound_sweeps']
+    assert stats['take_step_successes'] > 0 and stats['kernel_rows'] > 0
+    assert stats['error_cache_time'] > 0
+    assert svr.optimizer.status == 'optimal'
+
+
+def test_solve_svc_with_lasvm():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = OneVsRestClassifier(DualSVC(kernel=gaussian, optimizer=LASVM, random_state=1)).fit(X_train, y_train)
+    assert svc.score(X_test, y_test) >= 0.97
+
+
+def test_partial_fit_svc_with_lasvm():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y == 2, train_size=0.75, random_state=1)
+    svc = DualSVC(kernel=gaussian, optimizer=LASVM, cache_size=10, random_state=1)
+    for i in range(0, len(X_train), 25):
+        svc.partial_fit(X_train[i:i + 25], y_train[i:i + 25], classes=[False, True])
+    assert len(svc.optimizer.cache.rows) <= 10
+    # just the candidate support vectors are retained from the previous chunks
+    assert len(svc.optimizer.cache) < len(X_train) // 2
+    assert svc.score(X_test, y_test) >= 0.97
+    with pytest.raises(TypeError):
+        DualSVC(kernel=gaussian).partial_fit(X_train, y_train, classes=[False, True])
+
+
+def test_solve_svc_with_cascade():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y == 1, train_size=0.75, random_state=1)
+    smo = DualSVC(kernel=gaussian).fit(X_train, y_train)
+    svc = DualSVC(kernel=gaussian, n_shards=4, n_jobs=2, random_state=1).fit(X_train, y_train)
+    assert np.mean(svc.predict(X_test) == smo.predict(X_test)) >= 0.97
+    assert svc.score(X_test, y_test) >= 0.97
+
+
+def test_kernel_cache():
+    X, _ = load_iris(return_X_y=True)
+    kernel = GaussianKernel(gamma=0.1)
+    cache = KernelCache(kernel, cache_size=5)
+    for x in X[:20]:
+        cache.append(x, cache.kernel_row(x))
+    for p in (3, 17, 0, 16):
+        cache.remove(p)
+    for x in X[20:25]:
+        cache.append(x, cache.kernel_row(x))
+    assert len(cache.rows) <= 5
+    K = kernel(cache.X)
+    for p in range(len(cache)):
+        assert np.allclose(cache.row(p), K[p])
+
+
 def test_solve_svc_as_bcqp_with_cvxopt():
     X, y = load_iris(return_X_y=True)
     X_scaled = MinMaxScaler().fit_transform(X)
@@ -171,6 +588,26 @@ def test_solve_svc_as_bcqp_with_frank_wolfe():
     assert svc.score(X_test, y_test) >= 0.97
 
 
+def test_solve_svc_by_decomposition_with_active_set():
+    X, y = load_iris(return_X_y=True)
+    X_scaled = MinMaxScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svc = OneVsRestClassifier(DualSVC(kernel=gaussian, optimizer=ActiveSet, working_set_size=20,
+                                      cache_size=50)).fit(X_train, y_train)
+    assert svc.score(X_test, y_test) >= 0.97
+    with pytest.raises(TypeError):
+        DualSVC(kernel=gaussian, optimizer=AdaGrad, working_set_size=20).fit(X_train, y_train == 1)
+
+
+def test_solve_svr_by_decomposition_with_interior_point():
+    X, y = load_boston(return_X_y=True)
+    X_scaled = StandardScaler().fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, train_size=0.75, random_state=1)
+    svr = DualSVR(kernel=linear, optimizer=InteriorPoint, working_set_size=100).fit(X_train, y_train)
+    assert svr.optimizer.status == 'optimal'
+    assert svr.score(X_test, y_test) >= 0.77
+
+
 def test_solve_svc_as_bcqp_lagrangian_relaxation_with_subgradient_optimizer():
     X, y = load_iris(return_X_y=True)
     X_scaled = MinMaxScaler().fit_transform(X)
@@ -1,5 +1,7 @@
 import autograd.numpy as np
 from autograd import jacobian, hessian
+from autograd.differential_operators import make_jvp
+from joblib import Parallel, delayed, effective_n_jobs
 
 
 class Optimizer:
@@ -57,11 +59,57 @@ class Optimizer:
 
 
 class OptimizationFunction:
+    # whether the Hessian does not depend on the point, so that the
+    # optimizers can factorize it just the once and then reuse it
+    constant_hessian = False
 
-    def __init__(self, ndim=2):
-        self.auto_jac = jacobian(self.function)
-        self.auto_hess = hessian(self.function)
+    def __init__(self, ndim=2, cache_size=2):
+        """
+
+        :param ndim:       (integer scalar, optional, default value 2): the number of variables.
+        :param cache_size: (integer scalar, optional, default value 2): the number of the last
+                           points whose value and Jacobian are kept by function_and_jacobian,
+                           so that the optimizers re-evaluating them at the same point, e.g.,
+                           at the start of the iteration after the line search, get them for free.
+        """
         self.ndim = ndim
+        if not cache_size >= 0:
+            raise ValueError('cache_size must be >= 0')
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = []
+
+    @property
+    def auto_jac(self):
+        """
+        The Jacobian of the function by automatic differentiation, built at its
+        first use only, since most functions override jacobian analytically.
+        """
+        if not hasattr(self, '_auto_jac'):
+            self._auto_jac = jacobian(self.function)
+        return self._auto_jac
+
+    @property
+    def auto_hess(self):
+        """
+        The Hessian of the function by automatic differentiation, built at its
+        first use only, since most functions override hessian analytically.
+        """
+        if not hasattr(self, '_auto_hess'):
+            self._auto_hess = hessian(self.function)
+        return self._auto_hess
+
+    @property
+    def auto_hvp(self):
+        """
+        The Hessian-vector product of the function by automatic differentiation, i.e.,
+        the forward-mode derivative of the reverse-mode Jacobian along v, which never
+        forms the Hessian matrix, built at its first use only.
+        """
+        if not hasattr(self, '_auto_hvp'):
+            self._auto_hvp = lambda x, v: make_jvp(self.auto_jac)(x)(v)[1]
+        return self._auto_hvp
 
     def x_star(self):
         return np.full(fill_value=np.nan, shape=self.ndim)
@@ -91,8 +139,95 @@ class OptimizationFunction:
         """
         return self.auto_hess(x)
 
+    def finite_difference_hessian(self, x, g_x=None, step=1e-8, n_jobs=None):
+        """
+        The Hessian matrix of the function approximated by forward differences of the
+        Jacobian along each coordinate, e.g., as an alternative to autograd when only the
+        Jacobian is available, whose evaluations at the perturbed points are independent,
+        so they are spread over n_jobs processes, each one over a contiguous block of them.
+        :param x:      1D array of points at which the Hessian is to be computed.
+        :param g_x:    (optional) the Jacobian of the function at x, if already known.
+        :param step:   (real scalar, optional, default value 1e-8): the step of the differences.
+        :param n_jobs: (integer scalar, optional, default value None): the number of parallel jobs,
+                       None means 1 and -1 means using all processors.
+        :return:       the (symmetrized) approximation of the Hessian matrix of the function at x.
+        """
+        x = np.asarray(x, dtype=float)
+        if g_x is None:
+            g_x = self.jacobian(x)
+        # a task for each block of coordinates rather than for each one,
+        # so that the dispatching overhead does not dominate the evaluations
+        blocks = np.array_split(np.arange(x.size), min(effective_n_jobs(n_jobs), x.size))
+        H_x = np.vstack(Parallel(n_jobs=n_jobs)(delayed(self._perturbed_jacobians)(x, block, step)
+                                                for block in blocks))
+        H_x = (H_x - g_x) / step
+        return (H_x + H_x.T) / 2
+
+    def _perturbed_jacobians(self, x, block, step):
+        xp = x.copy()  # x must not be changed
+        rows = []
+        for i in block:
+            xp[i] += step
+            rows.append(self.jacobian(xp))
+            xp[i] = x[i]
+        return np.array(rows)
+
+    def hessian_vector_product(self, x, v):
+        """
+        The product between the Hessian matrix of the function and a vector v,
+        which matrix-free methods need in place of the Hessian matrix itself.
+        :param x: 1D array of points at which the Hessian is to be computed.
+        :param v: 1D array to be multiplied by the Hessian.
+        :return:  the product between the Hessian matrix of the function at x and v.
+        """
+        return self.auto_hvp(x, v)
+
+    def function_and_jacobian(self, x, *args):
+        """
+        The value and the Jacobian of the function at the same point, which is what
+        the optimizers need at each iteration. The last cache_size evaluations are
+        kept, keyed by the contents of x and the identity of the args, so that the
+        same point, e.g., the last one visited by the line search, is not evaluated
+        twice. The returned Jacobian is shared with the cache, so it must not be
+        modified in-place.
+        :param x:    1D array of points at which the function and the Jacobian are to be computed.
+        :param args: the optional arguments of both, e.g., the mini batch.
+        :return:     the value and the Jacobian of the function at x.
+        """
+        for entry in self._cache:
+            last_x, last_args, f_x, g_x = entry
+            if (len(last_args) == len(args) and
+                    all(last_arg is arg for last_arg, arg in zip(last_args, args)) and
+                    np.array_equal(last_x, x)):
+                self.cache_hits += 1
+                return f_x, g_x
+
+        self.cache_misses += 1
+        f_x, g_x = self._function_and_jacobian(x, *args)
+        if self.cache_size:
+            # the args are kept alive with the entry, so their ids cannot be reused
+            self._cache.append((np.array(x, dtype=float), args, f_x, g_x))  # x may be updated in-place
+            del self._cache[:-self.cache_size]
+        return f_x, g_x
+
+    def _function_and_jacobian(self, x, *args):
+        """
+        Compute the value and the Jacobian of the function at the same point, so
+        functions which can share some intermediate results between the two, e.g.,
+        a forward pass over the data, should override it.
+        """
+        return self.function(x, *args), self.jacobian(x, *args)
+
+    def clear_cache(self):
+        """
+        Drop the cached evaluations, to be called whenever the function changes,
+        e.g., its data or its hyperparameters, while the points may not.
+        """
+        self._cache = []
+
 
 class Quadratic(OptimizationFunction):
+    constant_hessian = True
 
     def __init__(self, Q, q):
         """
@@ -157,6 +292,24 @@ class Quadratic(OptimizationFunction):
         """
         return self.Q
 
+    def hessian_vector_product(self, x, v):
+        """
+        The product between the Hessian matrix of a general quadratic function and a vector v, i.e., Q v.
+        :param x: 1D array of points at which the Hessian is to be computed.
+        :param v: 1D array to be multiplied by the Hessian.
+        :return:  the product between the Hessian matrix of a general quadratic function and v.
+        """
+        return self.Q.dot(v)
+
+    def _function_and_jacobian(self, x):
+        """
+        The value and the Jacobian of a general quadratic function sharing the product Q x.
+        :param x: ([n x 1] real column vector): the point at which they are to be computed.
+        :return:  the value and the Jacobian of a general quadratic function at x.
+        """
+        Qx = self.Q.dot(x)
+        return 0.5 * x.T.dot(Qx) + self.q.T.dot(x), Qx + self.q
+
 
 # 2x2 quadratic function with nicely conditioned Hessian
 quad1 = Quadratic(Q=[[6, -2], [-2, 6]], q=[10, 5])
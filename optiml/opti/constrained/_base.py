@@ -37,6 +37,7 @@ class LagrangianBoxConstrainedQuadratic(Quadratic):
 
                     1/2 x^T Q x + q^T x : 0 <= x <= ub
     """
+    constant_hessian = False  # the dual function is not quadratic in lambda
 
     def __init__(self, quad, ub):
         if not isinstance(quad, Quadratic):
@@ -119,3 +120,12 @@ class LagrangianBoxConstrainedQuadratic(Quadratic):
             self.last_lmbda = lmbda
             self.last_x = x
         return np.hstack((self.ub - x, x))
+
+    def _function_and_jacobian(self, lmbda):
+        """
+        The value and the Jacobian of the Lagrangian dual relaxation, which share the
+        optimal solution of the minimization problem at lambda, solved just the once.
+        :param lmbda: the dual variable wrt evaluate the function and the gradient
+        :return: the function value and the gradient wrt lambda
+        """
+        return self.function(lmbda), self.jacobian(lmbda)
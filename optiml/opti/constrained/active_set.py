@@ -117,7 +117,7 @@ class ActiveSet(BoxConstrainedQuadraticOptimizer):
                 last_x = xs
 
                 # compute function value and gradient
-                self.f_x, self.g_x = self.f.function(last_x), self.f.jacobian(last_x)
+                self.f_x, self.g_x = self.f.function_and_jacobian(last_x)
 
                 h = np.nonzero(np.logical_and(L, self.g_x < -1e-12))[0]
                 if h.size > 0:
@@ -71,7 +71,7 @@ class FrankWolfe(BoxConstrainedQuadraticOptimizer):
             print('iter\t cost\t\t lb\t\t gap')
 
         while True:
-            self.f_x, self.g_x = self.f.function(self.x), self.f.jacobian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
 
             # solve min { <g, y> : 0 <= y <= u }
             y = np.zeros(self.f.ndim)
@@ -57,7 +57,7 @@ class ProjectedGradient(BoxConstrainedQuadraticOptimizer):
             print('iter\t cost\t\t gnorm')
 
         while True:
-            self.f_x, self.g_x = self.f.function(self.x), self.f.jacobian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
             d = -self.g_x
 
             # project the direction over the active constraints
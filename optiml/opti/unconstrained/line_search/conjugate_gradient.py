@@ -213,7 +213,7 @@ class NonlinearConjugateGradient(LineSearchOptimizer):
             print('\t beta\t\tls\tit\t astar', end='')
 
         while True:
-            self.f_x, self.g_x = self.f.function(self.x), self.f.jacobian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
             ng = np.linalg.norm(self.g_x)
 
             if self.eps < 0:
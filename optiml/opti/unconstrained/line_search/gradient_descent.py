@@ -171,7 +171,7 @@ class SteepestGradientDescent(LineSearchOptimizer):
             print('\tls\tit\t astar', end='')
 
         while True:
-            self.f_x, self.g_x = self.f.function(self.x), self.f.jacobian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
             ng = np.linalg.norm(self.g_x)
 
             if self.eps < 0:
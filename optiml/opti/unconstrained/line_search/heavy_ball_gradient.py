@@ -159,7 +159,7 @@ class HeavyBallGradient(LineSearchOptimizer):
         past_d = np.zeros(self.f.ndim)
 
         while True:
-            self.f_x, self.g_x = self.f.function(self.x), self.f.jacobian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
             ng = np.linalg.norm(self.g_x)
 
             if self.eps < 0:
@@ -1,6 +1,8 @@
 import numpy as np
+from scipy.linalg import cho_solve
 
 from . import LineSearchOptimizer
+from ...utils import modified_cholesky
 
 
 class Newton(LineSearchOptimizer):
@@ -49,8 +51,20 @@ class Newton(LineSearchOptimizer):
     #   the simpler Backtracking line search should be used instead
     #
     # - delta (real scalar, optional, default value 1e-6): minimum positive
-    #   value for the eigenvalues of the modified Hessian used to compute the
-    #   Newton direction
+    #   multiple of the identity added to the Hessian, if it is not positive
+    #   definite, to compute the Newton direction by its Cholesky factorization,
+    #   which is doubled until the factorization succeeds. If the Hessian of f
+    #   is constant, e.g., for a quadratic function, it is factorized just the
+    #   once
+    #
+    # - fd_step (real scalar, optional, default value None): if not None,
+    #   the Hessian is approximated by finite differences of the Jacobian
+    #   with fd_step as the step, in place of the one provided by f(), e.g.,
+    #   by autograd
+    #
+    # - n_jobs (integer scalar, optional, default value None): the number of
+    #   parallel jobs evaluating the Jacobian at the perturbed points of the
+    #   finite differences, None means 1 and -1 means using all processors
     #
     # - tau (real scalar, optional, default value 0.9): scaling parameter for
     #   the line search. In the Armijo-Wolfe line search it is used in the
@@ -114,6 +128,8 @@ class Newton(LineSearchOptimizer):
                  m2=0.9,
                  a_start=1,
                  delta=1e-6,
+                 fd_step=None,
+                 n_jobs=None,
                  tau=0.9,
                  sfgrd=0.01,
                  m_inf=-np.inf,
@@ -137,9 +153,14 @@ class Newton(LineSearchOptimizer):
                          callback_args=callback_args,
                          verbose=verbose)
         self.H_x = np.zeros(0)
+        self.L_x = np.zeros(0)  # Cholesky factor of the (modified) Hessian
         if not delta > 0:
             raise ValueError('delta must be > 0')
         self.delta = delta
+        if fd_step is not None and not fd_step > 0:
+            raise ValueError('fd_step must be > 0')
+        self.fd_step = fd_step
+        self.n_jobs = n_jobs
 
     def minimize(self):
         last_x = np.zeros(self.f.ndim)  # last point visited in the line search
@@ -152,8 +173,10 @@ class Newton(LineSearchOptimizer):
                 prev_v = np.inf
             print('\t delta\t\tls\tit\t astar', end='')
 
+        shift = 0.
+
         while True:
-            self.f_x, self.g_x, self.H_x = self.f.function(self.x), self.f.jacobian(self.x), self.f.hessian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
             ng = np.linalg.norm(self.g_x)
 
             if self.eps < 0:
@@ -180,17 +203,19 @@ class Newton(LineSearchOptimizer):
                 self.status = 'stopped'
                 break
 
-            # compute Newton's direction
-            lambda_n = min(np.linalg.eigvalsh(self.H_x))  # smallest eigenvalue
-            if lambda_n < self.delta:
-                if self.is_verbose():
-                    print('\t{: 1.4e}'.format(self.delta - lambda_n), end='')
-                self.H_x = self.H_x + (self.delta - lambda_n) * np.identity(len(self.g_x))
-            else:
-                if self.is_verbose():
-                    print('\t{: 1.4e}'.format(self.delta), end='')
+            # compute Newton's direction by the Cholesky factorization of the Hessian, modified
+            # to be positive definite if needed, which is reused if the Hessian is constant
+            if not (self.f.constant_hessian and self.L_x.size):
+                if self.fd_step is None:
+                    self.H_x = self.f.hessian(self.x)
+                else:
+                    self.H_x = self.f.finite_difference_hessian(self.x, self.g_x, self.fd_step, self.n_jobs)
+                self.L_x, shift = modified_cholesky(self.H_x, self.delta)
 
-            d = -np.linalg.inv(self.H_x).dot(self.g_x)
+            if self.is_verbose():
+                print('\t{: 1.4e}'.format(shift), end='')
+
+            d = -cho_solve((self.L_x, True), self.g_x)
 
             phi_p0 = self.g_x.T.dot(d)
 
@@ -224,3 +249,217 @@ class Newton(LineSearchOptimizer):
             print('\n')
 
         return self
+
+
+class NewtonCG(LineSearchOptimizer):
+    # Apply a truncated (inexact) Newton's method for the minimization of the
+    # provided function f, where the Newton's system H d = -g is solved only
+    # approximately by the linear conjugate gradient method on the products
+    # between the Hessian and a vector, hence the Hessian is never formed.
+    #
+    # The inner conjugate gradient is stopped as soon as the norm of its
+    # residual is less than or equal to eta^i * || g ||, where the forcing
+    # term eta^i follows the Eisenstat-Walker sequence, i.e.,
+    #
+    #   eta^i = gamma * (|| g^i || / || g^{i - 1} ||)^omega
+    #
+    # safeguarded not to decrease too fast and bounded above by eta_max,
+    # so that the system is solved loosely far from the optimum and more
+    # and more accurately when getting closer to it (superlinear rate), or
+    # as soon as a direction of nonpositive curvature is detected: in this
+    # case the last iterate, which is a descent direction, is returned, or
+    # the anti-gradient if it happens at the first one.
+    #
+    # Input:
+    #
+    # - eta_max (real scalar, optional, default value 0.9): the upper bound
+    #   of the forcing terms, which has to be in (0,1), also used as the
+    #   first one.
+    #
+    # - gamma (real scalar, optional, default value 0.9): the scaling
+    #   parameter of the Eisenstat-Walker sequence, in (0,1].
+    #
+    # - omega (real scalar, optional, default value 2): the exponent of the
+    #   Eisenstat-Walker sequence, in (1,2].
+    #
+    # - max_cg_iter (integer scalar, optional, default value None): the
+    #   maximum number of inner conjugate gradient iterations, i.e., of
+    #   Hessian-vector products, per outer iteration; if None, the number of
+    #   variables.
+    #
+    # The other parameters and the output are the same of Newton.
+    #
+    # References
+    #
+    # S. C. Eisenstat, H. F. Walker. Choosing the Forcing Terms in an Inexact
+    # Newton Method. SIAM Journal on Scientific Computing, 1996.
+    #
+    # J. Nocedal, S. J. Wright. Numerical Optimization, Algorithm 7.1, 2006.
+
+    def __init__(self,
+                 f,
+                 x,
+                 eps=1e-6,
+                 max_iter=1000,
+                 max_f_eval=1000,
+                 m1=0.01,
+                 m2=0.9,
+                 a_start=1,
+                 eta_max=0.9,
+                 gamma=0.9,
+                 omega=2,
+                 max_cg_iter=None,
+                 tau=0.9,
+                 sfgrd=0.01,
+                 m_inf=-np.inf,
+                 min_a=1e-12,
+                 callback=None,
+                 callback_args=(),
+                 verbose=False):
+        super().__init__(f=f,
+                         x=x,
+                         eps=eps,
+                         max_iter=max_iter,
+                         max_f_eval=max_f_eval,
+                         m1=m1,
+                         m2=m2,
+                         a_start=a_start,
+                         tau=tau,
+                         sfgrd=sfgrd,
+                         m_inf=m_inf,
+                         min_a=min_a,
+                         callback=callback,
+                         callback_args=callback_args,
+                         verbose=verbose)
+        if not 0 < eta_max < 1:
+            raise ValueError('eta_max has to lie in (0,1)')
+        self.eta_max = eta_max
+        if not 0 < gamma <= 1:
+            raise ValueError('gamma has to lie in (0,1]')
+        self.gamma = gamma
+        if not 1 < omega <= 2:
+            raise ValueError('omega has to lie in (1,2]')
+        self.omega = omega
+        if max_cg_iter is None:
+            max_cg_iter = self.f.ndim
+        if not max_cg_iter > 0:
+            raise ValueError('max_cg_iter must be > 0')
+        self.max_cg_iter = max_cg_iter
+        self.cg_iter = 0  # total number of inner iterations, i.e., of Hessian-vector products
+
+    def _forcing_term(self, ng, prev_ng, prev_eta):
+        if prev_ng is None:
+            return self.eta_max
+        eta = self.gamma * (ng / prev_ng) ** self.omega
+        # safeguard against a too fast decrease, which would oversolve the system
+        if self.gamma * prev_eta ** self.omega > 0.1:
+            eta = max(eta, self.gamma * prev_eta ** self.omega)
+        return min(eta, self.eta_max)
+
+    def _truncated_cg(self, eta):
+        """
+        Approximately solve the Newton's system H d = -g by the linear conjugate gradient
+        method until the relative residual is not greater than eta or a direction of
+        nonpositive curvature is detected.
+        """
+        d = np.zeros_like(self.g_x)
+        r = self.g_x  # residual of the system, i.e., H d + g
+        p = -r
+        rr = r.dot(r)
+        tol = eta * np.sqrt(rr)
+        for cg_iter in range(self.max_cg_iter):
+            Hp = self.f.hessian_vector_product(self.x, p)
+            self.cg_iter += 1
+            pHp = p.dot(Hp)
+            if pHp <= 0:  # nonpositive curvature
+                return -self.g_x if cg_iter == 0 else d, cg_iter + 1
+            alpha = rr / pHp
+            d = d + alpha * p
+            r = r + alpha * Hp
+            prev_rr, rr = rr, r.dot(r)
+            if np.sqrt(rr) <= tol:
+                break
+            p = -r + rr / prev_rr * p
+        return d, cg_iter + 1
+
+    def minimize(self):
+        last_x = np.zeros(self.f.ndim)  # last point visited in the line search
+        last_g = np.zeros(self.f.ndim)  # gradient of last_x
+        prev_ng = None
+        eta = self.eta_max
+
+        if self.verbose:
+            print('iter\tfeval\t cost\t\t gnorm\t', end='')
+            if self.f.f_star() < np.inf:
+                print('\t gap\t\t rate\t', end='')
+                prev_v = np.inf
+            print('\t eta\t\tcg\tls\tit\t astar', end='')
+
+        while True:
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
+            ng = np.linalg.norm(self.g_x)
+
+            if self.eps < 0:
+                ng0 = -ng  # norm of first subgradient
+            else:
+                ng0 = 1  # un-scaled stopping criterion
+
+            if self.is_verbose():
+                print('\n{:4d}\t{:4d}\t{: 1.4e}\t{: 1.4e}'.format(self.iter, self.f_eval, self.f_x, ng), end='')
+                if self.f.f_star() < np.inf:
+                    print('\t{: 1.4e}'.format(self.f_x - self.f.f_star()), end='')
+                    if prev_v < np.inf:
+                        print('\t{: 1.4e}'.format((self.f_x - self.f.f_star()) / (prev_v - self.f.f_star())), end='')
+                    else:
+                        print('\t\t', end='')
+                    prev_v = self.f_x
+
+            # stopping criteria
+            if ng <= self.eps * ng0:
+                self.status = 'optimal'
+                break
+
+            if self.iter > self.max_iter or self.f_eval > self.line_search.max_f_eval:
+                self.status = 'stopped'
+                break
+
+            # compute the truncated Newton's direction
+            eta = self._forcing_term(ng, prev_ng, eta)
+            d, cg_iter = self._truncated_cg(eta)
+            prev_ng = ng
+
+            if self.is_verbose():
+                print('\t{: 1.4e}\t{:2d}'.format(eta, cg_iter), end='')
+
+            phi_p0 = self.g_x.T.dot(d)
+
+            # compute step size: as in Newton's method, the default initial step size is 1
+            a, self.f_x, last_x, last_g, self.f_eval = self.line_search.search(
+                d, self.x, last_x, last_g, self.f_eval, self.f_x, phi_p0, self.is_verbose())
+
+            # output statistics
+            if self.is_verbose():
+                print('\t{: 1.4e}'.format(a), end='')
+
+            if a <= self.line_search.min_a:
+                self.status = 'error'
+                break
+
+            if self.f_x <= self.m_inf:
+                self.status = 'unbounded'
+                break
+
+            try:
+                self.callback()
+            except StopIteration:
+                break
+
+            # update new point
+            self.x = last_x
+
+            self.iter += 1
+
+        if self.verbose:
+            print('\n')
+
+        return self
@@ -1,6 +1,7 @@
 import warnings
 
 import numpy as np
+from scipy.linalg.blas import dger
 
 from . import LineSearchOptimizer
 
@@ -36,6 +37,11 @@ class BFGS(LineSearchOptimizer):
     #   otherwise, the initial Hessian is approximated by finite differences
     #   with - delta as the step, and inverted just the once.
     #
+    # - n_jobs (integer scalar, optional, default value None): the number of
+    #   parallel jobs evaluating the Jacobian at the perturbed points of the
+    #   finite differences if delta <= 0, None means 1 and -1 means using
+    #   all processors.
+    #
     # - eps (real scalar, optional, default value 1e-6): the accuracy in the
     #   stopping criterion: the algorithm is stopped when the norm of the
     #   gradient is less than or equal to eps. If a negative value is provided,
@@ -118,6 +124,7 @@ class BFGS(LineSearchOptimizer):
                  m2=0.9,
                  a_start=1,
                  delta=1,
+                 n_jobs=None,
                  tau=0.9,
                  sfgrd=0.01,
                  m_inf=-np.inf,
@@ -140,7 +147,9 @@ class BFGS(LineSearchOptimizer):
                          callback_args=callback_args,
                          verbose=verbose)
         self.H_x = np.zeros(0)
+        self.Hy = np.zeros(0)  # work buffer of the update
         self.delta = delta
+        self.n_jobs = n_jobs
 
     def minimize(self):
         last_x = np.zeros(self.f.ndim)  # last point visited in the line search
@@ -154,7 +163,7 @@ class BFGS(LineSearchOptimizer):
             print('\tls\tit\t astar\t\t rho', end='')
 
         while True:
-            self.f_x, self.g_x = self.f.function(self.x), self.f.jacobian(self.x)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
             ng = np.linalg.norm(self.g_x)
 
             if self.eps < 0:
@@ -162,24 +171,19 @@ class BFGS(LineSearchOptimizer):
             else:
                 ng0 = 1  # un-scaled stopping criterion
 
-            if self.iter == 0:
+            if not self.H_x.size:  # keep the approximation of a previous run, if any, when warm started
                 if self.delta > 0:
                     # initial approximation of inverse of Hessian = scaled identity
                     self.H_x = self.delta * np.identity(len(self.g_x))
                 else:
                     # initial approximation of inverse of Hessian computed by finite differences of gradient
                     small_step = max(-self.delta, 1e-8)
-                    self.H_x = np.zeros((self.f.ndim, self.f.ndim))
-                    for i in range(self.f.ndim):
-                        xp = self.x
-                        xp[i] = xp[i] + small_step
-                        gp = self.f.jacobian(xp)
-                        self.H_x[i] = ((gp - self.g_x) / small_step).T
-                    self.H_x = (self.H_x + self.H_x.T) / 2  # ensure it is symmetric
+                    self.H_x = self.f.finite_difference_hessian(self.x, self.g_x, small_step, self.n_jobs)
                     lambda_n = min(np.linalg.eigvalsh(self.H_x))  # smallest eigenvalue
                     if lambda_n < 1e-6:
-                        self.H_x = self.H_x + (1e-6 - lambda_n) * np.identity(self.f.ndim)
+                        self.H_x = self.H_x + (1e-6 - lambda_n) * np.identity(len(self.g_x))
                     self.H_x = np.linalg.inv(self.H_x)
+                self.Hy = np.zeros(len(self.g_x))
 
             if self.is_verbose():
                 print('\n{:4d}\t{:4d}\t{: 1.4e}\t{: 1.4e}'.format(self.iter, self.f_eval, self.f_x, ng), end='')
@@ -222,10 +226,10 @@ class BFGS(LineSearchOptimizer):
                 break
 
             # update approximation of the Hessian using the BFGS formula
-            s = (last_x - self.x).reshape(len(self.g_x), 1)  # s^i = x^{i + 1} - x^i
-            y = (last_g - self.g_x).reshape(len(self.g_x), 1)  # y^i = \nabla f(x^{i + 1}) - \nabla f(x^i)
+            s = last_x - self.x  # s^i = x^{i + 1} - x^i
+            y = last_g - self.g_x  # y^i = \nabla f(x^{i + 1}) - \nabla f(x^i)
 
-            rho = y.T.dot(s).item()
+            rho = y.dot(s)
             if rho < 1e-16:
                 warnings.warn('error: y^i s^i = {: 1.4e}'.format(rho))
                 self.status = 'error'
@@ -236,8 +240,13 @@ class BFGS(LineSearchOptimizer):
             if self.is_verbose():
                 print('\t{: 1.4e}'.format(rho), end='')
 
-            D = self.H_x.dot(y) * s.T
-            self.H_x = self.H_x + rho * ((1 + rho * y.T.dot(self.H_x).dot(y)) * (s.dot(s.T)) - D - D.T)
+            # H + rho ((1 + rho y^T H y) s s^T - H y s^T - s y^T H) is the symmetric rank-2
+            # update H + w s^T + s w^T with w = rho ((1 + rho y^T H y) / 2 s - H y), which
+            # is done in-place by BLAS, i.e., on the transposed (Fortran-ordered) view of H
+            np.dot(self.H_x, y, out=self.Hy)
+            w = rho * ((1 + rho * y.dot(self.Hy)) / 2 * s - self.Hy)
+            dger(1., w, s, a=self.H_x.T, overwrite_a=True)
+            dger(1., s, w, a=self.H_x.T, overwrite_a=True)
 
             try:
                 self.callback()
@@ -256,6 +265,36 @@ class BFGS(LineSearchOptimizer):
 
 
 class LBFGS(LineSearchOptimizer):
+    # Apply the limited-memory version of the BFGS Quasi-Newton approach for
+    # the minimization of the provided function f, i.e., the approximation
+    # of the inverse of the Hessian is never formed but it is implicitly
+    # defined by the last m pairs
+    #
+    #   s^i = x^{i + 1} - x^i,   y^i = \nabla f(x^{i + 1}) - \nabla f(x^i)
+    #
+    # kept in a ring buffer, and its product with the gradient is computed by
+    # the two-loop recursion, starting from the scaled identity gamma * I with
+    # gamma = (s^T y) / (y^T y) of the last pair (delta at the first iteration),
+    # hence with O(m n) memory and cost per iteration. The pairs with not
+    # enough curvature, i.e., s^T y <= curv * || s || || y ||, are skipped, so
+    # that the approximation is kept positive definite.
+    #
+    # Input:
+    #
+    # - m (integer scalar, optional, default value 10): the number of the
+    #   last pairs (s, y) kept to approximate the inverse of the Hessian.
+    #
+    # - delta (real scalar, optional, default value 1): the initial
+    #   approximation of the inverse of the Hessian is taken as delta * I.
+    #
+    # - curv (real scalar, optional, default value 1e-8): the minimum
+    #   curvature, relative to the norms of s and y, of a pair to be kept.
+    #
+    # The other parameters and the output are the same of BFGS.
+    #
+    # References
+    #
+    # J. Nocedal, S. J. Wright. Numerical Optimization, Algorithm 7.4, 2006.
 
     def __init__(self,
                  f,
@@ -266,7 +305,9 @@ class LBFGS(LineSearchOptimizer):
                  m1=0.01,
                  m2=0.9,
                  a_start=1,
+                 m=10,
                  delta=1,
+                 curv=1e-8,
                  tau=0.9,
                  sfgrd=0.01,
                  m_inf=-np.inf,
@@ -289,7 +330,130 @@ class LBFGS(LineSearchOptimizer):
                          callback=callback,
                          callback_args=callback_args,
                          verbose=verbose)
+        if not m > 0:
+            raise ValueError('m must be > 0')
+        self.m = m
+        if not delta > 0:
+            raise ValueError('delta must be > 0')
         self.delta = delta
+        if not curv >= 0:
+            raise ValueError('curv must be >= 0')
+        self.curv = curv
+        # ring buffer of the last pairs (s, y), kept when warm started
+        self.S = np.zeros((m, self.x.size))
+        self.Y = np.zeros((m, self.x.size))
+        self.rho = np.zeros(m)
+        self.n_pairs = 0
+        self.last_pair = -1
+
+    def _two_loop(self, g):
+        """
+        Compute the product between the approximation of the inverse of
+        the Hessian and g by the two-loop recursion over the stored pairs.
+        """
+        pairs = [(self.last_pair - i) % self.m for i in range(self.n_pairs)]  # from the newest
+        alpha = np.zeros(self.m)
+        q = g.copy()
+        for i in pairs:
+            alpha[i] = self.rho[i] * self.S[i].dot(q)
+            q -= alpha[i] * self.Y[i]
+        if self.n_pairs:
+            s, y = self.S[self.last_pair], self.Y[self.last_pair]
+            gamma = s.dot(y) / y.dot(y)
+        else:
+            gamma = self.delta
+        r = gamma * q
+        for i in reversed(pairs):
+            beta = self.rho[i] * self.Y[i].dot(r)
+            r += (alpha[i] - beta) * self.S[i]
+        return r
 
     def minimize(self):
-        raise NotImplementedError
+        last_x = np.zeros(self.f.ndim)  # last point visited in the line search
+        last_g = np.zeros(self.f.ndim)  # gradient of last_x
+
+        if self.verbose:
+            print('iter\tfeval\t cost\t\t gnorm\t', end='')
+            if self.f.f_star() < np.inf:
+                print('\t gap\t\t rate\t', end='')
+                prev_v = np.inf
+            print('\tls\tit\t astar\t\t rho', end='')
+
+        while True:
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
+            ng = np.linalg.norm(self.g_x)
+
+            if self.eps < 0:
+                ng0 = -ng  # norm of first subgradient
+            else:
+                ng0 = 1  # un-scaled stopping criterion
+
+            if self.is_verbose():
+                print('\n{:4d}\t{:4d}\t{: 1.4e}\t{: 1.4e}'.format(self.iter, self.f_eval, self.f_x, ng), end='')
+                if self.f.f_star() < np.inf:
+                    print('\t{: 1.4e}'.format(self.f_x - self.f.f_star()), end='')
+                    if prev_v < np.inf:
+                        print('\t{: 1.4e}'.format((self.f_x - self.f.f_star()) / (prev_v - self.f.f_star())), end='')
+                    else:
+                        print('\t\t', end='')
+                    prev_v = self.f_x
+
+            # stopping criteria
+            if ng <= self.eps * ng0:
+                self.status = 'optimal'
+                break
+
+            if self.iter > self.max_iter or self.f_eval > self.line_search.max_f_eval:
+                self.status = 'stopped'
+                break
+
+            # compute approximation to Newton's direction
+            d = -self._two_loop(self.g_x)
+
+            phi_p0 = self.g_x.T.dot(d)
+
+            # compute step size: as in Newton's method, the default initial step size is 1
+            a, self.f_x, last_x, last_g, self.f_eval = self.line_search.search(
+                d, self.x, last_x, last_g, self.f_eval, self.f_x, phi_p0, self.is_verbose())
+
+            # output statistics
+            if self.is_verbose():
+                print('\t{: 1.4e}'.format(a), end='')
+
+            if a <= self.line_search.min_a:
+                self.status = 'error'
+                break
+
+            if self.f_x <= self.m_inf:
+                self.status = 'unbounded'
+                break
+
+            s = last_x - self.x  # s^i = x^{i + 1} - x^i
+            y = last_g - self.g_x  # y^i = \nabla f(x^{i + 1}) - \nabla f(x^i)
+
+            sy = s.dot(y)
+            if sy > self.curv * np.linalg.norm(s) * np.linalg.norm(y):
+                # store the new pair in place of the oldest one
+                self.last_pair = (self.last_pair + 1) % self.m
+                self.S[self.last_pair] = s
+                self.Y[self.last_pair] = y
+                self.rho[self.last_pair] = 1 / sy
+                self.n_pairs = min(self.n_pairs + 1, self.m)
+
+                if self.is_verbose():
+                    print('\t{: 1.4e}'.format(self.rho[self.last_pair]), end='')
+
+            try:
+                self.callback()
+            except StopIteration:
+                break
+
+            # update new point
+            self.x = last_x
+
+            self.iter += 1
+
+        if self.verbose:
+            print('\n')
+
+        return self
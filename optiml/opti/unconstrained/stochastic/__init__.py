@@ -1,5 +1,6 @@
 __all__ = ['StochasticOptimizer',
-           'StochasticGradientDescent', 'Adam', 'AMSGrad', 'AdaMax', 'AdaGrad', 'AdaDelta', 'RProp', 'RMSProp']
+           'StochasticGradientDescent', 'Adam', 'AMSGrad', 'AdaMax', 'AdaGrad', 'AdaDelta', 'RProp', 'RMSProp',
+           'SVRG', 'SAGA']
 
 from ._base import StochasticOptimizer
 
@@ -11,3 +12,5 @@ from .adadelta import AdaDelta
 from .adam import Adam
 from .rprop import RProp
 from .rmsprop import RMSProp
+from .svrg import SVRG
+from .saga import SAGA
@@ -52,22 +52,36 @@ class StochasticOptimizer(Optimizer, ABC):
         self.random_state = random_state
         self.step = 0
 
+        self.batch_idx = 0  # index of the current mini batch
+
+        self.reset_batches(batch_size)
+
+    def reset_batches(self, batch_size):
+        """Split the arrays given in f.args() into mini batches of size batch_size
+        and restart iterating over them, e.g., after f has been bound to a new chunk
+        of data, keeping the current point and the state of the optimizer, e.g., its
+        moment estimates and iteration counter.
+        :param: batch_size: size of each batch, or None to use the whole arrays
+        """
+        self.batches_start_iter = self.iter  # iteration at which the current mini batches start
+
         if batch_size is None:
             self.batch_size = None
-            self.batches = itertools.repeat(f.args())
+            self.n_batches = 1
+            self.batches = itertools.repeat(self.f.args())
         else:
-            n_samples = len(f.args()[0])
+            n_samples = self.f.args()[0].shape[0]
 
             if batch_size < 1 or batch_size > n_samples:
                 warnings.warn('Got `batch_size` less than 1 or larger than '
                               'sample size. It is going to be clipped.')
             self.batch_size = np.clip(batch_size, 1, n_samples)
 
-            self.n_batches, rest = divmod(len(f.args()[0]), self.batch_size)
+            self.n_batches, rest = divmod(n_samples, self.batch_size)
             if rest:
                 self.n_batches += 1
 
-            self.max_iter *= self.n_batches
+            self.max_iter = self.epochs * self.n_batches
 
             self.batches = (i for i in self.iter_mini_batches())
 
@@ -89,13 +103,24 @@ class StochasticOptimizer(Optimizer, ABC):
                 if self.shuffle:
                     shuffle(idx, random_state=self.random_state)
                 for i in idx:
-                    start = i * self.batch_size
-                    stop = (i + 1) * self.batch_size
-                    yield [param[slice(start, stop)] for param in self.f.args()]
+                    self.batch_idx = i
+                    yield self.mini_batch(i)
+
+    def mini_batch(self, i):
+        """Return the i-th mini batch of the sliceable objects given in f.args().
+        :param: i: index of the mini batch
+        :return: the list of the slices of the mini batch
+        """
+        if self.batch_size is None:
+            return self.f.args()
+        start = i * self.batch_size
+        stop = (i + 1) * self.batch_size
+        return [param[slice(start, stop)] for param in self.f.args()]
 
     def is_batch_end(self):
-        return (self.batch_size is None or self.batch_size == len(self.f.args()[0])
-                or (self.iter and not self.iter % self.n_batches))
+        return (self.batch_size is None or self.batch_size == self.f.args()[0].shape[0]
+                or (self.iter > self.batches_start_iter and
+                    not (self.iter - self.batches_start_iter) % self.n_batches))
 
     def is_verbose(self):
         return self.verbose and not self.epoch % self.verbose
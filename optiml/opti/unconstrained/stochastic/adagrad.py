@@ -47,7 +47,7 @@ class AdaGrad(StochasticOptimizer):
                 prev_v = np.inf
 
         for batch in self.batches:
-            self.f_x, self.g_x = self.f.function(self.x, *batch), self.f.jacobian(self.x, *batch)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x, *batch)
 
             if self.is_batch_end():
 
@@ -81,8 +81,8 @@ class AdaGrad(StochasticOptimizer):
                 step_m1 = self.step
                 step1 = self.momentum * step_m1
                 self.x -= step1
+                self.g_x = self.f.jacobian(self.x, *batch)  # at the look-ahead point
 
-            self.g_x = self.f.jacobian(self.x, *batch)
             self.gms += self.g_x ** 2
             step2 = self.step_size * self.g_x / np.sqrt(self.gms + self.offset)
 
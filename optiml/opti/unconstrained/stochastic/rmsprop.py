@@ -47,7 +47,7 @@ class RMSProp(StochasticOptimizer):
                 prev_v = np.inf
 
         for batch in self.batches:
-            self.f_x, self.g_x = self.f.function(self.x, *batch), self.f.jacobian(self.x, *batch)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x, *batch)
 
             if self.is_batch_end():
 
@@ -81,8 +81,7 @@ class RMSProp(StochasticOptimizer):
                 step_m1 = self.step
                 step1 = self.momentum * step_m1
                 self.x -= step1
-
-            self.g_x = self.f.jacobian(self.x, *batch)
+                self.g_x = self.f.jacobian(self.x, *batch)  # at the look-ahead point
 
             self.moving_mean_squared = self.decay * self.moving_mean_squared + (1. - self.decay) * self.g_x ** 2
             step2 = self.step_size * self.g_x / np.sqrt(self.moving_mean_squared)
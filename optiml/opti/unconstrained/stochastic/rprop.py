@@ -52,7 +52,7 @@ class RProp(StochasticOptimizer):
                 prev_v = np.inf
 
         for batch in self.batches:
-            self.f_x, self.g_x = self.f.function(self.x, *batch), self.f.jacobian(self.x, *batch)
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x, *batch)
 
             if self.is_batch_end():
 
@@ -86,10 +86,11 @@ class RProp(StochasticOptimizer):
                 step_m1 = self.step
                 step1 = self.momentum * step_m1
                 self.x -= step1
+                self.g_x = self.f.jacobian(self.x, *batch)  # at the look-ahead point
 
             g_m1 = self.jacobian
 
-            self.jacobian = self.f.jacobian(self.x, *batch)
+            self.jacobian = self.g_x
             grad_prod = g_m1 * self.jacobian
 
             self.changes[grad_prod > 0] *= self.step_grow
@@ -0,0 +1,141 @@
+import numpy as np
+
+from . import StochasticOptimizer
+
+
+class SAGA(StochasticOptimizer):
+    """
+    SAGA incremental gradient method for finite-sum functions.
+
+    A table with the last gradient computed for each mini batch is kept, and the
+    gradient of the current mini batch is corrected by the difference between the
+    average of the table and the entry of the mini batch, which is then replaced.
+    The variance of the estimate vanishes as the optimizer converges, so a constant
+    step size gives linear convergence on strongly convex functions.
+
+    If the function exposes the scalar residuals of each sample, i.e., the derivatives
+    of the loss wrt the predictions of a linear model, as the SVMs losses do, the table
+    just stores them, so it takes O(n_samples) memory instead of O(n_batches * ndim).
+
+    References
+
+    A. Defazio, F. Bach, S. Lacoste-Julien. SAGA: A Fast Incremental Gradient Method
+    With Support for Non-Strongly Convex Composite Objectives. NIPS 2014.
+    """
+
+    def __init__(self,
+                 f,
+                 x,
+                 batch_size=None,
+                 eps=1e-6,
+                 epochs=1000,
+                 step_size=0.01,
+                 momentum_type='none',
+                 momentum=0.9,
+                 callback=None,
+                 callback_args=(),
+                 shuffle=True,
+                 random_state=None,
+                 verbose=False):
+        super().__init__(f=f,
+                         x=x,
+                         step_size=step_size,
+                         momentum_type=momentum_type,
+                         momentum=momentum,
+                         batch_size=batch_size,
+                         eps=eps,
+                         epochs=epochs,
+                         callback=callback,
+                         callback_args=callback_args,
+                         shuffle=shuffle,
+                         random_state=random_state,
+                         verbose=verbose)
+        # store just the residuals of each sample for linear models
+        self.compact = hasattr(f, 'residuals') and hasattr(f, 'residuals_jacobian')
+        self.table = []
+        self.table_mean = np.zeros(0)
+
+    def reset_batches(self, batch_size):
+        super().reset_batches(batch_size)
+        self.table = []  # the entries of the previous mini batches are stale
+
+    def _table_gradient(self, entry, batch):
+        if self.compact:
+            return self.f.residuals_jacobian(entry, batch[0])
+        return entry
+
+    def minimize(self):
+
+        if self.verbose:
+            print('epoch\titer\t cost\t', end='')
+            if self.f.f_star() < np.inf:
+                print('\t gap\t\t rate', end='')
+                prev_v = np.inf
+
+        if not self.table:  # initialize the table with the gradients at the starting point
+            self.table = [self.f.residuals(self.x, *self.mini_batch(i)) if self.compact
+                          else self.f.jacobian(self.x, *self.mini_batch(i)) for i in range(self.n_batches)]
+            self.table_mean = np.mean([self._table_gradient(entry, self.mini_batch(i))
+                                       for i, entry in enumerate(self.table)], axis=0)
+
+        for batch in self.batches:
+            i = self.batch_idx
+
+            # variance reduction term of the gradient estimate of the mini batch
+            g_old = self._table_gradient(self.table[i], batch)
+            correction = self.table_mean - g_old
+
+            self.f_x, g_x = self.f.function_and_jacobian(self.x, *batch)
+            self.g_x = g_x + correction
+
+            # replace the entry of the mini batch and update the average of the table
+            self.table[i] = self.f.residuals(self.x, *batch) if self.compact else g_x
+            self.table_mean += (self._table_gradient(self.table[i], batch) - g_old) / self.n_batches
+
+            if self.is_batch_end():
+
+                if self.is_verbose():
+                    print('\n{:4d}\t{:4d}\t{: 1.4e}'.format(self.epoch, self.iter, self.f_x), end='')
+                    if self.f.f_star() < np.inf:
+                        print('\t{: 1.4e}'.format(self.f_x - self.f.f_star()), end='')
+                        if prev_v < np.inf:
+                            print('\t{: 1.4e}'.format((self.f_x - self.f.f_star()) /
+                                                      (prev_v - self.f.f_star())), end='')
+                        else:
+                            print('\t\t', end='')
+                        prev_v = self.f_x
+
+            try:
+                self.callback(batch)
+            except StopIteration:
+                break
+
+            if self.is_batch_end():
+                self.epoch += 1
+
+            if self.epoch >= self.epochs:
+                self.status = 'stopped'
+                break
+
+            if self.momentum_type == 'standard':
+                step_m1 = self.step
+                self.step = self.step_size * -self.g_x + self.momentum * step_m1
+                self.x += self.step
+            elif self.momentum_type == 'nesterov':
+                step_m1 = self.step
+                big_jump = self.momentum * step_m1
+                self.x += big_jump
+                self.g_x = self.f.jacobian(self.x, *batch) + correction
+                correction_step = self.step_size * -self.g_x
+                self.x += correction_step
+                self.step = big_jump + correction_step
+            elif self.momentum_type == 'none':
+                self.step = self.step_size * -self.g_x
+                self.x += self.step
+
+            self.iter += 1
+
+        if self.verbose:
+            print('\n')
+
+        return self
@@ -0,0 +1,122 @@
+import numpy as np
+
+from . import StochasticOptimizer
+
+
+class SVRG(StochasticOptimizer):
+    """
+    Stochastic Variance Reduced Gradient (SVRG) method for finite-sum functions.
+
+    Every snapshot_epochs epochs the full gradient is computed at a snapshot of
+    the current point, then the gradient of each mini batch is corrected by the
+    difference between the full gradient and the mini batch one at the snapshot.
+    The variance of the estimate vanishes as the snapshot approaches the optimum,
+    so a constant step size gives linear convergence on strongly convex functions.
+
+    References
+
+    R. Johnson, T. Zhang. Accelerating Stochastic Gradient Descent using Predictive
+    Variance Reduction. NIPS 2013.
+    """
+
+    def __init__(self,
+                 f,
+                 x,
+                 batch_size=None,
+                 eps=1e-6,
+                 epochs=1000,
+                 step_size=0.01,
+                 momentum_type='none',
+                 momentum=0.9,
+                 snapshot_epochs=1,
+                 callback=None,
+                 callback_args=(),
+                 shuffle=True,
+                 random_state=None,
+                 verbose=False):
+        super().__init__(f=f,
+                         x=x,
+                         step_size=step_size,
+                         momentum_type=momentum_type,
+                         momentum=momentum,
+                         batch_size=batch_size,
+                         eps=eps,
+                         epochs=epochs,
+                         callback=callback,
+                         callback_args=callback_args,
+                         shuffle=shuffle,
+                         random_state=random_state,
+                         verbose=verbose)
+        if not snapshot_epochs > 0:
+            raise ValueError('snapshot_epochs must be > 0')
+        self.snapshot_epochs = snapshot_epochs
+        self.x_snapshot = np.zeros(0)
+        self.g_snapshot = np.zeros(0)  # full gradient at the snapshot
+
+    def minimize(self):
+
+        if self.verbose:
+            print('epoch\titer\t cost\t', end='')
+            if self.f.f_star() < np.inf:
+                print('\t gap\t\t rate', end='')
+                prev_v = np.inf
+
+        for batch in self.batches:
+
+            if not (self.iter - self.batches_start_iter) % (self.n_batches * self.snapshot_epochs):
+                self.x_snapshot = self.x.copy()
+                self.g_snapshot = self.f.jacobian(self.x_snapshot)
+
+            # variance reduction term of the gradient estimate of the mini batch
+            correction = self.g_snapshot - self.f.jacobian(self.x_snapshot, *batch)
+
+            self.f_x, self.g_x = self.f.function_and_jacobian(self.x, *batch)
+            self.g_x = self.g_x + correction
+
+            if self.is_batch_end():
+
+                if self.is_verbose():
+                    print('\n{:4d}\t{:4d}\t{: 1.4e}'.format(self.epoch, self.iter, self.f_x), end='')
+                    if self.f.f_star() < np.inf:
+                        print('\t{: 1.4e}'.format(self.f_x - self.f.f_star()), end='')
+                        if prev_v < np.inf:
+                            print('\t{: 1.4e}'.format((self.f_x - self.f.f_star()) /
+                                                      (prev_v - self.f.f_star())), end='')
+                        else:
+                            print('\t\t', end='')
+                        prev_v = self.f_x
+
+            try:
+                self.callback(batch)
+            except StopIteration:
+                break
+
+            if self.is_batch_end():
+                self.epoch += 1
+
+            if self.epoch >= self.epochs:
+                self.status = 'stopped'
+                break
+
+            if self.momentum_type == 'standard':
+                step_m1 = self.step
+                self.step = self.step_size * -self.g_x + self.momentum * step_m1
+                self.x += self.step
+            elif self.momentum_type == 'nesterov':
+                step_m1 = self.step
+                big_jump = self.momentum * step_m1
+                self.x += big_jump
+                self.g_x = self.f.jacobian(self.x, *batch) + correction
+                correction_step = self.step_size * -self.g_x
+                self.x += correction_step
+                self.step = big_jump + correction_step
+            elif self.momentum_type == 'none':
+                self.step = self.step_size * -self.g_x
+                self.x += self.step
+
+            self.iter += 1
+
+        if self.verbose:
+            print('\n')
+
+        return self
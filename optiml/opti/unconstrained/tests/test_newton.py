@@ -1,9 +1,9 @@
 import numpy as np
 import pytest
 
-from optiml.opti import quad1, quad2
+from optiml.opti import Quadratic, quad1, quad2, quad5
 from optiml.opti.unconstrained import Rosenbrock
-from optiml.opti.unconstrained.line_search import Newton
+from optiml.opti.unconstrained.line_search import Newton, NewtonCG
 
 
 def test_quadratic():
@@ -16,5 +16,50 @@ def test_Rosenbrock():
     assert np.allclose(Newton(f=rosen, x=np.random.uniform(size=2)).minimize().x, rosen.x_star())
 
 
+def test_Rosenbrock_with_finite_difference_hessian():
+    rosen = Rosenbrock()
+    x = np.random.uniform(size=2)
+    assert np.allclose(rosen.finite_difference_hessian(x, step=1e-6, n_jobs=2), rosen.hessian(x), atol=1e-3)
+    assert np.allclose(Newton(f=rosen, x=x, fd_step=1e-6).minimize().x, rosen.x_star())
+    # the coordinates are split into uneven blocks, or fewer than n_jobs ones
+    rosen = Rosenbrock(ndim=5)
+    x = np.random.uniform(size=5)
+    for n_jobs in (1, 2, 8):
+        assert np.allclose(rosen.finite_difference_hessian(x, step=1e-6, n_jobs=n_jobs), rosen.hessian(x), atol=1e-3)
+
+
+def test_constant_hessian_factorized_once():
+
+    class CountingQuadratic(Quadratic):
+        n_hessian = 0
+
+        def hessian(self, x):
+            self.n_hessian += 1
+            return super().hessian(x)
+
+    quad = CountingQuadratic(quad5.Q, quad5.q)
+    newton = Newton(f=quad, x=np.random.uniform(size=2), max_iter=1).minimize()
+    newton.x = np.random.uniform(size=2)  # restart it from another point
+    newton.minimize()
+    assert quad.n_hessian == 1
+
+
+def test_NewtonCG_quadratic():
+    assert np.allclose(NewtonCG(f=quad1, x=np.random.uniform(size=2)).minimize().x, quad1.x_star())
+    assert np.allclose(NewtonCG(f=quad2, x=np.random.uniform(size=2)).minimize().x, quad2.x_star())
+
+
+def test_NewtonCG_Rosenbrock():
+    rosen = Rosenbrock()
+    assert np.allclose(NewtonCG(f=rosen, x=np.random.uniform(size=2)).minimize().x, rosen.x_star())
+
+
+def test_hessian_vector_product():
+    rosen = Rosenbrock()
+    x, v = np.random.uniform(size=2), np.random.uniform(size=2)
+    assert np.allclose(rosen.hessian_vector_product(x, v), rosen.hessian(x).dot(v))
+    assert np.allclose(quad1.hessian_vector_product(x, v), quad1.hessian(x).dot(v))
+
+
 if __name__ == "__main__":
     pytest.main()
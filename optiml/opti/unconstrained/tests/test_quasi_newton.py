@@ -3,7 +3,7 @@ import pytest
 
 from optiml.opti import quad1, quad2
 from optiml.opti.unconstrained import Rosenbrock
-from optiml.opti.unconstrained.line_search import BFGS
+from optiml.opti.unconstrained.line_search import BFGS, LBFGS
 
 
 def test_quadratic():
@@ -16,5 +16,37 @@ def test_Rosenbrock():
     assert np.allclose(BFGS(f=rosen, x=np.random.uniform(size=2)).minimize().x, rosen.x_star())
 
 
+def test_BFGS_finite_difference_initialization():
+    rosen = Rosenbrock()
+    x0 = np.random.uniform(size=2)
+    x = x0.copy()
+    bfgs = BFGS(f=rosen, x=x0, delta=-1e-6, n_jobs=2).minimize()
+    assert np.allclose(bfgs.x, rosen.x_star())
+    assert np.array_equal(x0, x)  # the starting point is not perturbed in-place
+
+
+def test_LBFGS_quadratic():
+    assert np.allclose(LBFGS(f=quad1, x=np.random.uniform(size=2)).minimize().x, quad1.x_star())
+    assert np.allclose(LBFGS(f=quad2, x=np.random.uniform(size=2)).minimize().x, quad2.x_star())
+
+
+def test_LBFGS_Rosenbrock():
+    rosen = Rosenbrock(ndim=10)
+    lbfgs = LBFGS(f=rosen, x=np.random.uniform(size=10), m=3).minimize()
+    assert np.allclose(lbfgs.x, rosen.x_star())
+    assert lbfgs.S.shape == lbfgs.Y.shape == (3, 10)
+
+
+def test_evaluation_cache():
+    rosen = Rosenbrock()
+    bfgs = BFGS(f=rosen, x=np.random.uniform(size=2)).minimize()
+    # each iteration but the first starts from the last point of the line search
+    assert rosen.cache_hits >= bfgs.iter
+    assert rosen.cache_misses == bfgs.f_eval
+    rosen.clear_cache()
+    rosen.function_and_jacobian(bfgs.x)
+    assert rosen.cache_misses == bfgs.f_eval + 1
+
+
 if __name__ == "__main__":
     pytest.main()
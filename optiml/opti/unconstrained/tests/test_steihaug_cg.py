@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from optiml.opti import quad1, quad2, quad5
+from optiml.opti.unconstrained import Rosenbrock
+from optiml.opti.unconstrained.trust_region import SteihaugCG
+
+
+def test_quadratic():
+    assert np.allclose(SteihaugCG(f=quad1, x=np.random.uniform(size=2)).minimize().x, quad1.x_star())
+    assert np.allclose(SteihaugCG(f=quad2, x=np.random.uniform(size=2)).minimize().x, quad2.x_star())
+    assert np.allclose(SteihaugCG(f=quad5, x=np.random.uniform(size=2)).minimize().x, quad5.x_star())
+
+
+def test_Rosenbrock():
+    rosen = Rosenbrock()
+    assert np.allclose(SteihaugCG(f=rosen, x=np.random.uniform(size=2)).minimize().x, rosen.x_star())
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from optiml.opti import quad1, quad2
+from optiml.opti.unconstrained import Rosenbrock
+from optiml.opti.unconstrained.stochastic import SVRG
+
+
+def test_SVRG_quadratic():
+    assert np.allclose(SVRG(f=quad1, x=np.random.uniform(size=2)).minimize().x, quad1.x_star())
+    assert np.allclose(SVRG(f=quad2, x=np.random.uniform(size=2)).minimize().x, quad2.x_star())
+
+
+def test_SVRG_Rosenbrock():
+    rosen = Rosenbrock()
+    assert np.allclose(SVRG(f=rosen, x=np.random.uniform(size=2)).minimize().x, rosen.x_star(), rtol=0.1)
+
+
+def test_SVRG_standard_momentum_quadratic():
+    assert np.allclose(SVRG(f=quad1, x=np.random.uniform(size=2), momentum_type='standard').minimize().x,
+                       quad1.x_star())
+    assert np.allclose(SVRG(f=quad2, x=np.random.uniform(size=2), momentum_type='standard').minimize().x,
+                       quad2.x_star())
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,7 @@
+__all__ = ['TrustRegionOptimizer',
+           'SteihaugCG', 'Dogleg']  # 2nd order methods
+
+from ._base import TrustRegionOptimizer
+
+from .steihaug_cg import SteihaugCG
+from .dogleg import Dogleg
@@ -0,0 +1,186 @@
+from abc import ABC
+
+import numpy as np
+
+from ... import Optimizer
+
+
+class TrustRegionOptimizer(Optimizer, ABC):
+    # Apply a trust-region method for the minimization of the provided
+    # function f, i.e., at each iteration the step p is the (approximate)
+    # minimizer of the quadratic model of f around x
+    #
+    #   m(p) = f(x) + g^T p + 1/2 p^T H p   s.t.   || p || <= delta
+    #
+    # which is accepted if the ratio rho between the actual reduction of f
+    # and the one predicted by the model is greater than eta, while the
+    # radius delta is shrunk if rho < 1/4 and expanded, up to max_delta, if
+    # rho > 3/4 and the step is on the boundary of the trust region. Since
+    # the length of the step is chosen together with its direction, no
+    # function evaluation is spent by a line search. Subclasses define how
+    # the subproblem is solved.
+    #
+    # Input:
+    #
+    # - delta (real scalar, optional, default value 1): the initial radius of
+    #   the trust region.
+    #
+    # - max_delta (real scalar, optional, default value 1e3): the maximum
+    #   radius of the trust region.
+    #
+    # - eta (real scalar, optional, default value 0.1): the minimum ratio
+    #   between the actual and the predicted reduction to accept a step, it
+    #   has to be in [0,1/4).
+    #
+    # - min_delta (real scalar, optional, default value 1e-16): if the radius
+    #   of the trust region becomes <= min_delta, this is taken as an
+    #   indication that something has gone wrong (the model is not accurate
+    #   whatever the radius, so maybe the function is not differentiable) and
+    #   computation is stopped.
+    #
+    # - eps, max_iter, m_inf: the same of the line search methods.
+    #
+    # Output:
+    #
+    # - x ([n x 1] real column vector): the best solution found so far.
+    #
+    # - status (string): 'optimal', 'unbounded' or 'stopped' as for the line
+    #   search methods, or 'error' if the radius becomes <= min_delta.
+    #
+    # References
+    #
+    # J. Nocedal, S. J. Wright. Numerical Optimization, Algorithm 4.1, 2006.
+
+    def __init__(self,
+                 f,
+                 x,
+                 eps=1e-6,
+                 max_iter=1000,
+                 delta=1,
+                 max_delta=1e3,
+                 eta=0.1,
+                 m_inf=-np.inf,
+                 min_delta=1e-16,
+                 callback=None,
+                 callback_args=(),
+                 verbose=False):
+        super().__init__(f=f,
+                         x=x,
+                         eps=eps,
+                         max_iter=max_iter,
+                         callback=callback,
+                         callback_args=callback_args,
+                         verbose=verbose)
+        if not delta > 0:
+            raise ValueError('delta must be > 0')
+        self.delta = delta
+        if not max_delta >= delta:
+            raise ValueError('max_delta must be >= delta')
+        self.max_delta = max_delta
+        if not 0 <= eta < 0.25:
+            raise ValueError('eta has to lie in [0,1/4)')
+        self.eta = eta
+        self.m_inf = m_inf
+        if not min_delta >= 0:
+            raise ValueError('min_delta must be >= 0')
+        self.min_delta = min_delta
+        self.f_eval = 1
+
+    @staticmethod
+    def _to_boundary(z, d, delta):
+        """
+        Compute the tau >= 0 such that || z + tau d || = delta, for z inside the trust region.
+        """
+        a = d.dot(d)
+        b = 2 * z.dot(d)
+        c = z.dot(z) - delta ** 2
+        return (-b + np.sqrt(b ** 2 - 4 * a * c)) / (2 * a)
+
+    def solve_subproblem(self):
+        """
+        Compute the step within the current trust region from the current point.
+        :return: the step p and the value of the model m(p) - f(x) < 0, i.e., minus the predicted reduction.
+        """
+        raise NotImplementedError
+
+    def minimize(self):
+
+        if self.verbose:
+            print('iter\tfeval\t cost\t\t gnorm\t', end='')
+            if self.f.f_star() < np.inf:
+                print('\t gap\t\t rate\t', end='')
+                prev_v = np.inf
+            print('\t delta\t\t rho', end='')
+
+        self.f_x, self.g_x = self.f.function_and_jacobian(self.x)
+        ng = np.linalg.norm(self.g_x)
+
+        if self.eps < 0:
+            ng0 = -ng  # norm of first subgradient
+        else:
+            ng0 = 1  # un-scaled stopping criterion
+
+        while True:
+
+            if self.is_verbose():
+                print('\n{:4d}\t{:4d}\t{: 1.4e}\t{: 1.4e}'.format(self.iter, self.f_eval, self.f_x, ng), end='')
+                if self.f.f_star() < np.inf:
+                    print('\t{: 1.4e}'.format(self.f_x - self.f.f_star()), end='')
+                    if prev_v < np.inf:
+                        print('\t{: 1.4e}'.format((self.f_x - self.f.f_star()) / (prev_v - self.f.f_star())), end='')
+                    else:
+                        print('\t\t', end='')
+                    prev_v = self.f_x
+
+            # stopping criteria
+            if ng <= self.eps * ng0:
+                self.status = 'optimal'
+                break
+
+            if self.iter > self.max_iter:
+                self.status = 'stopped'
+                break
+
+            p, m_p = self.solve_subproblem()
+
+            last_x = self.x + p
+            last_f, last_g = self.f.function_and_jacobian(last_x)
+            self.f_eval += 1
+
+            # ratio between the actual and the predicted reduction
+            rho = (self.f_x - last_f) / -m_p if m_p < 0 else -np.inf
+
+            if self.is_verbose():
+                print('\t{: 1.4e}\t{: 1.4e}'.format(self.delta, rho), end='')
+
+            # update the radius of the trust region
+            if rho < 0.25:
+                self.delta *= 0.25
+            elif rho > 0.75 and np.linalg.norm(p) >= 0.99 * self.delta:
+                self.delta = min(2 * self.delta, self.max_delta)
+
+            if self.delta <= self.min_delta:
+                self.status = 'error'
+                break
+
+            if rho > self.eta:
+
+                if last_f <= self.m_inf:
+                    self.status = 'unbounded'
+                    break
+
+                try:
+                    self.callback()
+                except StopIteration:
+                    break
+
+                # update new point
+                self.x, self.f_x, self.g_x = last_x, last_f, last_g
+                ng = np.linalg.norm(self.g_x)
+
+            self.iter += 1
+
+        if self.verbose:
+            print('\n')
+
+        return self
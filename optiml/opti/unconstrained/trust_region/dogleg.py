@@ -0,0 +1,80 @@
+import numpy as np
+from scipy.linalg import cho_solve
+
+from . import TrustRegionOptimizer
+from ...utils import modified_cholesky
+
+
+class Dogleg(TrustRegionOptimizer):
+    # Apply a trust-region Newton's method for the minimization of the
+    # provided function f, where the subproblem is solved approximately by
+    # the dogleg method, i.e., along the path from x to the minimizer of the
+    # model along the anti-gradient (Cauchy point) and then to the full
+    # Newton's step, which is taken if it lies within the trust region. The
+    # Hessian is formed and factorized at each iteration, so it is meant for
+    # small dense problems, or when the Hessian is constant, since it is
+    # factorized just the once: if it is not positive definite, it is
+    # modified as in the Newton's method, i.e., shifted by a multiple of the
+    # identity until its Cholesky factorization succeeds.
+    #
+    # Input:
+    #
+    # - reg (real scalar, optional, default value 1e-6): minimum positive
+    #   shift of the Hessian, if it is not positive definite, used to compute
+    #   the Newton's step.
+    #
+    # The other parameters and the output are the same of TrustRegionOptimizer.
+    #
+    # References
+    #
+    # J. Nocedal, S. J. Wright. Numerical Optimization, Section 4.1, 2006.
+
+    def __init__(self,
+                 f,
+                 x,
+                 eps=1e-6,
+                 max_iter=1000,
+                 delta=1,
+                 max_delta=1e3,
+                 eta=0.1,
+                 reg=1e-6,
+                 m_inf=-np.inf,
+                 min_delta=1e-16,
+                 callback=None,
+                 callback_args=(),
+                 verbose=False):
+        super().__init__(f=f,
+                         x=x,
+                         eps=eps,
+                         max_iter=max_iter,
+                         delta=delta,
+                         max_delta=max_delta,
+                         eta=eta,
+                         m_inf=m_inf,
+                         min_delta=min_delta,
+                         callback=callback,
+                         callback_args=callback_args,
+                         verbose=verbose)
+        self.H_x = np.zeros(0)
+        self.L_x = np.zeros(0)  # Cholesky factor of the (modified) Hessian
+        if not reg > 0:
+            raise ValueError('reg must be > 0')
+        self.reg = reg
+
+    def solve_subproblem(self):
+        if not (self.f.constant_hessian and self.L_x.size):
+            self.H_x = self.f.hessian(self.x)
+            self.L_x, shift = modified_cholesky(self.H_x, self.reg)
+            if shift:
+                self.H_x = self.H_x + shift * np.identity(len(self.g_x))
+
+        # full Newton's step
+        p = -cho_solve((self.L_x, True), self.g_x)
+        if np.linalg.norm(p) > self.delta:
+            # minimizer of the model along the anti-gradient
+            p_u = -self.g_x.dot(self.g_x) / self.g_x.dot(self.H_x).dot(self.g_x) * self.g_x
+            if np.linalg.norm(p_u) >= self.delta:
+                p = -self.delta / np.linalg.norm(self.g_x) * self.g_x
+            else:
+                p = p_u + self._to_boundary(p_u, p - p_u, self.delta) * (p - p_u)
+        return p, self.g_x.dot(p) + 0.5 * p.dot(self.H_x).dot(p)
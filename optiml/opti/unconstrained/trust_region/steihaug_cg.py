@@ -0,0 +1,89 @@
+import numpy as np
+
+from . import TrustRegionOptimizer
+
+
+class SteihaugCG(TrustRegionOptimizer):
+    # Apply a trust-region Newton's method for the minimization of the
+    # provided function f, where the subproblem is solved approximately by
+    # the Steihaug's conjugate gradient method on the products between the
+    # Hessian and a vector, hence the Hessian is never formed, i.e., the
+    # linear conjugate gradient method on the Newton's system H p = -g from
+    # p = 0, truncated as soon as its iterate leaves the trust region or a
+    # direction of nonpositive curvature is detected, in both cases moving
+    # to the boundary of the trust region along the last direction, or when
+    # the relative residual is not greater than min(1/2, sqrt(|| g ||)).
+    #
+    # Input:
+    #
+    # - max_cg_iter (integer scalar, optional, default value None): the
+    #   maximum number of inner conjugate gradient iterations, i.e., of
+    #   Hessian-vector products, per iteration; if None, the number of
+    #   variables.
+    #
+    # The other parameters and the output are the same of TrustRegionOptimizer.
+    #
+    # References
+    #
+    # T. Steihaug. The Conjugate Gradient Method and Trust Regions in Large
+    # Scale Optimization. SIAM Journal on Numerical Analysis, 1983.
+    #
+    # J. Nocedal, S. J. Wright. Numerical Optimization, Algorithm 7.2, 2006.
+
+    def __init__(self,
+                 f,
+                 x,
+                 eps=1e-6,
+                 max_iter=1000,
+                 delta=1,
+                 max_delta=1e3,
+                 eta=0.1,
+                 max_cg_iter=None,
+                 m_inf=-np.inf,
+                 min_delta=1e-16,
+                 callback=None,
+                 callback_args=(),
+                 verbose=False):
+        super().__init__(f=f,
+                         x=x,
+                         eps=eps,
+                         max_iter=max_iter,
+                         delta=delta,
+                         max_delta=max_delta,
+                         eta=eta,
+                         m_inf=m_inf,
+                         min_delta=min_delta,
+                         callback=callback,
+                         callback_args=callback_args,
+                         verbose=verbose)
+        if max_cg_iter is None:
+            max_cg_iter = self.f.ndim
+        if not max_cg_iter > 0:
+            raise ValueError('max_cg_iter must be > 0')
+        self.max_cg_iter = max_cg_iter
+        self.cg_iter = 0  # total number of inner iterations, i.e., of Hessian-vector products
+
+    def solve_subproblem(self):
+        # since r = H z + g, the model at z is m(z) - f(x) = g^T z + 1/2 z^T H z = 1/2 z^T (g + r)
+        z = np.zeros_like(self.g_x)
+        r = self.g_x
+        d = -r
+        rr = r.dot(r)
+        tol = min(0.5, np.sqrt(np.sqrt(rr))) * np.sqrt(rr)
+        for _ in range(self.max_cg_iter):
+            Hd = self.f.hessian_vector_product(self.x, d)
+            self.cg_iter += 1
+            dHd = d.dot(Hd)
+            alpha = rr / dHd if dHd > 0 else np.inf
+            if dHd <= 0 or np.linalg.norm(z + alpha * d) >= self.delta:
+                # nonpositive curvature or outside the trust region, so move to its boundary
+                tau = self._to_boundary(z, d, self.delta)
+                p = z + tau * d
+                return p, self.g_x.dot(p) + 0.5 * p.dot(r - self.g_x + tau * Hd)
+            z = z + alpha * d
+            r = r + alpha * Hd
+            prev_rr, rr = rr, r.dot(r)
+            if np.sqrt(rr) <= tol:
+                break
+            d = -r + rr / prev_rr * d
+        return z, 0.5 * z.dot(self.g_x + r)
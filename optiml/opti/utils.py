@@ -12,6 +12,24 @@ def cholesky_solve(L, b):
     return np.linalg.solve(L.T, np.linalg.solve(L, b))
 
 
+def modified_cholesky(H, delta=1e-6):
+    """Compute the Cholesky factor L of H + tau I, where tau is 0 if H
+    is positive definite, otherwise it starts from the one which makes
+    the diagonal of H not smaller than delta and it is doubled until the
+    factorization succeeds, i.e., Cholesky with added multiple of the
+    identity, in place of the eigenvalues of H
+    :return: the lower triangular factor L and the shift tau"""
+    try:
+        return np.linalg.cholesky(H), 0.
+    except np.linalg.LinAlgError:
+        tau = max(delta, delta - np.min(np.diag(H)))
+        while True:
+            try:
+                return np.linalg.cholesky(H + tau * np.identity(len(H))), tau
+            except np.linalg.LinAlgError:
+                tau *= 2
+
+
 # bcqp generator
 
 def generate_box_constrained_quadratic(ndim=2, actv=0.5, rank=1.1, ecc=0.99, ub_min=8, ub_max=12, seed=None):